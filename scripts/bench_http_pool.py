@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark connection reuse in ForumAPIClient against a local server.
+
+The bundled fake Discourse server serves topic JSON on localhost. Every
+new connection pays an artificial setup delay that emulates the TCP + TLS
+handshake round trips to a real forum, and every request pays a smaller
+service delay. The same workload is then run through ForumAPIClient with
+connection reuse disabled and with the pool settings from APISettings,
+and the share of request time spent on connection setup is reported.
+
+Usage:
+    python scripts/bench_http_pool.py --requests 200 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import time
+
+from forum_analyzer.bench.fake_server import TOPIC_ID_BASE, FakeDiscourseServer
+from forum_analyzer.collector.api_client import ForumAPIClient
+from forum_analyzer.config.settings import APISettings
+
+
+async def run_workload(
+    base_url: str, api: APISettings, requests: int, concurrency: int
+) -> dict:
+    """Fetch topics through ForumAPIClient and time each request."""
+    api = api.model_copy(update={"base_url": base_url})
+    client = ForumAPIClient.from_settings(api)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def fetch(topic_id: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await client.fetch_topic(topic_id)
+            latencies.append(time.perf_counter() - started)
+
+    async with client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(fetch(TOPIC_ID_BASE + n) for n in range(1, requests + 1))
+        )
+        wall = time.perf_counter() - started
+
+    return {"wall": wall, "request_time": sum(latencies)}
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    base = APISettings(
+        base_url="http://127.0.0.1",
+        category_path="c",
+        rate_limit=10_000.0,
+        burst=args.concurrency,
+        max_connections=args.concurrency,
+        max_keepalive_connections=args.concurrency,
+    )
+    scenarios = {
+        "no reuse": base.model_copy(update={"max_keepalive_connections": 0}),
+        "pooled": base,
+    }
+
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}, "
+        f"setup {args.setup_ms:.0f} ms/connection, "
+        f"service {args.request_ms:.0f} ms/request\n"
+    )
+    print(
+        f"{'scenario':<10} {'wall s':>8} {'req/s':>8} "
+        f"{'conns':>6} {'setup share':>12}"
+    )
+
+    for name, api in scenarios.items():
+        server = FakeDiscourseServer(
+            topics_per_category=args.requests,
+            posts_per_topic=1,
+            request_latency=args.request_ms / 1000,
+            setup_latency=args.setup_ms / 1000,
+        )
+        async with server:
+            result = await run_workload(
+                server.base_url,
+                api,
+                args.requests,
+                args.concurrency,
+            )
+
+        setup_time = server.connections * server.setup_latency
+        share = setup_time / result["request_time"]
+        print(
+            f"{name:<10} {result['wall']:>8.2f} "
+            f"{args.requests / result['wall']:>8.1f} "
+            f"{server.connections:>6} {share:>11.1%}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--setup-ms",
+        type=float,
+        default=60.0,
+        help="Emulated handshake cost per new connection",
+    )
+    parser.add_argument(
+        "--request-ms",
+        type=float,
+        default=40.0,
+        help="Emulated server time per request",
+    )
+    asyncio.run(benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,15 +6,41 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from anthropic import Anthropic
-from sqlalchemy import create_engine, select
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session, sessionmaker
 
+from ..collector.database import create_db_engine
 from ..collector.models import LLMAnalysis, Post, ProblemTheme, Topic
 from ..config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
 
+def topic_posts_query(topic_id: int) -> Select:
+    """Posts of a topic in thread order."""
+    return (
+        select(Post)
+        .where(Post.topic_id == topic_id)
+        .order_by(Post.post_number)
+    )
+
+
+def unanalyzed_topics_query() -> Select:
+    """Topics without an LLM analysis."""
+    analyzed = select(LLMAnalysis).where(LLMAnalysis.topic_id == Topic.id)
+    return select(Topic).where(~analyzed.exists())
+
+
+def recent_analyses_query(limit: int) -> Select:
+    """Most recent analyses with their topics, newest first."""
+    return (
+        select(LLMAnalysis, Topic)
+        .join(Topic, LLMAnalysis.topic_id == Topic.id)
+        .order_by(LLMAnalysis.analyzed_at.desc())
+        .limit(limit)
+    )
+
+
 class LLMAnalyzer:
     """Analyzes forum topics using Claude API to identify problems."""
 
@@ -28,7 +54,7 @@ class LLMAnalyzer:
         self.client = Anthropic(api_key=settings.llm_analysis.api_key)
 
         # Create database session using database URL
-        engine = create_engine(settings.database.url)
+        engine = create_db_engine(settings.database)
 
         # Auto-migrate schema if needed
         from ..collector.models import migrate_schema
@@ -69,13 +95,7 @@ class LLMAnalyzer:
                 return None
 
             posts = (
-                session.execute(
-                    select(Post)
-                    .where(Post.topic_id == topic_id)
-                    .order_by(Post.post_number)
-                )
-                .scalars()
-                .all()
+                session.execute(topic_posts_query(topic_id)).scalars().all()
             )
 
             # Get dynamic categories
@@ -112,15 +132,8 @@ class LLMAnalyzer:
             Summary of analysis results
         """
         with self.SessionLocal() as session:
-            # Get topics to analyze
-            query = select(Topic)
-
-            if not force:
-                # Only unanalyzed topics
-                subquery = select(LLMAnalysis).where(
-                    LLMAnalysis.topic_id == Topic.id
-                )
-                query = query.where(~subquery.exists())
+            # Get topics to analyze: unanalyzed ones unless forced
+            query = select(Topic) if force else unanalyzed_topics_query()
 
             if limit:
                 query = query.limit(limit)
@@ -254,12 +267,7 @@ class LLMAnalyzer:
 
         with self.SessionLocal() as session:
             # Get recent analyzed topics for context
-            analyses = session.execute(
-                select(LLMAnalysis, Topic)
-                .join(Topic, LLMAnalysis.topic_id == Topic.id)
-                .order_by(LLMAnalysis.analyzed_at.desc())
-                .limit(limit)
-            ).all()
+            analyses = session.execute(recent_analyses_query(limit)).all()
 
             if not analyses:
                 return (
@@ -459,10 +467,7 @@ Return ONLY valid JSON matching this schema:
         for topic in topics[:limit]:
             # Get first post for content
             first_post = session.execute(
-                select(Post)
-                .where(Post.topic_id == topic.id)
-                .order_by(Post.post_number)
-                .limit(1)
+                topic_posts_query(topic.id).limit(1)
             ).scalar_one_or_none()
 
             post_content = ""
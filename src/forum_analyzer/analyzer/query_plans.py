@@ -0,0 +1,207 @@
+"""Check that report and analysis queries use their indexes.
+
+Each reporter method and analyzer query is run against a SQLite
+database while its SQL is captured; every captured statement is then
+explained with ``EXPLAIN QUERY PLAN``. A query passes when the table it
+filters is searched through an index starting with the expected columns.
+Queries that read every visible topic anyway (keyword counts, problem
+distribution, table counts) have no expected index and always pass.
+"""
+
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..config.settings import DatabaseSettings
+from .llm_analyzer import (
+    recent_analyses_query,
+    topic_posts_query,
+    unanalyzed_topics_query,
+)
+from .reporter import ForumAnalyzer
+
+# Table and leading index columns a query should search by; a list gives
+# one expectation per statement of a method running several
+Expectation = Optional[Tuple[str, Tuple[str, ...]]]
+
+VISIBLE_BY_REPLIES = ("topics", ("visible", "reply_count"))
+
+# The activity trend runs several queries with different indexes
+ACTIVITY_TREND_QUERIES: List[Expectation] = [
+    ("topics", ("visible", "created_at")),
+    ("topics", ("visible", "created_at")),
+    None,  # all visible topics
+    ("topics", ("visible", "last_posted_at")),
+]
+
+REPORT_QUERIES: Dict[str, Tuple[Callable[[ForumAnalyzer], object], Any]] = {
+    "most_discussed": (
+        lambda analyzer: analyzer.get_most_discussed_topics(),
+        VISIBLE_BY_REPLIES,
+    ),
+    "keywords": (
+        lambda analyzer: analyzer.get_frequent_keywords_from_titles(),
+        None,
+    ),
+    "activity_trend": (
+        lambda analyzer: analyzer.get_topics_by_activity_trend(),
+        ACTIVITY_TREND_QUERIES,
+    ),
+    "unanswered": (
+        lambda analyzer: analyzer.get_unanswered_topics(),
+        ("topics", ("visible", "accepted_answer", "reply_count")),
+    ),
+    "high_engagement": (
+        lambda analyzer: analyzer.get_high_engagement_topics(),
+        ("topics", ("visible", "like_count")),
+    ),
+    "keyword_search": (
+        lambda analyzer: analyzer.search_topics_by_keyword("error"),
+        VISIBLE_BY_REPLIES,
+    ),
+    "error_patterns": (
+        lambda analyzer: analyzer.detect_common_error_patterns(),
+        VISIBLE_BY_REPLIES,
+    ),
+    "problem_distribution": (
+        lambda analyzer: analyzer.get_problem_category_distribution(),
+        None,
+    ),
+    "database_stats": (
+        lambda analyzer: analyzer.get_database_stats(),
+        None,
+    ),
+}
+
+ANALYSIS_QUERIES: Dict[
+    str, Tuple[Callable[[Session], object], Expectation]
+] = {
+    "topic_posts": (
+        lambda session: session.execute(topic_posts_query(0)).all(),
+        ("posts", ("topic_id", "post_number")),
+    ),
+    "unanalyzed_topics": (
+        lambda session: session.execute(unanalyzed_topics_query()).all(),
+        ("llm_analysis", ("topic_id",)),
+    ),
+    "recent_analyses": (
+        lambda session: session.execute(recent_analyses_query(50)).all(),
+        ("llm_analysis", ("analyzed_at",)),
+    ),
+}
+
+_PLAN_TABLE = re.compile(
+    r"^(?P<op>SCAN|SEARCH) (?P<table>\w+)"
+    r"(?: USING (?:COVERING )?INDEX (?P<index>\w+))?"
+)
+
+
+@dataclass
+class QueryPlan:
+    """Plan of one captured statement."""
+
+    name: str
+    expected: Expectation
+    plan: List[str]
+    index: Optional[str] = None
+    index_columns: Tuple[str, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        """Whether the expected index (if any) is used."""
+        if self.expected is None:
+            return True
+        return self.index_columns[: len(self.expected[1])] == self.expected[1]
+
+
+@contextmanager
+def _captured(engine: Engine):
+    statements: List[Tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def _explain(
+    engine: Engine, name: str, statement: str, parameters, expected
+) -> QueryPlan:
+    with engine.connect() as conn:
+        plan = [
+            row[3]
+            for row in conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            )
+        ]
+        result = QueryPlan(name=name, expected=expected, plan=plan)
+        if expected is None:
+            return result
+
+        for line in plan:
+            match = _PLAN_TABLE.match(line)
+            if match and match["table"] == expected[0] and match["index"]:
+                result.index = match["index"]
+                result.index_columns = tuple(
+                    row[2]
+                    for row in conn.exec_driver_sql(
+                        f"PRAGMA index_info({match['index']})"
+                    )
+                )
+                break
+    return result
+
+
+def _plans(
+    engine: Engine, name: str, run: Callable[[], object], expected
+) -> List[QueryPlan]:
+    with _captured(engine) as statements:
+        run()
+    if isinstance(expected, list):
+        expectations = expected
+    else:
+        expectations = [expected] * len(statements)
+    return [
+        _explain(engine, name, statement, parameters, expectation)
+        for (statement, parameters), expectation in zip(
+            statements, expectations
+        )
+    ]
+
+
+def check_query_plans(
+    db_path: str, database: Optional[DatabaseSettings] = None
+) -> List[QueryPlan]:
+    """Explain every report and analysis query against a database.
+
+    The database is migrated first, which creates any missing index.
+
+    Args:
+        db_path: Path to the SQLite database file
+        database: Database settings whose SQLite profile to apply
+
+    Returns:
+        One plan per executed statement, in execution order
+    """
+    analyzer = ForumAnalyzer(db_path, database)
+    engine = analyzer.engine
+
+    plans = []
+    for name, (run, expected) in REPORT_QUERIES.items():
+        plans += _plans(engine, name, lambda: run(analyzer), expected)
+
+    with Session(engine) as session:
+        for name, (run, expected) in ANALYSIS_QUERIES.items():
+            plans += _plans(engine, name, lambda: run(session), expected)
+
+    engine.dispose()
+    return plans
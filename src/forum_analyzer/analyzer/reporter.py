@@ -4,13 +4,20 @@ import re
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import create_engine, select, func, and_, or_, desc
+from sqlalchemy import select, func, and_, or_, desc
 from sqlalchemy.orm import Session
 
-from forum_analyzer.collector.models import Topic, Post, User, Category
-
+from forum_analyzer.collector.database import create_db_engine
+from forum_analyzer.collector.models import (
+    Topic,
+    Post,
+    User,
+    Category,
+    migrate_schema,
+)
+from forum_analyzer.config.settings import DatabaseSettings
 
 # Common stop words to filter out from keyword analysis
 STOP_WORDS = {
@@ -143,14 +150,27 @@ CATEGORY_KEYWORDS = {
 class ForumAnalyzer:
     """Analyze forum data and generate insights."""
 
-    def __init__(self, db_path: str):
+    def __init__(
+        self, db_path: str, database: Optional[DatabaseSettings] = None
+    ):
         """Initialize the analyzer.
 
+        Columns, tables and indexes added since the database was created
+        are added first, through a short-lived writable engine; reports
+        then read through a read-only one, so they never take the write
+        lock of a running collection.
+
         Args:
             db_path: Path to the SQLite database file.
+            database: Database settings whose SQLite profile to apply.
         """
         self.db_path = db_path
-        self.engine = create_engine(f"sqlite:///{db_path}")
+        engine = create_db_engine(database, f"sqlite:///{db_path}")
+        migrate_schema(engine)
+        engine.dispose()
+        self.engine = create_db_engine(
+            database, f"sqlite:///{db_path}", read_only=True
+        )
 
     def get_most_discussed_topics(self, limit: int = 20) -> List[Dict]:
         """Get topics with most replies/views.
@@ -0,0 +1,17 @@
+"""Offline benchmarking: a fake Discourse server, collector benchmark and
+fault-injection soak test."""
+
+from .fake_server import FakeDiscourseServer
+from .faults import FaultInjectingTransport, FaultProfile
+from .runner import BenchmarkResult, run_benchmark
+from .soak import SoakReport, run_soak
+
+__all__ = [
+    "FakeDiscourseServer",
+    "BenchmarkResult",
+    "run_benchmark",
+    "FaultInjectingTransport",
+    "FaultProfile",
+    "SoakReport",
+    "run_soak",
+]
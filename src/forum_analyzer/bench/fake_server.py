@@ -0,0 +1,283 @@
+"""Local stand-in for a Discourse forum.
+
+Serves synthetic categories, topics and posts over plain HTTP/1.1 with
+keep-alive, using only asyncio. Responses follow the Discourse JSON the
+collector reads: paged category listings, topic JSON that embeds the
+first chunk of posts and lists the rest in ``post_stream.stream``, and
+``/t/{id}/posts.json`` batches. Latency can be added per new connection
+(to emulate TCP + TLS handshakes) and per request (server time).
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# Discourse serves 30 topics per listing page and embeds 20 posts per topic
+PAGE_SIZE = 30
+POST_CHUNK_SIZE = 20
+
+# Synthetic IDs: topic = category * TOPIC_ID_BASE + n,
+# post = topic * POST_ID_BASE + post_number
+TOPIC_ID_BASE = 1_000_000
+POST_ID_BASE = 1_000
+
+SYNTHETIC_DATE = "2024-01-01T00:00:00.000Z"
+
+
+class FakeDiscourseServer:
+    """Synthetic Discourse JSON API on localhost."""
+
+    def __init__(
+        self,
+        category_ids: Tuple[int, ...] = (1,),
+        topics_per_category: int = 100,
+        posts_per_topic: int = 10,
+        post_bytes: int = 500,
+        users: int = 50,
+        request_latency: float = 0.0,
+        setup_latency: float = 0.0,
+    ):
+        """Configure the synthetic forum.
+
+        Args:
+            category_ids: Categories to serve
+            topics_per_category: Topics in each category
+            posts_per_topic: Posts in each topic (at most 999)
+            post_bytes: Size of each post's cooked HTML
+            users: Distinct authors posts are spread over
+            request_latency: Seconds added to every request
+            setup_latency: Seconds added to every new connection
+
+        Raises:
+            ValueError: If posts_per_topic does not fit the ID scheme
+        """
+        if not 1 <= posts_per_topic < POST_ID_BASE:
+            raise ValueError(
+                f"posts_per_topic must be between 1 and {POST_ID_BASE - 1}"
+            )
+
+        self.category_ids = tuple(category_ids)
+        self.topics_per_category = topics_per_category
+        self.posts_per_topic = posts_per_topic
+        self.post_bytes = post_bytes
+        self.users = users
+        self.request_latency = request_latency
+        self.setup_latency = setup_latency
+        self.connections = 0
+        self.requests = 0
+        self.server: Optional[asyncio.base_events.Server] = None
+        self.port: Optional[int] = None
+
+    @property
+    def base_url(self) -> str:
+        """URL of the running server."""
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def total_topics(self) -> int:
+        """Number of topics across all categories."""
+        return len(self.category_ids) * self.topics_per_category
+
+    @property
+    def total_posts(self) -> int:
+        """Number of posts across all topics."""
+        return self.total_topics * self.posts_per_topic
+
+    async def start(self) -> str:
+        """Start listening on a free port.
+
+        Returns:
+            Base URL of the server
+        """
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def __aenter__(self) -> "FakeDiscourseServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    async def _handle(self, reader, writer) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.setup_latency)
+
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                self.requests += 1
+                await asyncio.sleep(self.request_latency)
+
+                target = request_line.split()[1].decode()
+                status, payload = self.route(target)
+                body = json.dumps(payload).encode()
+                reason = b"OK" if status == 200 else b"Not Found"
+                close = headers.get("connection", "").lower() == "close"
+                writer.write(
+                    b"HTTP/1.1 %d %s\r\n" % (status, reason)
+                    + b"Content-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n".encode()
+                    + (b"Connection: close\r\n" if close else b"")
+                    + b"\r\n"
+                    + body
+                )
+                await writer.drain()
+                if close:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def route(self, target: str) -> Tuple[int, Dict[str, Any]]:
+        """Answer a request target (path and query string).
+
+        Args:
+            target: Request target, e.g. "/c/1.json?page=2"
+
+        Returns:
+            Tuple of (HTTP status, JSON payload)
+        """
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = url.path.strip("/").removesuffix(".json").split("/")
+
+        try:
+            if len(parts) == 2 and parts[0] == "t":
+                return self._topic(int(parts[1]))
+            if len(parts) == 3 and parts[0] == "t" and parts[2] == "posts":
+                post_ids = [int(i) for i in query.get("post_ids[]", [])]
+                return self._posts(int(parts[1]), post_ids)
+            if len(parts) == 2:
+                page = int(query.get("page", ["0"])[0])
+                return self._category_page(int(parts[1]), page)
+        except ValueError:
+            pass
+        return 404, {
+            "errors": ["The requested URL or resource could not be found."]
+        }
+
+    def _topic_exists(self, topic_id: int) -> bool:
+        category_id, n = divmod(topic_id, TOPIC_ID_BASE)
+        return (
+            category_id in self.category_ids
+            and 1 <= n <= self.topics_per_category
+        )
+
+    def _category_page(
+        self, category_id: int, page: int
+    ) -> Tuple[int, Dict[str, Any]]:
+        if category_id not in self.category_ids:
+            return 404, {"errors": ["Category not found"]}
+
+        first = page * PAGE_SIZE + 1
+        last = min(first + PAGE_SIZE - 1, self.topics_per_category)
+        topics = [
+            self._topic_summary(category_id * TOPIC_ID_BASE + n)
+            for n in range(first, last + 1)
+        ]
+        more = last < self.topics_per_category
+        return 200, {
+            "category": {
+                "id": category_id,
+                "name": f"Category {category_id}",
+                "slug": f"category-{category_id}",
+                "description_text": "Synthetic category",
+                "topic_count": self.topics_per_category,
+                "post_count": self.topics_per_category * self.posts_per_topic,
+            },
+            "topic_list": {
+                "topics": topics,
+                "more_topics_url": (
+                    f"/c/{category_id}.json?page={page + 1}" if more else None
+                ),
+            },
+        }
+
+    def _topic_summary(self, topic_id: int) -> Dict[str, Any]:
+        return {
+            "id": topic_id,
+            "category_id": topic_id // TOPIC_ID_BASE,
+            "title": f"Synthetic topic {topic_id}",
+            "slug": f"synthetic-topic-{topic_id}",
+            "posts_count": self.posts_per_topic,
+            "reply_count": self.posts_per_topic - 1,
+            "created_at": SYNTHETIC_DATE,
+            "last_posted_at": SYNTHETIC_DATE,
+            "bumped_at": SYNTHETIC_DATE,
+            "pinned": False,
+        }
+
+    def _topic(self, topic_id: int) -> Tuple[int, Dict[str, Any]]:
+        if not self._topic_exists(topic_id):
+            return 404, {"errors": ["Topic not found"]}
+
+        stream = [
+            topic_id * POST_ID_BASE + n
+            for n in range(1, self.posts_per_topic + 1)
+        ]
+        return 200, {
+            **self._topic_summary(topic_id),
+            "views": 100,
+            "like_count": 0,
+            "word_count": self.posts_per_topic * 50,
+            "post_stream": {
+                "posts": [
+                    self._post(post_id) for post_id in stream[:POST_CHUNK_SIZE]
+                ],
+                "stream": stream,
+            },
+        }
+
+    def _posts(
+        self, topic_id: int, post_ids: List[int]
+    ) -> Tuple[int, Dict[str, Any]]:
+        if not self._topic_exists(topic_id):
+            return 404, {"errors": ["Topic not found"]}
+
+        posts = [
+            self._post(post_id)
+            for post_id in post_ids
+            if post_id // POST_ID_BASE == topic_id
+            and 1 <= post_id % POST_ID_BASE <= self.posts_per_topic
+        ]
+        return 200, {"post_stream": {"posts": posts}}
+
+    def _post(self, post_id: int) -> Dict[str, Any]:
+        topic_id, post_number = divmod(post_id, POST_ID_BASE)
+        return {
+            "id": post_id,
+            "topic_id": topic_id,
+            "post_number": post_number,
+            "username": f"user{post_id % self.users}",
+            "created_at": SYNTHETIC_DATE,
+            "updated_at": SYNTHETIC_DATE,
+            "reply_count": 0,
+            "quote_count": 0,
+            "incoming_link_count": 0,
+            "reads": 1,
+            "readers_count": 1,
+            "score": 0.0,
+            "cooked": "<p>" + "x" * max(self.post_bytes - 7, 0) + "</p>",
+        }
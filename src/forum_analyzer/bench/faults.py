@@ -0,0 +1,182 @@
+"""Fault injection for the API client's HTTP transport.
+
+FaultInjectingTransport sits between ForumAPIClient and the network and,
+at configurable rates, answers a request with a 429 or a 5xx, times it
+out, cuts the response body short or delays it. Everything else is
+forwarded to a real pooled transport unchanged.
+"""
+
+import asyncio
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+# Injected fault kinds, in the order their rates are applied
+FAULT_KINDS = ("throttled", "server_error", "timeout", "truncated", "slow")
+
+_TOPIC_PATH = re.compile(r"^/t/(\d+)\.json$")
+
+
+@dataclass
+class FaultProfile:
+    """Rates (0-1, per request attempt) and shape of injected faults."""
+
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    rate_timeout: float = 0.0
+    rate_truncated: float = 0.0
+    rate_slow: float = 0.0
+    slow_seconds: float = 2.0
+    timeout_delay: float = 0.0
+    # Retry-After sent with 429 and 503 responses; None sends none, which
+    # leaves the client to its exponential backoff
+    retry_after: Optional[str] = "1"
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        rates = self.rates()
+        if any(rate < 0 for rate in rates.values()):
+            raise ValueError("Fault rates must not be negative")
+        if sum(rates.values()) > 1:
+            raise ValueError("Fault rates must add up to at most 1")
+
+    def rates(self) -> Dict[str, float]:
+        """Rate of each fault kind."""
+        return dict(
+            zip(
+                FAULT_KINDS,
+                (
+                    self.rate_429,
+                    self.rate_5xx,
+                    self.rate_timeout,
+                    self.rate_truncated,
+                    self.rate_slow,
+                ),
+            )
+        )
+
+
+class FaultInjectingTransport(httpx.AsyncBaseTransport):
+    """httpx transport that injects faults in front of a real transport.
+
+    Counters survive the client closing the transport, so one instance can
+    serve several clients in turn (e.g. collection passes resumed after an
+    interruption) and report over all of them.
+    """
+
+    def __init__(
+        self,
+        profile: FaultProfile,
+        limits: Optional[httpx.Limits] = None,
+    ):
+        """Initialize the transport.
+
+        Args:
+            profile: Fault rates and shape
+            limits: Connection pool limits of the real transport
+        """
+        self.profile = profile
+        self.limits = limits or httpx.Limits()
+        self.random = random.Random(profile.seed)
+        self.attempts = 0
+        self.injected: Counter = Counter()
+        # Successful (complete, 200) topic responses per topic ID
+        self.topic_fetches: Counter = Counter()
+        self._inner: Optional[httpx.AsyncHTTPTransport] = None
+
+    def _pick_fault(self) -> Optional[str]:
+        draw = self.random.random()
+        for kind, rate in self.profile.rates().items():
+            if draw < rate:
+                return kind
+            draw -= rate
+        return None
+
+    def _inner_transport(self) -> httpx.AsyncHTTPTransport:
+        if self._inner is None:
+            self._inner = httpx.AsyncHTTPTransport(limits=self.limits)
+        return self._inner
+
+    def _fault_response(
+        self, status_code: int, request: httpx.Request
+    ) -> httpx.Response:
+        headers = {"Content-Type": "application/json"}
+        if self.profile.retry_after is not None and status_code in (429, 503):
+            headers["Retry-After"] = self.profile.retry_after
+        return httpx.Response(
+            status_code,
+            headers=headers,
+            json={"errors": ["Injected fault"]},
+            request=request,
+        )
+
+    async def _forward(
+        self, request: httpx.Request
+    ) -> Tuple[httpx.Response, bytes]:
+        response = await self._inner_transport().handle_async_request(request)
+        try:
+            # Raw bytes: the client decodes any Content-Encoding itself
+            body = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+        return response, body
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        """Answer a request, injecting a fault at the profile's rates.
+
+        Args:
+            request: Outgoing request
+
+        Returns:
+            Response from the real transport or an injected one
+
+        Raises:
+            httpx.ReadTimeout: For an injected timeout
+        """
+        self.attempts += 1
+        fault = self._pick_fault()
+        if fault:
+            self.injected[fault] += 1
+
+        if fault == "throttled":
+            return self._fault_response(429, request)
+        if fault == "server_error":
+            status_code = self.random.choice((500, 502, 503))
+            return self._fault_response(status_code, request)
+        if fault == "timeout":
+            await asyncio.sleep(self.profile.timeout_delay)
+            raise httpx.ReadTimeout("Injected timeout", request=request)
+        if fault == "slow":
+            await asyncio.sleep(self.profile.slow_seconds)
+
+        response, body = await self._forward(request)
+        headers = [
+            (name, value)
+            for name, value in response.headers.items()
+            if name.lower() not in ("content-length", "transfer-encoding")
+        ]
+        if fault == "truncated":
+            body = body[: len(body) // 2]
+        elif response.status_code == 200:
+            match = _TOPIC_PATH.match(request.url.path)
+            if match:
+                self.topic_fetches[int(match.group(1))] += 1
+
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=body,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        """Close the real transport; the next request opens a new one."""
+        if self._inner is not None:
+            await self._inner.aclose()
+            self._inner = None
@@ -0,0 +1,166 @@
+"""End-to-end collector benchmark against the fake Discourse server."""
+
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..collector.orchestrator import collect_category
+from ..config.settings import (
+    APISettings,
+    DatabaseSettings,
+    ScrapingSettings,
+    Settings,
+)
+from .fake_server import FakeDiscourseServer
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+BENCH_CATEGORY_ID = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput and time split of one benchmark run."""
+
+    topics: int
+    posts: int
+    requests: int
+    connections: int
+    wall_seconds: float
+    topics_per_second: float
+    posts_per_second: float
+    # Request and SQL times are summed over concurrent work, so with
+    # concurrency above 1 they can exceed the wall time
+    network_seconds: float
+    limiter_wait_seconds: float
+    db_seconds: float
+    peak_rss_mb: Optional[float]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Result as a JSON-serializable dict."""
+        return asdict(self)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB, if available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class _SQLTimer:
+    """Sums time spent executing SQL on every engine while installed."""
+
+    def __init__(self):
+        self.seconds = 0.0
+
+    def _before(self, conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("bench_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, many):
+        started = conn.info["bench_started"].pop()
+        self.seconds += time.perf_counter() - started
+
+    @contextmanager
+    def installed(self) -> Iterator["_SQLTimer"]:
+        event.listen(Engine, "before_cursor_execute", self._before)
+        event.listen(Engine, "after_cursor_execute", self._after)
+        try:
+            yield self
+        finally:
+            event.remove(Engine, "before_cursor_execute", self._before)
+            event.remove(Engine, "after_cursor_execute", self._after)
+
+
+async def run_benchmark(
+    work_dir: Path,
+    topics: int = 300,
+    posts_per_topic: int = 10,
+    post_bytes: int = 500,
+    latency_ms: float = 20.0,
+    concurrency: int = 8,
+    posts_batch_size: int = 20,
+    commit_batch_size: int = 1,
+    write_queue_size: int = 0,
+) -> BenchmarkResult:
+    """Collect a synthetic category through the full collect_category path.
+
+    Args:
+        work_dir: Empty directory for the database and checkpoints
+        topics: Topics in the synthetic category
+        posts_per_topic: Posts in each topic
+        post_bytes: Size of each post's cooked HTML
+        latency_ms: Server time added to every request
+        concurrency: scraping.max_concurrency and connection pool size
+        posts_batch_size: Posts fetched per request beyond the first chunk
+        commit_batch_size: Topics stored per transaction (group commit)
+        write_queue_size: Topics buffered for a writer thread (0: store
+            on the event loop)
+
+    Returns:
+        Benchmark result
+    """
+    server = FakeDiscourseServer(
+        category_ids=(BENCH_CATEGORY_ID,),
+        topics_per_category=topics,
+        posts_per_topic=posts_per_topic,
+        post_bytes=post_bytes,
+        request_latency=latency_ms / 1000,
+    )
+
+    async with server:
+        settings = Settings(
+            api=APISettings(
+                base_url=server.base_url,
+                category_path="c",
+                rate_limit=1_000_000.0,
+                burst=concurrency,
+                max_retries=0,
+                max_connections=concurrency,
+                max_keepalive_connections=concurrency,
+            ),
+            database=DatabaseSettings(
+                url=f"sqlite:///{work_dir / 'bench.db'}"
+            ),
+            scraping=ScrapingSettings(
+                checkpoint_dir=str(work_dir / "checkpoints"),
+                max_concurrency=concurrency,
+                prefetch_pages=1,
+                posts_batch_size=posts_batch_size,
+                commit_batch_size=commit_batch_size,
+                write_queue_size=write_queue_size,
+            ),
+        )
+
+        with _SQLTimer().installed() as sql_timer:
+            started = time.perf_counter()
+            stats = await collect_category(
+                category_id=BENCH_CATEGORY_ID, settings=settings
+            )
+            wall = time.perf_counter() - started
+
+    requests = stats["requests"]["total"]
+    return BenchmarkResult(
+        topics=stats["topics_processed"],
+        posts=stats["posts_collected"],
+        requests=server.requests,
+        connections=server.connections,
+        wall_seconds=round(wall, 3),
+        topics_per_second=round(stats["topics_processed"] / wall, 1),
+        posts_per_second=round(stats["posts_collected"] / wall, 1),
+        network_seconds=requests["total_latency_s"],
+        limiter_wait_seconds=requests["total_wait_s"],
+        db_seconds=round(sql_timer.seconds, 3),
+        peak_rss_mb=peak_rss_mb(),
+    )
@@ -0,0 +1,309 @@
+"""Soak test of collection under injected faults and interruptions.
+
+Repeatedly collects a synthetic category from the fake Discourse server
+through a FaultInjectingTransport. Each cycle starts from an empty
+database and runs collection passes until one completes; a pass can be
+cut off after ``interrupt_every`` seconds, as a crash would, and the next
+pass resumes from the checkpoint. Every finished cycle is checked
+against the server for lost work (missing topics and posts) and
+duplicated work (topics fetched more than once, user post counts above
+the posts actually stored).
+"""
+
+import asyncio
+import logging
+import shutil
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from ..collector.api_client import ForumAPIClient
+from ..collector.checkpoint_manager import CheckpointManager
+from ..collector.database import create_db_engine
+from ..collector.models import Post, Topic, User, migrate_schema
+from ..collector.orchestrator import CollectionOrchestrator
+from ..config.settings import (
+    APISettings,
+    DatabaseSettings,
+    ScrapingSettings,
+    Settings,
+)
+from .fake_server import FakeDiscourseServer
+from .faults import FaultInjectingTransport, FaultProfile
+
+logger = logging.getLogger(__name__)
+
+SOAK_CATEGORY_ID = 1
+
+
+@dataclass
+class SoakReport:
+    """Outcome of a soak run, summed over all cycles."""
+
+    wall_seconds: float
+    cycles: int
+    passes: int
+    interruptions: int
+    failed_passes: int
+    # Cycles given up after max_passes without a pass completing
+    abandoned_cycles: int
+    topics_stored: int
+    posts_stored: int
+    effective_topics_per_second: float
+    logical_requests: int
+    transport_attempts: int
+    retry_amplification: float
+    injected: Dict[str, int] = field(default_factory=dict)
+    # Lost work: expected rows missing once a cycle finished
+    missing_topics: int = 0
+    missing_posts: int = 0
+    # Duplicated work: repeated topic downloads and over-counted posts
+    duplicate_topic_fetches: int = 0
+    user_post_count_drift: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Report as a JSON-serializable dict."""
+        return asdict(self)
+
+
+def _soak_settings(
+    work_dir: Path,
+    base_url: str,
+    concurrency: int,
+    max_retries: int,
+) -> Settings:
+    return Settings(
+        api=APISettings(
+            base_url=base_url,
+            category_path="c",
+            rate_limit=1_000_000.0,
+            burst=concurrency,
+            max_retries=max_retries,
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency,
+        ),
+        database=DatabaseSettings(url=f"sqlite:///{work_dir / 'soak.db'}"),
+        scraping=ScrapingSettings(
+            checkpoint_dir=str(work_dir / "checkpoints"),
+            max_concurrency=concurrency,
+            prefetch_pages=1,
+        ),
+    )
+
+
+async def _collection_pass(
+    settings: Settings,
+    session_factory: sessionmaker,
+    transport: FaultInjectingTransport,
+    interrupt_after: Optional[float],
+) -> Dict[str, Any]:
+    """Run one collection pass, possibly cut off part-way.
+
+    Returns:
+        Dict with "outcome" ("completed", "interrupted" or "failed") and
+        the pass's request totals
+    """
+    db_session = session_factory()
+    checkpoint_dir = Path(settings.scraping.checkpoint_dir)
+    client = ForumAPIClient.from_settings(
+        settings.api, state_dir=checkpoint_dir, transport=transport
+    )
+
+    outcome = "completed"
+    try:
+        async with client as api_client:
+            orchestrator = CollectionOrchestrator(
+                api_client=api_client,
+                db_session=db_session,
+                checkpoint_mgr=CheckpointManager(
+                    session=db_session, checkpoint_dir=checkpoint_dir
+                ),
+                settings=settings,
+            )
+            try:
+                await asyncio.wait_for(
+                    orchestrator.collect_category(
+                        SOAK_CATEGORY_ID, full_fetch=True
+                    ),
+                    timeout=interrupt_after,
+                )
+            except asyncio.TimeoutError:
+                outcome = "interrupted"
+            except Exception as e:
+                logger.warning(f"Collection pass failed: {e}")
+                outcome = "failed"
+    finally:
+        db_session.rollback()
+        db_session.close()
+
+    totals = client.metrics.snapshot()["total"]
+    return {
+        "outcome": outcome,
+        "requests": totals["requests"],
+        "retries": totals["retries"],
+    }
+
+
+def _verify_cycle(
+    session_factory: sessionmaker, server: FakeDiscourseServer
+) -> Dict[str, int]:
+    """Compare a finished cycle's database with the server's content."""
+    with session_factory() as db_session:
+        topics = db_session.scalar(
+            select(func.count(Topic.id)).where(
+                Topic.category_id == SOAK_CATEGORY_ID
+            )
+        )
+        posts = db_session.scalar(select(func.count(Post.id)))
+        counted = db_session.scalar(
+            select(func.coalesce(func.sum(User.post_count), 0))
+        )
+
+    return {
+        "topics": topics,
+        "posts": posts,
+        "missing_topics": server.total_topics - topics,
+        "missing_posts": server.total_posts - posts,
+        "user_post_count_drift": counted - posts,
+    }
+
+
+async def run_soak(
+    work_dir: Path,
+    duration: float,
+    profile: FaultProfile,
+    topics: int = 300,
+    posts_per_topic: int = 30,
+    latency_ms: float = 5.0,
+    concurrency: int = 8,
+    max_retries: int = 3,
+    interrupt_every: Optional[float] = None,
+    max_passes: int = 50,
+) -> SoakReport:
+    """Collect a synthetic category in cycles under injected faults.
+
+    A cycle that is under way when ``duration`` runs out is finished, so
+    every cycle in the report has been verified.
+
+    Args:
+        work_dir: Empty directory for per-cycle databases and checkpoints
+        duration: Seconds to keep starting new cycles for
+        profile: Faults to inject
+        topics: Topics in the synthetic category
+        posts_per_topic: Posts in each topic; above 20 the posts endpoint
+            is exercised as well
+        latency_ms: Server time added to every request
+        concurrency: scraping.max_concurrency and connection pool size
+        max_retries: api.max_retries of the collecting client
+        interrupt_every: Cut each pass off after this many seconds
+            (default: never)
+        max_passes: Passes after which a cycle is given up
+
+    Returns:
+        Soak report
+    """
+    server = FakeDiscourseServer(
+        category_ids=(SOAK_CATEGORY_ID,),
+        topics_per_category=topics,
+        posts_per_topic=posts_per_topic,
+        request_latency=latency_ms / 1000,
+    )
+    transport = FaultInjectingTransport(
+        profile,
+        limits=httpx.Limits(
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency,
+        ),
+    )
+
+    totals = {
+        "cycles": 0,
+        "passes": 0,
+        "interrupted": 0,
+        "failed": 0,
+        "abandoned_cycles": 0,
+        "requests": 0,
+        "retries": 0,
+        "topics": 0,
+        "posts": 0,
+        "missing_topics": 0,
+        "missing_posts": 0,
+        "duplicate_topic_fetches": 0,
+        "user_post_count_drift": 0,
+    }
+
+    async with server:
+        started = time.perf_counter()
+        while totals["cycles"] == 0 or (
+            time.perf_counter() - started < duration
+        ):
+            cycle_dir = work_dir / f"cycle-{totals['cycles']}"
+            cycle_dir.mkdir(parents=True, exist_ok=True)
+            settings = _soak_settings(
+                cycle_dir, server.base_url, concurrency, max_retries
+            )
+            engine = create_db_engine(settings.database)
+            migrate_schema(engine)
+            session_factory = sessionmaker(bind=engine)
+            transport.topic_fetches.clear()
+
+            for _ in range(max_passes):
+                result = await _collection_pass(
+                    settings, session_factory, transport, interrupt_every
+                )
+                totals["passes"] += 1
+                totals["requests"] += result["requests"]
+                totals["retries"] += result["retries"]
+                if result["outcome"] == "completed":
+                    break
+                totals[result["outcome"]] += 1
+            else:
+                totals["abandoned_cycles"] += 1
+
+            verified = _verify_cycle(session_factory, server)
+            engine.dispose()
+            shutil.rmtree(cycle_dir, ignore_errors=True)
+
+            for key in (
+                "topics",
+                "posts",
+                "missing_topics",
+                "missing_posts",
+                "user_post_count_drift",
+            ):
+                totals[key] += verified[key]
+            totals["duplicate_topic_fetches"] += sum(
+                transport.topic_fetches.values()
+            ) - len(transport.topic_fetches)
+            totals["cycles"] += 1
+            logger.info(f"Soak cycle {totals['cycles']}: {verified}")
+
+        wall = time.perf_counter() - started
+
+    logical = totals["requests"] - totals["retries"]
+    return SoakReport(
+        wall_seconds=round(wall, 3),
+        cycles=totals["cycles"],
+        passes=totals["passes"],
+        interruptions=totals["interrupted"],
+        failed_passes=totals["failed"],
+        abandoned_cycles=totals["abandoned_cycles"],
+        topics_stored=totals["topics"],
+        posts_stored=totals["posts"],
+        effective_topics_per_second=round(totals["topics"] / wall, 1),
+        logical_requests=logical,
+        transport_attempts=transport.attempts,
+        retry_amplification=round(
+            transport.attempts / logical if logical else 0.0, 3
+        ),
+        injected=dict(transport.injected),
+        missing_topics=totals["missing_topics"],
+        missing_posts=totals["missing_posts"],
+        duplicate_topic_fetches=totals["duplicate_topic_fetches"],
+        user_post_count_drift=totals["user_post_count_drift"],
+    )
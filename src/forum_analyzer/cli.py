@@ -1,7 +1,10 @@
 """CLI interface for Discourse Forum Analyzer."""
 
 import asyncio
+import json
 import sys
+import tempfile
+from contextlib import contextmanager
 from functools import wraps
 from pathlib import Path
 from typing import Optional
@@ -19,23 +22,44 @@ from rich.progress import (
 )
 from rich.table import Table
 from rich.markdown import Markdown
-from sqlalchemy import create_engine, select, func
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session
 
+from forum_analyzer.collector.compression import compress_posts
+from forum_analyzer.collector.database import create_db_engine
+from forum_analyzer.collector.migrations import (
+    DEFAULT_BATCH_SIZE,
+    pending_migrations,
+    run_migrations,
+)
 from forum_analyzer.collector.models import (
     Base,
     Category,
     Topic,
     Post,
     User,
+    migrate_schema,
 )
 from forum_analyzer.collector.orchestrator import (
+    collect_categories,
+    collect_forums,
     collect_category,
     incremental_update,
+    reingest_archive,
+    sync_firehose,
+)
+from forum_analyzer.collector.storage import refresh_users
+from forum_analyzer.collector.worker import (
+    find_forum,
+    make_queue,
+    run_worker,
+    seed_queue,
 )
 from forum_analyzer.config.settings import get_settings, set_project_dir
 from forum_analyzer.analyzer.reporter import ForumAnalyzer
 from forum_analyzer.analyzer.llm_analyzer import LLMAnalyzer
+from forum_analyzer.analyzer.query_plans import check_query_plans
+from forum_analyzer.bench import FaultProfile, run_benchmark, run_soak
 
 console = Console()
 
@@ -85,7 +109,11 @@ def ensure_database_exists() -> bool:
     # Check if database file exists and has tables
     if db_path.exists():
         try:
-            engine = create_engine(f"sqlite:///{db_path}")
+            engine = create_db_engine(
+                get_settings().database, f"sqlite:///{db_path}"
+            )
+            # Add columns introduced since the database was created
+            migrate_schema(engine)
             with Session(engine) as session:
                 # Try to query a table to see if schema exists
                 session.execute(select(Category).limit(1))
@@ -115,7 +143,9 @@ def init_database(force: bool = False) -> None:
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        engine = create_engine(f"sqlite:///{db_path}")
+        engine = create_db_engine(
+            get_settings().database, f"sqlite:///{db_path}"
+        )
         Base.metadata.create_all(engine)
         console.print(f"[green]✓[/green] Database initialized at {db_path}")
     except Exception as e:
@@ -145,6 +175,81 @@ def display_config(
     console.print()
 
 
+def run_all_categories(
+    full_fetch: bool,
+    page_limit: Optional[int] = None,
+    metrics_file: Optional[Path] = None,
+):
+    """Collect or update every configured category in one event loop.
+
+    When ``forums`` are configured, every category of every forum is
+    collected instead, each forum through its own rate pool.
+
+    Args:
+        full_fetch: If True, full collection; if False, incremental update
+        page_limit: Optional limit on number of pages per category
+        metrics_file: Optional JSON file to write request metrics to
+    """
+    settings = get_settings()
+    if settings.forums:
+        run = collect_forums(
+            full_fetch=full_fetch,
+            page_limit=page_limit,
+            metrics_file=metrics_file,
+        )
+    else:
+        category_ids = [category.id for category in settings.categories]
+        if not category_ids:
+            console.print(
+                "[red]✗ No categories configured in config.yaml[/red]"
+            )
+            sys.exit(1)
+        run = collect_categories(
+            category_ids,
+            full_fetch=full_fetch,
+            page_limit=page_limit,
+            metrics_file=metrics_file,
+        )
+
+    try:
+        results = asyncio.run(run)
+    except KeyboardInterrupt:
+        console.print(
+            "\n[yellow]Interrupted by user. "
+            "Progress saved to checkpoints.[/yellow]"
+        )
+        sys.exit(130)
+
+    table = Table(title="Categories")
+    table.add_column("Category", style="cyan")
+    table.add_column("New topics", justify="right")
+    table.add_column("Updated topics", justify="right")
+    table.add_column("Posts added", justify="right")
+    table.add_column("Status")
+
+    failed = 0
+    for category_id, stats in results.items():
+        if "error" in stats:
+            failed += 1
+            table.add_row(
+                str(category_id), "-", "-", "-", f"[red]{stats['error']}[/red]"
+            )
+        else:
+            table.add_row(
+                str(category_id),
+                str(stats.get("topics_processed", 0)),
+                str(stats.get("topics_updated", 0)),
+                str(stats.get("posts_added", 0)),
+                "[green]✓[/green]",
+            )
+
+    console.print()
+    console.print(table)
+    show_database_stats()
+    if failed:
+        sys.exit(1)
+
+
 @click.group()
 @click.option(
     "--dir",
@@ -314,11 +419,31 @@ def init(ctx, force):
     default=None,
     help="Limit number of pages to collect (for testing)",
 )
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Replay responses from the archive instead of the network",
+)
+@click.option(
+    "--all",
+    "all_categories",
+    is_flag=True,
+    help="Collect every category in config.yaml concurrently",
+)
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write per-endpoint request metrics to this JSON file",
+)
 @handle_config_errors
 def collect(
     category_id: int,
     resume: bool,
     page_limit: Optional[int],
+    offline: bool,
+    all_categories: bool,
+    metrics_file: Optional[Path],
 ):
     """Collect all topics and posts from a category.
 
@@ -330,7 +455,25 @@ def collect(
         forum-analyzer collect
         forum-analyzer collect --category-id 25
         forum-analyzer collect --no-resume  # Start fresh, ignore checkpoints
+        forum-analyzer collect --offline  # Replay from api.archive_dir
+        forum-analyzer collect --all  # Every configured category at once
+        forum-analyzer collect --metrics-file logs/metrics.json
     """
+    if all_categories:
+        if offline:
+            console.print(
+                "[red]✗ --offline cannot be combined with --all[/red]"
+            )
+            sys.exit(1)
+        if not ensure_database_exists():
+            init_database()
+        run_all_categories(
+            full_fetch=not resume,
+            page_limit=page_limit,
+            metrics_file=metrics_file,
+        )
+        return
+
     console.print(
         Panel.fit(
             f"[bold]Collecting Category Data[/bold]\n"
@@ -357,6 +500,8 @@ def collect(
                 category_id=category_id,
                 full_fetch=not resume,  # Invert: --no-resume = full fetch
                 page_limit=page_limit,
+                offline=offline,
+                metrics_file=metrics_file,
             )
         )
 
@@ -455,8 +600,22 @@ def collect(
 
 @cli.command()
 @click.option("--category-id", default=18, type=int, help="Category ID")
+@click.option(
+    "--all",
+    "all_categories",
+    is_flag=True,
+    help="Update every category in config.yaml concurrently",
+)
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write per-endpoint request metrics to this JSON file",
+)
 @handle_config_errors
-def update(category_id: int):
+def update(
+    category_id: int, all_categories: bool, metrics_file: Optional[Path]
+):
     """Incrementally update existing data with new posts.
 
     This command fetches only new topics and posts since the last collection,
@@ -465,6 +624,7 @@ def update(category_id: int):
     Examples:
         forum-analyzer update
         forum-analyzer update --category-id 25
+        forum-analyzer update --all
     """
     console.print(
         Panel.fit(
@@ -482,11 +642,19 @@ def update(category_id: int):
         )
         sys.exit(1)
 
+    if all_categories:
+        run_all_categories(full_fetch=False, metrics_file=metrics_file)
+        return
+
     display_config(category_id)
 
     try:
         # Run the async update function
-        stats = asyncio.run(incremental_update(category_id=category_id))
+        stats = asyncio.run(
+            incremental_update(
+                category_id=category_id, metrics_file=metrics_file
+            )
+        )
 
         console.print()
         console.print(
@@ -509,6 +677,904 @@ def update(category_id: int):
         sys.exit(1)
 
 
+@cli.command()
+@click.option(
+    "--firehose",
+    is_flag=True,
+    help="Follow the forum-wide latest-posts feed instead of listings",
+)
+@click.option(
+    "--interval",
+    type=float,
+    default=10.0,
+    show_default=True,
+    help="Seconds between firehose polls",
+)
+@click.option(
+    "--once",
+    is_flag=True,
+    help="Apply a single firehose pass and exit",
+)
+@handle_config_errors
+def sync(firehose: bool, interval: float, once: bool):
+    """Keep the database in sync with the forum.
+
+    Without --firehose, updates every category in config.yaml (same as
+    'update --all'). With --firehose, polls the latest-posts feed and inserts
+    new replies directly, fetching whole topics only when they are new.
+    Stop it with Ctrl+C; the feed position is saved after every poll.
+
+    Examples:
+        forum-analyzer sync
+        forum-analyzer sync --firehose --interval 5
+        forum-analyzer sync --firehose --once
+    """
+    if not ensure_database_exists():
+        console.print(
+            "[red]✗ Database not found. "
+            "Run 'forum-analyzer collect' first.[/red]"
+        )
+        sys.exit(1)
+
+    if not firehose:
+        run_all_categories(full_fetch=False)
+        return
+
+    try:
+        console.print(
+            f"[cyan]Following latest posts every {interval:g}s "
+            f"(Ctrl+C to stop)...[/cyan]"
+        )
+        stats = asyncio.run(sync_firehose(interval=interval, once=once))
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Sync stopped.[/yellow]")
+        return
+    except Exception as e:
+        console.print(f"\n[red]✗ Sync failed: {e}[/red]")
+        sys.exit(1)
+
+    console.print(
+        Panel(
+            f"[bold green]✓ Sync completed![/bold green]\n"
+            f"New topics: {stats.get('topics_processed', 0)}\n"
+            f"Topics updated: {stats.get('topics_updated', 0)}\n"
+            f"Posts added: {stats.get('posts_added', 0)}",
+            border_style="green",
+        )
+    )
+
+
+@cli.command()
+@click.option(
+    "--archive-dir",
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    help="Archive directory (default: api.archive_dir from config)",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Decoder processes (default: number of CPUs)",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Skip confirmation when the database already has topics",
+)
+@handle_config_errors
+def reingest(archive_dir: Optional[Path], workers: Optional[int], force):
+    """Rebuild the database from the raw response archive.
+
+    Replays every archived category page and topic through the normal
+    storage code without any network access. Run it against a fresh
+    database after changing the schema or the mapping.
+
+    Examples:
+        forum-analyzer reingest
+        forum-analyzer reingest --archive-dir /backups/archive --workers 8
+    """
+    console.print(
+        Panel.fit("[bold]Re-ingest Archive[/bold]", border_style="blue")
+    )
+    console.print()
+
+    if not ensure_database_exists():
+        init_database()
+        console.print()
+    elif not force:
+        settings = get_settings()
+        engine = create_db_engine(settings.database)
+        with Session(engine) as session:
+            topic_count = (
+                session.scalar(select(func.count()).select_from(Topic)) or 0
+            )
+        if topic_count and not click.confirm(
+            f"The database already holds {topic_count} topic(s); archived "
+            "copies will replace stored topics and posts, even newer ones. "
+            "Continue?",
+            default=False,
+        ):
+            console.print("[yellow]Aborted.[/yellow]")
+            return
+
+    try:
+        stats = asyncio.run(
+            reingest_archive(archive_dir=archive_dir, workers=workers)
+        )
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Re-ingest interrupted by user.[/yellow]")
+        sys.exit(130)
+    except Exception as e:
+        console.print(f"\n[red]✗ Re-ingest failed: {e}[/red]")
+        sys.exit(1)
+
+    console.print(
+        Panel(
+            f"[bold green]✓ Re-ingest completed![/bold green]\n"
+            f"Archived responses: {stats['records']}\n"
+            f"Categories: {stats['categories']}\n"
+            f"Topics processed: {stats['topics_processed']}\n"
+            f"Posts collected: {stats['posts_collected']}\n"
+            f"Skipped: {stats['skipped']}",
+            border_style="green",
+        )
+    )
+    show_database_stats()
+
+
+@cli.group()
+def queue():
+    """Manage the distributed work queue used by 'worker'."""
+    pass
+
+
+@queue.command(name="seed")
+@click.option(
+    "--category-id",
+    "category_ids",
+    type=int,
+    multiple=True,
+    help="Category ID to enqueue (repeatable; default: all configured)",
+)
+@click.option(
+    "--forum",
+    "forum_name",
+    default=None,
+    help="Seed a forum from the 'forums' section of config.yaml",
+)
+@handle_config_errors
+def queue_seed(category_ids, forum_name: Optional[str]):
+    """Enqueue a backfill of one or more categories.
+
+    Adds a job for the first page of each category. Workers enqueue the
+    following pages and every topic as they go. Categories whose jobs are
+    already queued or done are left alone; use 'queue purge' to allow a
+    new backfill.
+
+    Examples:
+        forum-analyzer queue seed
+        forum-analyzer queue seed --category-id 18 --category-id 25
+    """
+    if not ensure_database_exists():
+        init_database()
+
+    try:
+        added = seed_queue(
+            category_ids=list(category_ids) or None, forum_name=forum_name
+        )
+    except ValueError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        sys.exit(1)
+
+    console.print(f"[green]✓ Enqueued {added} category backfill(s)[/green]")
+
+
+@queue.command(name="status")
+@click.option(
+    "--forum",
+    "forum_name",
+    default=None,
+    help="Show a forum from the 'forums' section of config.yaml",
+)
+@handle_config_errors
+def queue_status(forum_name: Optional[str]):
+    """Show job counts per kind and status.
+
+    Examples:
+        forum-analyzer queue status
+    """
+    with _queue_session(forum_name) as work_queue:
+        counts = work_queue.counts()
+
+    statuses = ["pending", "leased", "done", "failed"]
+    table = Table(title="Work Queue")
+    table.add_column("Job kind", style="cyan")
+    for status in statuses:
+        table.add_column(status.capitalize(), justify="right")
+    for kind, by_status in sorted(counts.items()):
+        table.add_row(kind, *(str(by_status.get(s, 0)) for s in statuses))
+
+    console.print(table)
+
+
+@queue.command(name="retry")
+@click.option(
+    "--forum",
+    "forum_name",
+    default=None,
+    help="Retry a forum from the 'forums' section of config.yaml",
+)
+@handle_config_errors
+def queue_retry(forum_name: Optional[str]):
+    """Make failed jobs pending again.
+
+    Examples:
+        forum-analyzer queue retry
+    """
+    with _queue_session(forum_name) as work_queue:
+        count = work_queue.retry_failed()
+    console.print(f"[green]✓ Re-queued {count} failed job(s)[/green]")
+
+
+@queue.command(name="purge")
+@click.option(
+    "--forum",
+    "forum_name",
+    default=None,
+    help="Purge a forum from the 'forums' section of config.yaml",
+)
+@handle_config_errors
+def queue_purge(forum_name: Optional[str]):
+    """Delete finished jobs so categories can be backfilled again.
+
+    Examples:
+        forum-analyzer queue purge
+    """
+    with _queue_session(forum_name) as work_queue:
+        count = work_queue.purge_done()
+    console.print(f"[green]✓ Deleted {count} finished job(s)[/green]")
+
+
+@contextmanager
+def _queue_session(forum_name: Optional[str]):
+    """Open the work queue of the configured database."""
+    if not ensure_database_exists():
+        console.print(
+            "[red]✗ Database not found. "
+            "Run 'forum-analyzer queue seed' first.[/red]"
+        )
+        sys.exit(1)
+
+    settings = get_settings()
+    try:
+        forum = find_forum(settings, forum_name)
+    except ValueError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        sys.exit(1)
+
+    engine = create_db_engine(settings.database)
+    with Session(engine) as session:
+        yield make_queue(session, settings, forum)
+
+
+@cli.group()
+def db():
+    """Maintain the collected database."""
+    pass
+
+
+@db.command(name="rebuild-users")
+@handle_config_errors
+def db_rebuild_users():
+    """Recompute every user's statistics from the stored posts.
+
+    Post and topic counts and first/last seen times are aggregated from
+    the posts table; users without posts are removed. Use after
+    upgrading from versions that counted re-fetched posts twice.
+
+    Examples:
+        forum-analyzer db rebuild-users
+    """
+    if not ensure_database_exists():
+        console.print(
+            "[red]✗ Database not found. Run 'forum-analyzer collect' "
+            "first.[/red]"
+        )
+        sys.exit(1)
+
+    settings = get_settings()
+    engine = create_db_engine(settings.database)
+    with Session(engine) as session:
+        refresh_users(session)
+        session.commit()
+        users = session.scalar(select(func.count()).select_from(User))
+
+    console.print(f"[green]✓ Rebuilt statistics of {users} user(s)[/green]")
+
+
+@db.command(name="migrate")
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_SIZE,
+    show_default=True,
+    help="Rows per backfill transaction",
+)
+@click.option(
+    "--status", "show_status", is_flag=True, help="List pending migrations"
+)
+@handle_config_errors
+def db_migrate(batch_size: int, show_status: bool):
+    """Apply pending versioned migrations to the database.
+
+    Backfills run in batches, each its own transaction, so collection can
+    continue meanwhile; an interrupted migration resumes where it
+    stopped when run again.
+
+    Examples:
+        forum-analyzer db migrate --status
+        forum-analyzer db migrate --batch-size 5000
+    """
+    if not ensure_database_exists():
+        console.print(
+            "[red]✗ Database not found. Run 'forum-analyzer collect' "
+            "first.[/red]"
+        )
+        sys.exit(1)
+
+    engine = create_db_engine(get_settings().database)
+    pending = pending_migrations(engine)
+    if not pending:
+        console.print("[green]✓ Database schema is up to date[/green]")
+        return
+
+    if show_status:
+        table = Table(title="Pending Migrations")
+        table.add_column("Version", justify="right", style="cyan")
+        table.add_column("Name")
+        table.add_column("Description")
+        for migration in pending:
+            table.add_row(
+                str(migration.version), migration.name, migration.description
+            )
+        console.print(table)
+        return
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Migrating...", total=None)
+
+        def on_batch(migration, rows_done):
+            progress.update(
+                task,
+                description=(
+                    f"Migration {migration.version} ({migration.name}): "
+                    f"{rows_done} rows"
+                ),
+            )
+
+        completed = run_migrations(
+            engine, batch_size=batch_size, on_batch=on_batch
+        )
+
+    for migration in completed:
+        console.print(
+            f"[green]✓[/green] {migration.version}: {migration.name}"
+        )
+
+
+@db.command(name="compress")
+@click.option(
+    "--level",
+    type=click.IntRange(min=1, max=22),
+    default=None,
+    help="zstd level (default: database.compression_level)",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Posts per transaction",
+)
+@click.option(
+    "--no-vacuum",
+    is_flag=True,
+    help="Skip VACUUM; freed pages are reused but the file keeps its size",
+)
+@handle_config_errors
+def db_compress(level: Optional[int], batch_size: int, no_vacuum: bool):
+    """Compress stored post bodies with zstd and report the space saved.
+
+    Trains a dictionary on the database's own posts, then compresses
+    every post body still stored as text, a batch per transaction; rerun
+    to continue after an interruption. Compressed bodies are decompressed
+    transparently on read. Set database.compress_bodies to also compress
+    posts collected from now on. Requires: pip install
+    'forum-analyzer[zstd]'
+
+    Examples:
+        forum-analyzer db compress
+        forum-analyzer db compress --level 9 --no-vacuum
+    """
+    if not ensure_database_exists():
+        console.print(
+            "[red]✗ Database not found. Run 'forum-analyzer collect' "
+            "first.[/red]"
+        )
+        sys.exit(1)
+
+    settings = get_settings()
+    engine = create_db_engine(settings.database)
+    try:
+        with console.status("Compressing post bodies..."):
+            report = compress_posts(
+                engine,
+                level=level or settings.database.compression_level,
+                batch_size=batch_size,
+                vacuum=not no_vacuum,
+            )
+    except (RuntimeError, ValueError) as e:
+        console.print(f"[red]✗ {e}[/red]")
+        sys.exit(1)
+
+    def mb(size: int) -> str:
+        return f"{size / 2**20:,.1f} MB"
+
+    table = Table(title="Post Body Compression")
+    table.add_column("", style="cyan")
+    table.add_column("Before", justify="right")
+    table.add_column("After", justify="right")
+    table.add_row(
+        "Post bodies",
+        mb(report.body_bytes_before),
+        mb(report.body_bytes_after),
+    )
+    table.add_row(
+        "Database file",
+        mb(report.file_bytes_before),
+        mb(report.file_bytes_after),
+    )
+    console.print(table)
+    console.print(
+        f"[green]✓ Compressed {report.posts} post(s), "
+        f"saved {mb(report.saved_bytes)}[/green]"
+    )
+    if not settings.database.compress_bodies:
+        console.print(
+            "[yellow]Set database.compress_bodies: true in config.yaml to "
+            "compress newly collected posts too.[/yellow]"
+        )
+
+
+@db.command(name="check-indexes")
+@click.option(
+    "--verbose", is_flag=True, help="Show the plan of every statement"
+)
+@handle_config_errors
+def db_check_indexes(verbose: bool):
+    """Check that report and analysis queries use their indexes.
+
+    Runs every reporter and analyzer query against the database, creating
+    missing indexes first, and explains it with EXPLAIN QUERY PLAN. Exits
+    with status 1 if a query does not search by its index.
+
+    Examples:
+        forum-analyzer db check-indexes
+        forum-analyzer db check-indexes --verbose
+    """
+    if not ensure_database_exists():
+        console.print(
+            "[red]✗ Database not found. Run 'forum-analyzer collect' "
+            "first.[/red]"
+        )
+        sys.exit(1)
+
+    plans = check_query_plans(str(get_db_path()), get_settings().database)
+
+    table = Table(title="Query Plans")
+    table.add_column("Query", style="cyan")
+    table.add_column("Index")
+    table.add_column("Plan" if verbose else "Expected")
+    table.add_column("OK", justify="center")
+    for plan in plans:
+        if not verbose and plan.expected is None:
+            continue
+        if verbose:
+            detail = "; ".join(plan.plan)
+        else:
+            detail = f"{plan.expected[0]}({', '.join(plan.expected[1])})"
+        table.add_row(
+            plan.name,
+            plan.index or "-",
+            detail,
+            "[green]✓[/green]" if plan.ok else "[red]✗[/red]",
+        )
+    console.print(table)
+
+    failed = sorted({plan.name for plan in plans if not plan.ok})
+    if failed:
+        console.print(
+            f"[red]✗ Not using their index: {', '.join(failed)}[/red]"
+        )
+        sys.exit(1)
+    console.print("[green]✓ Every query uses its index[/green]")
+
+
+@cli.command()
+@click.option(
+    "--forum",
+    "forum_name",
+    default=None,
+    help="Work on a forum from the 'forums' section of config.yaml",
+)
+@click.option(
+    "--concurrency",
+    type=int,
+    default=None,
+    help="Jobs run at once (default: scraping.max_concurrency)",
+)
+@click.option(
+    "--keep-running",
+    is_flag=True,
+    help="Keep polling for new jobs after the queue is drained",
+)
+@click.option(
+    "--worker-id",
+    default=None,
+    help="Identity recorded on leases (default: host:pid)",
+)
+@handle_config_errors
+def worker(
+    forum_name: Optional[str],
+    concurrency: Optional[int],
+    keep_running: bool,
+    worker_id: Optional[str],
+):
+    """Claim and run jobs from the work queue.
+
+    Start any number of workers, on this machine or others sharing the
+    same database. Each job is leased to one worker at a time; leases of
+    a crashed worker expire after scraping.lease_seconds and the job is
+    picked up by another. Every worker applies its own rate limit, so
+    size the number of workers to what the forum tolerates.
+
+    Examples:
+        forum-analyzer queue seed
+        forum-analyzer worker --concurrency 4
+    """
+    if not ensure_database_exists():
+        console.print(
+            "[red]✗ Database not found. "
+            "Run 'forum-analyzer queue seed' first.[/red]"
+        )
+        sys.exit(1)
+
+    try:
+        console.print("[cyan]Worker started (Ctrl+C to stop)...[/cyan]")
+        stats = asyncio.run(
+            run_worker(
+                forum_name=forum_name,
+                concurrency=concurrency,
+                exit_when_idle=not keep_running,
+                worker_id=worker_id,
+            )
+        )
+    except KeyboardInterrupt:
+        console.print(
+            "\n[yellow]Worker stopped; its jobs were released.[/yellow]"
+        )
+        return
+    except Exception as e:
+        console.print(f"\n[red]✗ Worker failed: {e}[/red]")
+        sys.exit(1)
+
+    console.print(
+        Panel(
+            f"[bold green]✓ Queue drained![/bold green]\n"
+            f"Jobs done: {stats['jobs_done']}\n"
+            f"Jobs failed: {stats['jobs_failed']}\n"
+            f"Topics processed: {stats['topics_processed']}\n"
+            f"Posts collected: {stats['posts_collected']}",
+            border_style="green",
+        )
+    )
+
+
+@cli.command()
+@click.option(
+    "--topics",
+    type=int,
+    default=300,
+    show_default=True,
+    help="Topics in the synthetic category",
+)
+@click.option(
+    "--posts-per-topic",
+    type=click.IntRange(1, 999),
+    default=10,
+    show_default=True,
+    help="Posts in each synthetic topic",
+)
+@click.option(
+    "--post-bytes",
+    type=int,
+    default=500,
+    show_default=True,
+    help="Size of each post's HTML",
+)
+@click.option(
+    "--latency-ms",
+    type=float,
+    default=20.0,
+    show_default=True,
+    help="Server time added to every request",
+)
+@click.option(
+    "--concurrency",
+    type=int,
+    default=8,
+    show_default=True,
+    help="Topics fetched concurrently",
+)
+@click.option(
+    "--commit-batch-size",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Topics stored per transaction (group commit)",
+)
+@click.option(
+    "--write-queue-size",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Topics buffered for a database writer thread (0 = off)",
+)
+@click.option(
+    "--json-output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Also write the result to this JSON file",
+)
+def bench(
+    topics: int,
+    posts_per_topic: int,
+    post_bytes: int,
+    latency_ms: float,
+    concurrency: int,
+    commit_batch_size: int,
+    write_queue_size: int,
+    json_output: Optional[Path],
+):
+    """Benchmark the collector against a local fake forum.
+
+    Starts a synthetic Discourse server on localhost and runs a full
+    category collection against it into a throwaway database. No config
+    file or network access is needed, so results are comparable between
+    commits.
+
+    Examples:
+        forum-analyzer bench
+        forum-analyzer bench --topics 1000 --posts-per-topic 60
+        forum-analyzer bench --json-output bench.json
+    """
+    with tempfile.TemporaryDirectory(prefix="forum-bench-") as work_dir:
+        result = asyncio.run(
+            run_benchmark(
+                Path(work_dir),
+                topics=topics,
+                posts_per_topic=posts_per_topic,
+                post_bytes=post_bytes,
+                latency_ms=latency_ms,
+                concurrency=concurrency,
+                commit_batch_size=commit_batch_size,
+                write_queue_size=write_queue_size,
+            )
+        )
+
+    table = Table(title="Collector Benchmark")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Topics", str(result.topics))
+    table.add_row("Posts", str(result.posts))
+    table.add_row("Requests", str(result.requests))
+    table.add_row("Connections", str(result.connections))
+    table.add_row("Wall time", f"{result.wall_seconds:.2f} s")
+    table.add_row("Topics/sec", f"{result.topics_per_second:.1f}")
+    table.add_row("Posts/sec", f"{result.posts_per_second:.1f}")
+    table.add_row("Network time (summed)", f"{result.network_seconds:.2f} s")
+    table.add_row("Limiter wait", f"{result.limiter_wait_seconds:.2f} s")
+    table.add_row("DB time (summed)", f"{result.db_seconds:.2f} s")
+    if result.peak_rss_mb is not None:
+        table.add_row("Peak RSS", f"{result.peak_rss_mb:.0f} MiB")
+
+    console.print()
+    console.print(table)
+
+    if json_output:
+        json_output.write_text(json.dumps(result.as_dict(), indent=2))
+        console.print(f"[green]✓ Result written to {json_output}[/green]")
+
+
+def _fault_rate(name: str, help_text: str):
+    return click.option(
+        name,
+        type=click.FloatRange(0, 1),
+        default=0.0,
+        show_default=True,
+        help=help_text,
+    )
+
+
+@cli.command()
+@click.option(
+    "--duration",
+    type=float,
+    default=10.0,
+    show_default=True,
+    help="Minutes to keep starting collection cycles for",
+)
+@click.option(
+    "--topics",
+    type=int,
+    default=300,
+    show_default=True,
+    help="Topics in the synthetic category",
+)
+@click.option(
+    "--posts-per-topic",
+    type=click.IntRange(1, 999),
+    default=30,
+    show_default=True,
+    help="Posts in each synthetic topic",
+)
+@click.option(
+    "--concurrency",
+    type=int,
+    default=8,
+    show_default=True,
+    help="Topics fetched concurrently",
+)
+@_fault_rate("--rate-429", "Share of requests answered 429")
+@_fault_rate("--rate-5xx", "Share of requests answered 500/502/503")
+@_fault_rate("--rate-timeout", "Share of requests that time out")
+@_fault_rate("--rate-truncated", "Share of responses cut off mid-body")
+@_fault_rate("--rate-slow", "Share of responses delayed by --slow-ms")
+@click.option(
+    "--slow-ms",
+    type=float,
+    default=2000.0,
+    show_default=True,
+    help="Delay of a slow response",
+)
+@click.option(
+    "--retry-after",
+    type=str,
+    default="1",
+    show_default=True,
+    help="Retry-After sent with 429/503 ('' to send none)",
+)
+@click.option(
+    "--interrupt-every",
+    type=float,
+    default=None,
+    help="Cut each collection pass off after this many seconds",
+)
+@click.option(
+    "--max-retries",
+    type=int,
+    default=3,
+    show_default=True,
+    help="Retries per request of the collecting client",
+)
+@click.option(
+    "--seed",
+    type=int,
+    default=None,
+    help="Random seed for reproducible fault sequences",
+)
+@click.option(
+    "--json-output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Also write the report to this JSON file",
+)
+def soak(
+    duration: float,
+    topics: int,
+    posts_per_topic: int,
+    concurrency: int,
+    rate_429: float,
+    rate_5xx: float,
+    rate_timeout: float,
+    rate_truncated: float,
+    rate_slow: float,
+    slow_ms: float,
+    retry_after: str,
+    interrupt_every: Optional[float],
+    max_retries: int,
+    seed: Optional[int],
+    json_output: Optional[Path],
+):
+    """Soak-test collection against a local fake forum with faults.
+
+    Collects a synthetic category over and over, each time into a fresh
+    database, while injecting throttling, server errors, timeouts,
+    truncated and slow responses. With --interrupt-every, passes are cut
+    off and resumed from their checkpoint. Reports effective throughput,
+    retry amplification and any work lost or duplicated across resumes.
+
+    Examples:
+        forum-analyzer soak --duration 1 --rate-429 0.05 --rate-5xx 0.02
+        forum-analyzer soak --duration 120 --rate-timeout 0.01 \\
+            --interrupt-every 30 --json-output soak.json
+    """
+    try:
+        profile = FaultProfile(
+            rate_429=rate_429,
+            rate_5xx=rate_5xx,
+            rate_timeout=rate_timeout,
+            rate_truncated=rate_truncated,
+            rate_slow=rate_slow,
+            slow_seconds=slow_ms / 1000,
+            retry_after=retry_after or None,
+            seed=seed,
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+    with tempfile.TemporaryDirectory(prefix="forum-soak-") as work_dir:
+        report = asyncio.run(
+            run_soak(
+                Path(work_dir),
+                duration=duration * 60,
+                profile=profile,
+                topics=topics,
+                posts_per_topic=posts_per_topic,
+                concurrency=concurrency,
+                max_retries=max_retries,
+                interrupt_every=interrupt_every,
+            )
+        )
+
+    table = Table(title="Collection Soak Test")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Wall time", f"{report.wall_seconds:.1f} s")
+    table.add_row("Cycles", str(report.cycles))
+    table.add_row("Passes", str(report.passes))
+    table.add_row("Interruptions", str(report.interruptions))
+    table.add_row("Failed passes", str(report.failed_passes))
+    table.add_row("Abandoned cycles", str(report.abandoned_cycles))
+    table.add_row("Topics stored", str(report.topics_stored))
+    table.add_row(
+        "Effective topics/sec", f"{report.effective_topics_per_second:.1f}"
+    )
+    table.add_row("Logical requests", str(report.logical_requests))
+    table.add_row("Transport attempts", str(report.transport_attempts))
+    table.add_row("Retry amplification", f"{report.retry_amplification:.3f}")
+    for kind, count in sorted(report.injected.items()):
+        table.add_row(f"Injected {kind}", str(count))
+    table.add_row("Missing topics", str(report.missing_topics))
+    table.add_row("Missing posts", str(report.missing_posts))
+    table.add_row(
+        "Duplicate topic fetches", str(report.duplicate_topic_fetches)
+    )
+    table.add_row("User post count drift", str(report.user_post_count_drift))
+
+    console.print()
+    console.print(table)
+
+    if json_output:
+        json_output.write_text(json.dumps(report.as_dict(), indent=2))
+        console.print(f"[green]✓ Report written to {json_output}[/green]")
+
+
 # init-db command removed - database is now created automatically
 # Use 'forum-analyzer init' to initialize a new project
 
@@ -605,7 +1671,12 @@ def show_database_stats():
     db_path = get_db_path()
 
     try:
-        engine = create_engine(f"sqlite:///{db_path}")
+        # Add columns introduced since the database was created; the
+        # read-only engine below cannot
+        ensure_database_exists()
+        engine = create_db_engine(
+            get_settings().database, f"sqlite:///{db_path}", read_only=True
+        )
 
         with Session(engine) as session:
             # Get counts
@@ -728,7 +1799,7 @@ def analyze(limit: int, output: Optional[str]):
         sys.exit(1)
 
     try:
-        analyzer = ForumAnalyzer(str(db_path))
+        analyzer = ForumAnalyzer(str(db_path), get_settings().database)
 
         # Generate report
         with console.status("[bold green]Analyzing forum data..."):
@@ -791,7 +1862,7 @@ def search(keyword: str, limit: int):
         sys.exit(1)
 
     try:
-        analyzer = ForumAnalyzer(str(db_path))
+        analyzer = ForumAnalyzer(str(db_path), get_settings().database)
         results = analyzer.search_topics_by_keyword(keyword)
 
         if not results:
@@ -864,7 +1935,7 @@ def patterns():
         sys.exit(1)
 
     try:
-        analyzer = ForumAnalyzer(str(db_path))
+        analyzer = ForumAnalyzer(str(db_path), get_settings().database)
 
         # Get error patterns
         with console.status("[bold green]Detecting patterns..."):
@@ -985,10 +2056,10 @@ def llm_analyze(limit: Optional[int], force: bool, topic_id: Optional[int]):
     try:
 
         # Check if themes exist and provide guidance
-        from sqlalchemy import create_engine, select
+        from sqlalchemy import select
         from forum_analyzer.collector.models import ProblemTheme
 
-        engine = create_engine(settings.database.url)
+        engine = create_db_engine(settings.database)
         from sqlalchemy.orm import Session
 
         with Session(engine) as session:
@@ -1184,7 +2255,8 @@ def themes_list():
 
     try:
         settings = get_settings()
-        engine = create_engine(settings.database.url)
+        ensure_database_exists()
+        engine = create_db_engine(settings.database, read_only=True)
 
         with Session(engine) as session:
             from forum_analyzer.collector.models import ProblemTheme
@@ -1270,7 +2342,7 @@ def themes_clean(force: bool):
 
     try:
         settings = get_settings()
-        engine = create_engine(settings.database.url)
+        engine = create_db_engine(settings.database)
 
         with Session(engine) as session:
             from forum_analyzer.collector.models import ProblemTheme
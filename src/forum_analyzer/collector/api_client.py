@@ -1,43 +1,483 @@
 """Async API client for Discourse Forum."""
 
 import asyncio
+import copy
+import json
 import logging
-from typing import Any, Dict, Optional
-from datetime import datetime
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from importlib.util import find_spec
+from pathlib import Path
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Union
+from datetime import datetime, timezone
 
 import httpx
 from tenacity import (
-    retry,
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
 )
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised without the extra
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - exercised without the extra
+    ijson = None
+
+from ..config.settings import APISettings, ForumConfig
+from .archive import ResponseArchive
+from .metrics import RequestMetrics
+from .http_cache import ValidatorCache
+
 logger = logging.getLogger(__name__)
 
+# Responses worth retrying; the throttling subset also slows the client down
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+THROTTLE_STATUS_CODES = {429, 503}
+
+# Stored IDs of a forum with id_namespace n start at n * ID_NAMESPACE_SIZE
+ID_NAMESPACE_SIZE = 10**12
+
+# Subdirectory of state_dir for client state; the checkpoint commands
+# treat every *.json file directly in the checkpoint directory as a
+# checkpoint
+STATE_SUBDIR = "state"
+
+# Upper bound on how long a single Retry-After header may pause us
+MAX_RETRY_AFTER = 300.0
+
+# Content encodings httpx can decode, and the module each one needs
+CONTENT_ENCODING_MODULES = {
+    "gzip": None,
+    "deflate": None,
+    "br": ("brotli", "brotlicffi"),
+    "zstd": ("zstandard",),
+}
+
+
+def decode_json(body: bytes) -> Any:
+    """Parse a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+class _ResponseReader:
+    """Async file-like view of a streamed response for ijson."""
+
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+        self._buffer = b""
+
+    async def read(self, size: int = -1) -> bytes:
+        while not self._buffer:
+            try:
+                self._buffer = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                return b""
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
 
 class RateLimiter:
-    """Token bucket rate limiter."""
+    """Token bucket rate limiter.
 
-    def __init__(self, rate: float = 1.0):
+    Tokens refill continuously at ``rate`` per second up to ``burst``, and
+    each request consumes one. Callers queue on a lock, so any number of
+    coroutines can share one limiter without exceeding the rate.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 1):
         """Initialize rate limiter.
 
         Args:
             rate: Requests per second (default: 1.0)
+            burst: Requests allowed back-to-back when the bucket is full
+                (default: 1)
         """
         self.rate = rate
-        self.interval = 1.0 / rate
-        self.last_request = 0.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.total_wait = 0.0
+        self._updated_at: Optional[float] = None
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last refill."""
+        if self._updated_at is not None:
+            elapsed = now - self._updated_at
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> float:
+        """Acquire permission to make a request.
+
+        Returns:
+            Seconds spent waiting for a token
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        async with self._lock:
+            self._refill(loop.time())
+            while self.tokens < 1 or loop.time() < self._blocked_until:
+                delay = max(
+                    (1 - self.tokens) / self.rate,
+                    self._blocked_until - loop.time(),
+                )
+                await asyncio.sleep(delay)
+                self._refill(loop.time())
+            self.tokens -= 1
 
-    async def acquire(self) -> None:
-        """Acquire permission to make a request."""
-        now = asyncio.get_event_loop().time()
-        time_since_last = now - self.last_request
+        waited = loop.time() - started
+        self.total_wait += waited
+        return waited
 
-        if time_since_last < self.interval:
-            await asyncio.sleep(self.interval - time_since_last)
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate, keeping tokens accrued so far.
 
-        self.last_request = asyncio.get_event_loop().time()
+        Args:
+            rate: New requests per second
+        """
+        if self._updated_at is not None:
+            self._refill(asyncio.get_running_loop().time())
+        self.rate = rate
+
+    def defer(self, seconds: float) -> None:
+        """Hold back all callers for the given number of seconds.
+
+        Args:
+            seconds: Pause length, e.g. from a Retry-After header
+        """
+        until = asyncio.get_running_loop().time() + seconds
+        self._blocked_until = max(self._blocked_until, until)
+
+
+class FairShareLimiter:
+    """One host-level token bucket shared fairly between several clients.
+
+    Each share (e.g. one per category) queues its requests separately and
+    the host bucket hands out tokens round-robin over the shares that are
+    waiting, so a busy share cannot starve the others and an idle share
+    leaves its part of the budget to the rest.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 1):
+        """Initialize the shared limiter.
+
+        Args:
+            rate: Requests per second for the whole host
+            burst: Requests allowed back-to-back when the bucket is full
+        """
+        self.host = RateLimiter(rate=rate, burst=burst)
+        self._queues: Dict[str, Deque[asyncio.Future]] = {}
+        self._ring: Deque[str] = deque()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def share(self, name: str) -> "RateShare":
+        """Get the limiter for one share of the budget.
+
+        Args:
+            name: Share name (e.g. "category:18")
+
+        Returns:
+            Limiter with the RateLimiter.acquire() interface
+        """
+        return RateShare(self, name)
+
+    async def _acquire(self, name: str) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        queue = self._queues.setdefault(name, deque())
+        queue.append(waiter)
+        if name not in self._ring:
+            self._ring.append(name)
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await waiter
+
+    async def _dispatch(self) -> None:
+        """Grant host tokens to waiting shares in round-robin order."""
+        while self._ring:
+            name = self._ring.popleft()
+            queue = self._queues[name]
+            while queue and queue[0].cancelled():
+                queue.popleft()
+            if not queue:
+                continue
+
+            await self.host.acquire()
+            waiter = queue.popleft()
+            if not waiter.cancelled():
+                waiter.set_result(None)
+            if queue:
+                self._ring.append(name)
+
+
+class RateShare:
+    """A FairShareLimiter share, usable wherever a RateLimiter is."""
+
+    def __init__(self, pool: FairShareLimiter, name: str):
+        self.pool = pool
+        self.name = name
+        self.total_wait = 0.0
+
+    async def acquire(self) -> float:
+        """Wait for this share's next turn at the host bucket.
+
+        Returns:
+            Seconds spent waiting
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await self.pool._acquire(self.name)
+        waited = loop.time() - started
+        self.total_wait += waited
+        return waited
+
+
+class AdaptiveRateController:
+    """AIMD request-rate control per endpoint class.
+
+    Each endpoint class (category pages, topics, ...) gets its own
+    RateLimiter. After ``increase_after`` consecutive healthy responses
+    its rate grows by ``increase`` requests per second, up to ``max_rate``;
+    a 429 or 503 multiplies it by ``decrease``, down to ``min_rate``, and
+    any Retry-After pauses that endpoint class. The settled rates can be
+    saved to a JSON file so the next run starts where this one ended.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        increase_after: int = 10,
+        burst: int = 1,
+        state_path: Optional[Path] = None,
+    ):
+        """Initialize the controller.
+
+        Args:
+            initial_rate: Starting requests per second for new endpoints
+            min_rate: Lowest rate backoff may reach
+            max_rate: Highest rate the controller may climb to
+            increase: Requests per second added per healthy streak
+            decrease: Factor applied to the rate on throttling
+            increase_after: Healthy responses needed before increasing
+            burst: Token bucket burst size for each endpoint limiter
+            state_path: Optional JSON file for persisting settled rates
+        """
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.increase_after = increase_after
+        self.burst = burst
+        self.state_path = state_path
+        self.limiters: Dict[str, RateLimiter] = {}
+        self._healthy_streak: Dict[str, int] = {}
+        self._saved_rates = self._load_rates()
+
+    def _clamp(self, rate: float) -> float:
+        """Keep a rate within the configured bounds."""
+        return min(self.max_rate, max(self.min_rate, rate))
+
+    def _load_rates(self) -> Dict[str, float]:
+        """Load rates saved by a previous run."""
+        if not self.state_path or not self.state_path.exists():
+            return {}
+
+        try:
+            with open(self.state_path, "r") as f:
+                data = json.load(f)
+            return {k: float(v) for k, v in data.get("rates", {}).items()}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable rate state: {e}")
+            return {}
+
+    def limiter(self, endpoint: str) -> RateLimiter:
+        """Get the rate limiter for an endpoint class.
+
+        Args:
+            endpoint: Endpoint class name
+
+        Returns:
+            RateLimiter for that endpoint class
+        """
+        if endpoint not in self.limiters:
+            rate = self._clamp(
+                self._saved_rates.get(endpoint, self.initial_rate)
+            )
+            self.limiters[endpoint] = RateLimiter(rate=rate, burst=self.burst)
+            self._healthy_streak[endpoint] = 0
+        return self.limiters[endpoint]
+
+    def record_success(self, endpoint: str) -> None:
+        """Record a healthy response, raising the rate after a streak.
+
+        Args:
+            endpoint: Endpoint class name
+        """
+        limiter = self.limiter(endpoint)
+        self._healthy_streak[endpoint] += 1
+
+        if self._healthy_streak[endpoint] >= self.increase_after:
+            self._healthy_streak[endpoint] = 0
+            rate = self._clamp(limiter.rate + self.increase)
+            if rate != limiter.rate:
+                limiter.set_rate(rate)
+                logger.debug(f"Raised {endpoint} rate to {rate:.2f} req/s")
+
+    def record_throttle(
+        self, endpoint: str, retry_after: Optional[float] = None
+    ) -> None:
+        """Record a throttled response, backing off multiplicatively.
+
+        Args:
+            endpoint: Endpoint class name
+            retry_after: Seconds the server asked us to wait, if any
+        """
+        limiter = self.limiter(endpoint)
+        self._healthy_streak[endpoint] = 0
+
+        rate = self._clamp(limiter.rate * self.decrease)
+        limiter.set_rate(rate)
+        if retry_after:
+            limiter.defer(retry_after)
+
+        logger.warning(
+            f"Throttled on {endpoint}: rate now {rate:.2f} req/s"
+            + (f", pausing {retry_after:.1f}s" if retry_after else "")
+        )
+
+    def save(self) -> None:
+        """Persist the current rates for the next run."""
+        if not self.state_path:
+            return
+
+        rates = dict(self._saved_rates)
+        rates.update(
+            {name: limiter.rate for name, limiter in self.limiters.items()}
+        )
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, "w") as f:
+            json.dump(
+                {
+                    "rates": rates,
+                    "updated_at": datetime.utcnow().isoformat(),
+                },
+                f,
+                indent=2,
+            )
+
+        logger.debug(f"Saved rate state to {self.state_path}")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header into seconds.
+
+    Args:
+        value: Header value (delay in seconds or an HTTP date)
+
+    Returns:
+        Seconds to wait (capped at MAX_RETRY_AFTER), or None
+    """
+    if not value:
+        return None
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def supported_encodings(requested: str) -> str:
+    """Filter an Accept-Encoding list down to what httpx can decode.
+
+    Brotli and zstd responses are only decoded when their optional
+    packages are installed, so advertising them otherwise would hand us
+    bodies we cannot read.
+
+    Args:
+        requested: Comma-separated encodings, e.g. "gzip, br"
+
+    Returns:
+        Comma-separated encodings that are safe to advertise
+    """
+    accepted = []
+    for encoding in (e.strip().lower() for e in requested.split(",")):
+        if encoding not in CONTENT_ENCODING_MODULES:
+            logger.warning(f"Ignoring unknown content encoding: {encoding}")
+            continue
+
+        modules = CONTENT_ENCODING_MODULES[encoding]
+        if modules and not any(find_spec(m) for m in modules):
+            logger.warning(
+                f"Not requesting '{encoding}' responses: install "
+                f"{' or '.join(modules)} to decode them"
+            )
+            continue
+
+        accepted.append(encoding)
+
+    return ", ".join(accepted) or "identity"
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Decide whether a failed request should be retried."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, httpx.TimeoutException)
+
+
+def _wait_for_retry(retry_state: RetryCallState) -> float:
+    """Honour Retry-After when present, else back off exponentially."""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(exc, httpx.HTTPStatusError):
+        retry_after = parse_retry_after(
+            exc.response.headers.get("Retry-After")
+        )
+        if retry_after is not None:
+            return retry_after
+    return wait_exponential(multiplier=1, min=2, max=60)(retry_state)
+
+
+def _rate_state_path(state_dir: Path, forum: Optional[ForumConfig]) -> Path:
+    """File for a client's settled rates.
+
+    A file older versions saved directly in state_dir is moved there.
+    """
+    name = f"rate_state_{forum.name}.json" if forum else "rate_state.json"
+    path = state_dir / STATE_SUBDIR / name
+    legacy = state_dir / name
+    if legacy.exists() and not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        legacy.replace(path)
+    return path
 
 
 class ForumAPIClient:
@@ -50,6 +490,17 @@ class ForumAPIClient:
         rate_limit: float = 1.0,
         timeout: float = 30.0,
         max_retries: int = 3,
+        burst: int = 1,
+        rate_controller: Optional[AdaptiveRateController] = None,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        accept_encoding: str = "gzip, deflate",
+        cache: Optional[ValidatorCache] = None,
+        archive: Optional[ResponseArchive] = None,
+        streaming_decode: bool = False,
+        forum: Optional[str] = None,
+        id_namespace: int = 0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ):
         """Initialize API client.
 
@@ -59,23 +510,174 @@ class ForumAPIClient:
             rate_limit: Requests per second (default: 1.0)
             timeout: Request timeout in seconds (default: 30.0)
             max_retries: Maximum retry attempts (default: 3)
+            burst: Requests allowed back-to-back before the rate limit
+                applies (default: 1)
+            rate_controller: Optional adaptive controller; when set, each
+                endpoint class is also paced by its own adaptive limiter
+                and rate_limit acts as the overall ceiling
+            limits: Connection pool limits (default: httpx defaults)
+            http2: Negotiate HTTP/2 when the server supports it; needs
+                the optional ``h2`` package (default: False)
+            accept_encoding: Response compressions to request
+                (default: "gzip, deflate")
+            cache: Optional validator cache; GET requests are then sent
+                conditionally and 304 responses served from it
+            archive: Optional raw response archive; every successful
+                response body is appended to it
+            streaming_decode: Parse post batches incrementally from the
+                response stream; needs the optional ``ijson`` package and
+                is skipped while archiving, which needs the whole body
+            forum: Name of the forum in a multi-forum configuration
+            id_namespace: Forum ID namespace; IDs passed in and returned
+                are offset by ``id_namespace * ID_NAMESPACE_SIZE`` so that
+                several forums can share one database (default: 0, none)
+            transport: Optional httpx transport to send requests through,
+                e.g. a fault-injecting wrapper; it replaces the pooled
+                default transport, so ``limits`` and ``http2`` then
+                belong to it (default: httpx's own transport)
         """
         self.base_url = base_url
-        self.rate_limiter = RateLimiter(rate=rate_limit)
+        self.rate_limiter = RateLimiter(rate=rate_limit, burst=burst)
+        self.rate_controller = rate_controller
         self.timeout = timeout
         self.max_retries = max_retries
         self.category_path = category_path
+        self.limits = limits or httpx.Limits()
+        self.http2 = http2
+        self.accept_encoding = supported_encodings(accept_encoding)
+        self.cache = cache
+        self.archive = archive
+        self.streaming_decode = streaming_decode
+        self.forum = forum
+        self.id_offset = id_namespace * ID_NAMESPACE_SIZE
+        self.metrics = RequestMetrics()
+        self.transport = transport
         self.client: Optional[httpx.AsyncClient] = None
 
+    @classmethod
+    def from_settings(
+        cls,
+        api: APISettings,
+        state_dir: Optional[Path] = None,
+        forum: Optional[ForumConfig] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> "ForumAPIClient":
+        """Create a client from API settings.
+
+        Args:
+            api: API settings
+            state_dir: Directory for persisted client state such as
+                adaptive rates (e.g. the checkpoint directory); kept in
+                its ``state`` subdirectory
+            forum: Forum this client collects in a multi-forum
+                configuration (names and namespaces its IDs)
+            transport: Optional httpx transport replacing the default one
+
+        Returns:
+            Configured (not yet entered) ForumAPIClient
+        """
+        rate_controller = None
+        rate_limit = api.rate_limit
+
+        if api.adaptive_rate:
+            rate_controller = AdaptiveRateController(
+                initial_rate=api.rate_limit,
+                min_rate=api.min_rate,
+                max_rate=api.max_rate,
+                increase=api.rate_increase,
+                decrease=api.rate_decrease,
+                increase_after=api.rate_increase_after,
+                burst=api.burst,
+                state_path=(
+                    _rate_state_path(state_dir, forum) if state_dir else None
+                ),
+            )
+            # The overall limiter only enforces the hard ceiling
+            rate_limit = api.max_rate
+
+        return cls(
+            base_url=api.base_url,
+            category_path=api.category_path,
+            rate_limit=rate_limit,
+            timeout=api.timeout,
+            max_retries=api.max_retries,
+            burst=api.burst,
+            rate_controller=rate_controller,
+            limits=httpx.Limits(
+                max_connections=api.max_connections,
+                max_keepalive_connections=api.max_keepalive_connections,
+                keepalive_expiry=api.keepalive_expiry,
+            ),
+            http2=api.http2,
+            accept_encoding=api.accept_encoding,
+            cache=(
+                ValidatorCache(Path(api.cache_path))
+                if api.cache_path
+                else None
+            ),
+            archive=(
+                ResponseArchive(
+                    Path(api.archive_dir),
+                    segment_size=api.archive_segment_mb * 2**20,
+                )
+                if api.archive_dir
+                else None
+            ),
+            streaming_decode=api.streaming_decode,
+            forum=forum.name if forum else None,
+            id_namespace=forum.id_namespace if forum else 0,
+            transport=transport,
+        )
+
+    def with_rate_limiter(
+        self, rate_limiter: Union[RateLimiter, RateShare]
+    ) -> "ForumAPIClient":
+        """Get a view of this client paced by a different limiter.
+
+        The view shares the connection pool, caches and adaptive control
+        with this client, so it must only be used while this client is
+        open and must not be entered or closed itself. Its request
+        metrics are its own and also count towards this client's.
+
+        Args:
+            rate_limiter: Limiter for requests made through the view
+
+        Returns:
+            Client view
+        """
+        view = copy.copy(self)
+        view.rate_limiter = rate_limiter
+        view.metrics = RequestMetrics(parent=self.metrics)
+        return view
+
     async def __aenter__(self) -> "ForumAPIClient":
         """Async context manager entry."""
+        if self.streaming_decode and ijson is None:
+            logger.warning(
+                "Streaming decode requested but the 'ijson' package is not "
+                "installed; decoding whole responses (pip install ijson)"
+            )
+            self.streaming_decode = False
+
+        http2 = self.http2
+        if http2 and not find_spec("h2"):
+            logger.warning(
+                "HTTP/2 requested but the 'h2' package is not installed; "
+                "falling back to HTTP/1.1 (pip install 'httpx[http2]')"
+            )
+            http2 = False
+
         self.client = httpx.AsyncClient(
             base_url=self.base_url,
             timeout=self.timeout,
             follow_redirects=True,
+            limits=self.limits,
+            http2=http2,
+            transport=self.transport,
             headers={
                 "User-Agent": "Discourse-Forum-Analyzer/0.1.0",
                 "Accept": "application/json",
+                "Accept-Encoding": self.accept_encoding,
             },
         )
         return self
@@ -84,22 +686,34 @@ class ForumAPIClient:
         """Async context manager exit."""
         if self.client:
             await self.client.aclose()
+        if self.rate_controller:
+            self.rate_controller.save()
+        if self.cache:
+            self.cache.close()
+        if self.archive:
+            self.archive.close()
+
+    def _request_key(self, method: str, url: str, **kwargs) -> str:
+        """Full request URL used to key cached and archived responses."""
+        return str(
+            self.client.build_request(
+                method, url, params=kwargs.get("params")
+            ).url
+        )
 
-    @retry(
-        retry=retry_if_exception_type(
-            (httpx.HTTPStatusError, httpx.TimeoutException)
-        ),
-        wait=wait_exponential(multiplier=1, min=2, max=60),
-        stop=stop_after_attempt(3),
-    )
     async def _request(
-        self, method: str, url: str, **kwargs
+        self, method: str, url: str, endpoint: str = "other", **kwargs
     ) -> Dict[str, Any]:
         """Make HTTP request with retry logic.
 
+        Timeouts and 429/5xx responses are retried up to ``max_retries``
+        times, waiting for Retry-After when the server sends one and
+        backing off exponentially otherwise.
+
         Args:
             method: HTTP method
             url: Request URL
+            endpoint: Endpoint class used for adaptive rate control
             **kwargs: Additional request parameters
 
         Returns:
@@ -111,10 +725,68 @@ class ForumAPIClient:
         if not self.client:
             raise RuntimeError("Client not initialized. Use async context.")
 
-        await self.rate_limiter.acquire()
+        retrying = AsyncRetrying(
+            retry=retry_if_exception(_is_retryable),
+            wait=_wait_for_retry,
+            stop=stop_after_attempt(self.max_retries + 1),
+            reraise=True,
+        )
+        async for attempt in retrying:
+            with attempt:
+                if attempt.retry_state.attempt_number > 1:
+                    self.metrics.record_retry(endpoint)
+                return await self._send(method, url, endpoint, **kwargs)
+
+    async def _send(
+        self, method: str, url: str, endpoint: str, **kwargs
+    ) -> Dict[str, Any]:
+        """Make a single rate-limited HTTP request.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            endpoint: Endpoint class used for adaptive rate control
+            **kwargs: Additional request parameters
+
+        Returns:
+            JSON response data
+        """
+        await self._pace(endpoint)
+
+        cached = None
+        key = None
+        if self.cache or self.archive:
+            key = self._request_key(method, url, **kwargs)
+        if self.cache and method == "GET":
+            cached = self.cache.get(key)
+            if cached:
+                kwargs["headers"] = {
+                    **kwargs.get("headers", {}),
+                    **cached.conditional_headers(),
+                }
 
         logger.debug(f"Making {method} request to {url}")
-        response = await self.client.request(method, url, **kwargs)
+        started = time.monotonic()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            self.metrics.record_error(endpoint, time.monotonic() - started)
+            raise
+        # Wire bytes; transports that hand over a read body report none
+        self.metrics.record_response(
+            endpoint,
+            response.status_code,
+            time.monotonic() - started,
+            response.num_bytes_downloaded or len(response.content),
+        )
+        self._observe(endpoint, response)
+
+        if cached and response.status_code == 304:
+            logger.debug(f"Not modified, serving cached body: {url}")
+            self.cache.hits += 1
+            if self.archive and not self.archive.lookup(key):
+                self.archive.append(key, endpoint, cached.body)
+            return decode_json(cached.body)
 
         # Log redirect information
         if response.history:
@@ -127,7 +799,128 @@ class ForumAPIClient:
 
         response.raise_for_status()
 
-        return response.json()
+        if self.archive:
+            self.archive.append(key, endpoint, response.content)
+
+        if self.cache and method == "GET":
+            self.cache.misses += 1
+            self.cache.put(
+                key,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+
+        return decode_json(response.content)
+
+    async def _pace(self, endpoint: str) -> None:
+        """Wait for the endpoint's adaptive limiter and the global one."""
+        waited = 0.0
+        if self.rate_controller:
+            waited += await self.rate_controller.limiter(endpoint).acquire()
+        waited += await self.rate_limiter.acquire()
+        self.metrics.record_wait(endpoint, waited)
+
+    def _observe(self, endpoint: str, response: httpx.Response) -> None:
+        """Feed a response status back into adaptive rate control."""
+        if not self.rate_controller:
+            return
+        if response.status_code in THROTTLE_STATUS_CODES:
+            self.rate_controller.record_throttle(
+                endpoint,
+                parse_retry_after(response.headers.get("Retry-After")),
+            )
+        elif response.is_success or response.status_code == 304:
+            self.rate_controller.record_success(endpoint)
+
+    async def _stream_items(
+        self, method: str, url: str, prefix: str, endpoint: str, **kwargs
+    ) -> AsyncIterator[Any]:
+        """Yield the JSON items under ``prefix`` as the body streams in.
+
+        Only the request itself is retried; once items have been yielded a
+        broken stream is raised to the caller.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            prefix: ijson prefix of the items (e.g. "post_stream.posts.item")
+            endpoint: Endpoint class used for adaptive rate control
+            **kwargs: Additional request parameters
+
+        Yields:
+            Decoded items, one at a time
+        """
+        if not self.client:
+            raise RuntimeError("Client not initialized. Use async context.")
+
+        retrying = AsyncRetrying(
+            retry=retry_if_exception(_is_retryable),
+            wait=_wait_for_retry,
+            stop=stop_after_attempt(self.max_retries + 1),
+            reraise=True,
+        )
+        async for attempt in retrying:
+            with attempt:
+                if attempt.retry_state.attempt_number > 1:
+                    self.metrics.record_retry(endpoint)
+                await self._pace(endpoint)
+                logger.debug(f"Streaming {method} request to {url}")
+                request = self.client.build_request(method, url, **kwargs)
+                started = time.monotonic()
+                try:
+                    response = await self.client.send(request, stream=True)
+                except httpx.TransportError:
+                    self.metrics.record_error(
+                        endpoint, time.monotonic() - started
+                    )
+                    raise
+                self._observe(endpoint, response)
+                if response.is_error:
+                    await response.aread()
+                    await response.aclose()
+                    self.metrics.record_response(
+                        endpoint,
+                        response.status_code,
+                        time.monotonic() - started,
+                        response.num_bytes_downloaded,
+                    )
+                    response.raise_for_status()
+
+        try:
+            async for item in ijson.items_async(
+                _ResponseReader(response), prefix, use_float=True
+            ):
+                yield item
+        finally:
+            await response.aclose()
+            # Latency of a streamed request covers the whole body
+            self.metrics.record_response(
+                endpoint,
+                response.status_code,
+                time.monotonic() - started,
+                response.num_bytes_downloaded,
+            )
+
+    def _local_id(self, stored_id: int) -> int:
+        """Forum-local ID of a stored (namespaced) ID."""
+        return stored_id - self.id_offset
+
+    def _namespace(self, item: Dict[str, Any], *fields: str) -> Dict[str, Any]:
+        """Move the given ID fields of a payload into this forum's namespace.
+
+        Args:
+            item: JSON object, modified in place
+            *fields: Names of the ID fields to offset
+
+        Returns:
+            The same object
+        """
+        if self.id_offset:
+            for field in fields:
+                if isinstance(item.get(field), int):
+                    item[field] += self.id_offset
+        return item
 
     async def fetch_category_page(
         self, category_id: int, page: int = 0
@@ -141,12 +934,16 @@ class ForumAPIClient:
         Returns:
             Category page JSON data
         """
-        url = f"/{self.category_path}/{category_id}.json"
+        url = f"/{self.category_path}/{self._local_id(category_id)}.json"
         params = {"page": page} if page > 0 else {}
 
         logger.info(f"Fetching category {category_id}, page {page}")
-        data = await self._request("GET", url, params=params)
+        data = await self._request(
+            "GET", url, endpoint="category", params=params
+        )
 
+        for topic in data.get("topic_list", {}).get("topics", []):
+            self._namespace(topic, "id", "category_id")
         return data
 
     async def fetch_topic(self, topic_id: int) -> Dict[str, Any]:
@@ -158,13 +955,107 @@ class ForumAPIClient:
         Returns:
             Topic JSON data
         """
-        url = f"/t/{topic_id}.json"
+        url = f"/t/{self._local_id(topic_id)}.json"
 
         logger.info(f"Fetching topic {topic_id}")
-        data = await self._request("GET", url)
+        data = await self._request("GET", url, endpoint="topic")
 
+        if self.id_offset and data:
+            self._namespace(data, "id", "category_id")
+            post_stream = data.get("post_stream", {})
+            for post in post_stream.get("posts", []):
+                self._namespace(post, "id", "topic_id")
+            if "stream" in post_stream:
+                post_stream["stream"] = [
+                    post_id + self.id_offset
+                    for post_id in post_stream["stream"]
+                ]
         return data
 
+    async def fetch_posts(
+        self, topic_id: int, post_ids: List[int]
+    ) -> List[Dict[str, Any]]:
+        """Fetch specific posts of a topic.
+
+        Topic JSON only embeds the first chunk of posts; the rest are
+        listed by ID in ``post_stream.stream`` and fetched with this call.
+
+        Args:
+            topic_id: Topic ID
+            post_ids: IDs of the posts to fetch
+
+        Returns:
+            Post JSON data
+        """
+        url = f"/t/{self._local_id(topic_id)}/posts.json"
+        params = {"post_ids[]": [self._local_id(i) for i in post_ids]}
+
+        logger.info(f"Fetching {len(post_ids)} posts of topic {topic_id}")
+        data = await self._request("GET", url, endpoint="posts", params=params)
+
+        return [
+            self._namespace(post, "id", "topic_id")
+            for post in data.get("post_stream", {}).get("posts", [])
+        ]
+
+    async def iter_posts(
+        self, topic_id: int, post_ids: List[int]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield specific posts of a topic one at a time.
+
+        With streaming decode enabled, posts are parsed straight off the
+        response stream so a large batch never exists in memory as one
+        body or one dict tree; otherwise this wraps fetch_posts(). Only
+        decoding is incremental: a caller collecting the posts still holds
+        all of them.
+
+        Args:
+            topic_id: Topic ID
+            post_ids: IDs of the posts to fetch
+
+        Yields:
+            Post JSON data
+        """
+        if not self.streaming_decode or self.archive:
+            for post in await self.fetch_posts(topic_id, post_ids):
+                yield post
+            return
+
+        logger.info(f"Streaming {len(post_ids)} posts of topic {topic_id}")
+        items = self._stream_items(
+            "GET",
+            f"/t/{self._local_id(topic_id)}/posts.json",
+            "post_stream.posts.item",
+            endpoint="posts",
+            params={"post_ids[]": [self._local_id(i) for i in post_ids]},
+        )
+        async with aclosing(items):
+            async for post in items:
+                yield self._namespace(post, "id", "topic_id")
+
+    async def fetch_latest_posts(
+        self, before: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch the forum-wide latest posts, newest first.
+
+        Args:
+            before: Only return posts with an ID below this one
+
+        Returns:
+            Post JSON data (each post carries its topic_id)
+        """
+        params = {"before": self._local_id(before)} if before else {}
+
+        logger.info(f"Fetching latest posts before {before or 'now'}")
+        data = await self._request(
+            "GET", "/posts.json", endpoint="latest_posts", params=params
+        )
+
+        return [
+            self._namespace(post, "id", "topic_id", "category_id")
+            for post in data.get("latest_posts", [])
+        ]
+
     async def fetch_category_metadata(
         self, category_id: int
     ) -> Dict[str, Any]:
@@ -178,17 +1069,73 @@ class ForumAPIClient:
         """
         data = await self.fetch_category_page(category_id, page=0)
 
-        return {
-            "id": category_id,
-            "name": data.get("category", {}).get("name", ""),
-            "slug": data.get("category", {}).get("slug", ""),
-            "description": data.get("category", {}).get(
-                "description_text", ""
-            ),
-            "topic_count": data.get("category", {}).get("topic_count", 0),
-            "post_count": data.get("category", {}).get("post_count", 0),
-            "last_scraped_at": datetime.utcnow(),
-        }
+        return category_metadata(category_id, data)
+
+
+class ArchiveMissError(LookupError):
+    """Raised when a replayed request has no archived response."""
+
+
+class ArchiveReplayClient(ForumAPIClient):
+    """ForumAPIClient that answers every request from a response archive.
+
+    Requests are keyed exactly as the live client archives them, so the
+    orchestrator can re-run a collection offline. Replay is not rate
+    limited and never touches the network.
+    """
+
+    def __init__(
+        self, base_url: str, category_path: str, archive: ResponseArchive
+    ):
+        """Initialize replay client.
+
+        Args:
+            base_url: Base URL the archive was recorded against
+            category_path: URL path segment for categories
+            archive: Archive to replay
+        """
+        super().__init__(
+            base_url=base_url, category_path=category_path, max_retries=0
+        )
+        self.archive = archive
+
+    async def _send(
+        self, method: str, url: str, endpoint: str, **kwargs
+    ) -> Dict[str, Any]:
+        """Answer a request from the archive.
+
+        Raises:
+            ArchiveMissError: If the request was never archived
+        """
+        key = self._request_key(method, url, **kwargs)
+        record = self.archive.lookup(key)
+        if record is None:
+            raise ArchiveMissError(f"Not in archive: {key}")
+        return decode_json(self.archive.read(record))
+
+
+def category_metadata(
+    category_id: int, data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Map a category page response to category metadata.
+
+    Args:
+        category_id: Category ID
+        data: Category page JSON data
+
+    Returns:
+        Category metadata
+    """
+    category = data.get("category", {})
+    return {
+        "id": category_id,
+        "name": category.get("name", ""),
+        "slug": category.get("slug", ""),
+        "description": category.get("description_text", ""),
+        "topic_count": category.get("topic_count", 0),
+        "post_count": category.get("post_count", 0),
+        "last_scraped_at": datetime.utcnow(),
+    }
 
 
 async def main():
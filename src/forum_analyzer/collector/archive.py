@@ -0,0 +1,260 @@
+"""Append-only archive of raw API responses.
+
+Every successful response body is compressed as an independent zstd frame
+and appended to a segment file; an SQLite index maps request URLs to
+(segment, offset, length). The archive can later be replayed offline or
+re-ingested into a fresh database without touching the network.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised without the extra
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# zstd level 3 keeps compression well ahead of the network
+COMPRESSION_LEVEL = 3
+
+# Index commits are batched; segment data is flushed before each commit so
+# the index never points past the end of a segment
+COMMIT_EVERY = 100
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise RuntimeError(
+            "The response archive requires the 'zstandard' package "
+            "(pip install 'forum-analyzer[zstd]')"
+        )
+
+
+def segment_path(directory: Path, segment: int) -> Path:
+    """Path of a segment file within an archive directory."""
+    return directory / f"segment-{segment:06d}.zst"
+
+
+@dataclass(frozen=True)
+class ArchiveRecord:
+    """Location of one archived response."""
+
+    url: str
+    endpoint: str
+    segment: int
+    offset: int
+    length: int
+
+
+class ResponseArchive:
+    """Append-only zstd segments with an SQLite offset index."""
+
+    def __init__(self, directory: Path, segment_size: int = 256 * 2**20):
+        """Open (or create) an archive.
+
+        Args:
+            directory: Directory holding segments and the index
+            segment_size: Bytes after which a new segment is started
+        """
+        _require_zstandard()
+
+        self.directory = directory
+        self.segment_size = segment_size
+        self._compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+        self._writer: Optional[BinaryIO] = None
+        self._segment = 0
+        self._pending = 0
+
+        directory.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(directory / "index.db"))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                segment INTEGER NOT NULL,
+                frame_offset INTEGER NOT NULL,
+                frame_length INTEGER NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS records_url ON records (url, id)"
+        )
+        self._conn.commit()
+
+    def _open_writer(self) -> BinaryIO:
+        if self._writer is None:
+            segments = sorted(self.directory.glob("segment-*.zst"))
+            if segments:
+                self._segment = int(segments[-1].stem.split("-")[1])
+            self._writer = open(
+                segment_path(self.directory, self._segment), "ab"
+            )
+
+        if self._writer.tell() >= self.segment_size:
+            self._writer.close()
+            self._segment += 1
+            self._writer = open(
+                segment_path(self.directory, self._segment), "ab"
+            )
+
+        return self._writer
+
+    def append(self, url: str, endpoint: str, body: bytes) -> None:
+        """Archive a response body.
+
+        Args:
+            url: Full request URL including query string
+            endpoint: Endpoint class (e.g. "topic", "category")
+            body: Raw (decoded) response body
+        """
+        writer = self._open_writer()
+        frame = self._compressor.compress(body)
+        offset = writer.tell()
+        writer.write(frame)
+
+        self._conn.execute(
+            "INSERT INTO records (url, endpoint, segment, frame_offset, "
+            "frame_length, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (url, endpoint, self._segment, offset, len(frame), time.time()),
+        )
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        """Flush segment data, then commit the index."""
+        if self._writer:
+            self._writer.flush()
+        self._conn.commit()
+        self._pending = 0
+
+    def lookup(self, url: str) -> Optional[ArchiveRecord]:
+        """Find the most recent record for a URL.
+
+        Args:
+            url: Full request URL including query string
+
+        Returns:
+            Archive record or None
+        """
+        row = self._conn.execute(
+            "SELECT url, endpoint, segment, frame_offset, frame_length "
+            "FROM records WHERE url = ? ORDER BY id DESC LIMIT 1",
+            (url,),
+        ).fetchone()
+        return ArchiveRecord(*row) if row else None
+
+    def latest_records(
+        self, endpoints: Optional[Iterable[str]] = None
+    ) -> List[ArchiveRecord]:
+        """List the most recent record for every archived URL.
+
+        Args:
+            endpoints: Only include these endpoint classes (default: all)
+
+        Returns:
+            Records in the order they were first archived
+        """
+        query = (
+            "SELECT url, endpoint, segment, frame_offset, frame_length "
+            "FROM records WHERE id IN "
+            "(SELECT MAX(id) FROM records GROUP BY url)"
+        )
+        params: Tuple[str, ...] = ()
+        if endpoints is not None:
+            params = tuple(endpoints)
+            placeholders = ", ".join("?" for _ in params)
+            query += f" AND endpoint IN ({placeholders})"
+        query += " ORDER BY id"
+
+        return [
+            ArchiveRecord(*row) for row in self._conn.execute(query, params)
+        ]
+
+    def read(self, record: ArchiveRecord) -> bytes:
+        """Read and decompress an archived body.
+
+        Args:
+            record: Record returned by lookup() or latest_records()
+
+        Returns:
+            Response body bytes
+        """
+        self.flush()
+        return read_record(self.directory, record)
+
+    def close(self) -> None:
+        """Flush pending writes and close the archive."""
+        self.flush()
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        self._conn.close()
+
+
+def read_record(directory: Path, record: ArchiveRecord) -> bytes:
+    """Read one record straight from its segment file.
+
+    Args:
+        directory: Archive directory
+        record: Record to read
+
+    Returns:
+        Response body bytes
+    """
+    _require_zstandard()
+    with open(segment_path(directory, record.segment), "rb") as f:
+        f.seek(record.offset)
+        frame = f.read(record.length)
+    return zstandard.ZstdDecompressor().decompress(frame)
+
+
+def decode_records(
+    directory: str, records: List[ArchiveRecord]
+) -> List[Tuple[ArchiveRecord, Optional[Any]]]:
+    """Decompress and parse a batch of records.
+
+    Runs in worker processes during re-ingest, so it only takes picklable
+    arguments and opens each segment once per batch.
+
+    Args:
+        directory: Archive directory
+        records: Records to decode
+
+    Returns:
+        (record, parsed JSON) pairs; the payload is None for records that
+        are corrupt or not valid JSON
+    """
+    _require_zstandard()
+    decompressor = zstandard.ZstdDecompressor()
+    results = []
+    handles = {}
+    try:
+        for record in records:
+            f = handles.get(record.segment)
+            if f is None:
+                f = open(segment_path(Path(directory), record.segment), "rb")
+                handles[record.segment] = f
+            f.seek(record.offset)
+            try:
+                payload = json.loads(
+                    decompressor.decompress(f.read(record.length))
+                )
+            except (zstandard.ZstdError, ValueError) as e:
+                logger.warning(f"Skipping unreadable record {record.url}: {e}")
+                payload = None
+            results.append((record, payload))
+    finally:
+        for f in handles.values():
+            f.close()
+    return results
@@ -8,7 +8,7 @@ from typing import Any, Dict, Optional
 
 from sqlalchemy.orm import Session
 
-from .models import Checkpoint
+from .models import Checkpoint, SyncState
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +41,7 @@ class CheckpointManager:
         total_processed: int = 0,
         status: str = "in_progress",
         error_message: Optional[str] = None,
+        commit: bool = True,
     ) -> Checkpoint:
         """Save a checkpoint to the database.
 
@@ -52,6 +53,9 @@ class CheckpointManager:
             total_processed: Total items processed
             status: Checkpoint status
             error_message: Error message if any
+            commit: Commit now; with False the checkpoint is only flushed
+                and commits with the caller's transaction, and the
+                checkpoint file waits for the next committed save
 
         Returns:
             Created or updated checkpoint
@@ -88,6 +92,10 @@ class CheckpointManager:
             )
             self.session.add(checkpoint)
 
+        if not commit:
+            self.session.flush()
+            return checkpoint
+
         self.session.commit()
         logger.info(
             f"Saved checkpoint: category={category_id}, "
@@ -148,6 +156,53 @@ class CheckpointManager:
                 f"type={checkpoint_type}"
             )
 
+    def get_sync_state(self, key: str) -> Optional[SyncState]:
+        """Get the persisted sync position for a key.
+
+        Args:
+            key: Sync key (e.g. 'category:18')
+
+        Returns:
+            Sync state or None
+        """
+        return self.session.get(SyncState, key)
+
+    def save_sync_state(
+        self,
+        key: str,
+        watermark: Optional[datetime] = None,
+        cursor: Optional[int] = None,
+    ) -> SyncState:
+        """Persist a sync position in a single commit.
+
+        Fields passed as None keep their stored value.
+
+        Args:
+            key: Sync key (e.g. 'category:18')
+            watermark: Newest activity timestamp already synced
+            cursor: Position in a cursor-based feed
+
+        Returns:
+            Updated sync state
+        """
+        state = self.session.get(SyncState, key)
+        if state is None:
+            state = SyncState(key=key)
+            self.session.add(state)
+
+        if watermark is not None:
+            state.watermark = watermark
+        if cursor is not None:
+            state.cursor = cursor
+        state.updated_at = datetime.utcnow()
+
+        self.session.commit()
+        logger.info(
+            f"Saved sync state: key={key}, watermark={state.watermark}, "
+            f"cursor={state.cursor}"
+        )
+        return state
+
     def _save_to_file(self, checkpoint: Checkpoint) -> None:
         """Save checkpoint to JSON file.
 
@@ -158,7 +213,8 @@ class CheckpointManager:
             return
 
         filename = (
-            f"checkpoint_{checkpoint.category_id}_" f"{checkpoint.checkpoint_type}.json"
+            f"checkpoint_{checkpoint.category_id}_"
+            f"{checkpoint.checkpoint_type}.json"
         )
         filepath = self.checkpoint_dir / filename
 
@@ -172,10 +228,14 @@ class CheckpointManager:
             "status": checkpoint.status,
             "error_message": checkpoint.error_message,
             "created_at": (
-                checkpoint.created_at.isoformat() if checkpoint.created_at else None
+                checkpoint.created_at.isoformat()
+                if checkpoint.created_at
+                else None
             ),
             "updated_at": (
-                checkpoint.updated_at.isoformat() if checkpoint.updated_at else None
+                checkpoint.updated_at.isoformat()
+                if checkpoint.updated_at
+                else None
             ),
         }
 
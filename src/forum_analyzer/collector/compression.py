@@ -0,0 +1,416 @@
+"""Transparent zstd compression of post bodies.
+
+``posts.cooked`` and ``posts.raw`` use CompressedText: values read back
+as BLOBs are zstd frames and are decompressed on load, while text values
+pass through unchanged, so compressed and plain rows can be mixed and a
+database can be converted a batch at a time. New writes are compressed
+when ``database.compress_bodies`` is set (SQLite only).
+
+Frames are compressed with a dictionary trained on the database's own
+posts; rendered posts share most of their markup, which small frames
+cannot exploit on their own. Dictionaries are kept in the
+``compression_dicts`` table and looked up by the ID recorded in each
+frame, so old frames stay readable after a new dictionary is trained.
+"""
+
+import logging
+import threading
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import Text, TypeDecorator, text
+from sqlalchemy.engine import Dialect, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised without the extra
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEVEL = 3
+
+# Trained dictionary size; zstd's default, ample for forum markup
+DEFAULT_DICT_SIZE = 112640
+
+# Shorter bodies are stored as text; a frame would not be smaller
+MIN_COMPRESS_LENGTH = 64
+
+# Bodies sampled to train a dictionary
+DEFAULT_SAMPLE_SIZE = 2000
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise RuntimeError(
+            "Compressed post bodies require the 'zstandard' package "
+            "(pip install 'forum-analyzer[zstd]')"
+        )
+
+
+class BodyCodec:
+    """Compresses and decompresses the post bodies of one database.
+
+    Each engine created by create_db_engine() gets its own codec (see
+    codec_for()), which reads dictionaries from that engine only and
+    compresses its writes only if configured to.
+    """
+
+    def __init__(self, engine: Optional[Engine] = None):
+        """Initialize the codec (compression off, no dictionaries loaded).
+
+        Args:
+            engine: Engine of the database holding compression_dicts
+        """
+        self.enabled = False
+        self.level = DEFAULT_LEVEL
+        self._engine = engine
+        self._dicts: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+        self._write_dict_id: Optional[int] = None
+        self._write_dict_loaded = False
+        self._lock = threading.Lock()
+        # zstd contexts are not thread-safe; keep one set per thread
+        self._local = threading.local()
+
+    def configure(self, enabled: bool, level: int = DEFAULT_LEVEL) -> None:
+        """Switch compression of new writes on or off.
+
+        Args:
+            enabled: Compress values written from now on
+            level: zstd compression level
+        """
+        if enabled:
+            _require_zstandard()
+        with self._lock:
+            self.enabled = enabled
+            self.level = level
+            self._write_dict_id = None
+            self._write_dict_loaded = False
+            self._local = threading.local()
+
+    def use_dictionary(self, dict_id: Optional[int]) -> None:
+        """Compress new writes with a stored dictionary (None: none)."""
+        with self._lock:
+            self._write_dict_id = dict_id
+            self._write_dict_loaded = True
+            self._local = threading.local()
+
+    def _dictionary(self, dict_id: int) -> "zstandard.ZstdCompressionDict":
+        with self._lock:
+            if dict_id not in self._dicts:
+                if self._engine is None:
+                    raise ValueError(
+                        f"Compression dictionary {dict_id} is unavailable: "
+                        "the engine was not created by create_db_engine()"
+                    )
+                with self._engine.connect() as conn:
+                    data = conn.execute(
+                        text(
+                            "SELECT data FROM compression_dicts WHERE id = :id"
+                        ),
+                        {"id": dict_id},
+                    ).scalar()
+                if data is None:
+                    raise ValueError(
+                        f"Compression dictionary {dict_id} not found"
+                    )
+                self._dicts[dict_id] = zstandard.ZstdCompressionDict(data)
+            return self._dicts[dict_id]
+
+    def _latest_dict_id(self) -> Optional[int]:
+        if not self._write_dict_loaded:
+            with self._engine.connect() as conn:
+                try:
+                    self._write_dict_id = conn.execute(
+                        text(
+                            "SELECT id FROM compression_dicts "
+                            "ORDER BY created_at DESC, rowid DESC LIMIT 1"
+                        )
+                    ).scalar()
+                except SQLAlchemyError:
+                    # Table not created yet
+                    self._write_dict_id = None
+            self._write_dict_loaded = True
+        return self._write_dict_id
+
+    def compress(self, value: str) -> bytes:
+        """Compress a body with the current dictionary.
+
+        Args:
+            value: Body text
+
+        Returns:
+            zstd frame
+        """
+        local = self._local
+        if getattr(local, "compressor", None) is None:
+            dict_id = self._latest_dict_id()
+            dict_data = self._dictionary(dict_id) if dict_id else None
+            local.compressor = zstandard.ZstdCompressor(
+                level=self.level, dict_data=dict_data
+            )
+        return local.compressor.compress(value.encode("utf-8"))
+
+    def encode(self, value):
+        """Compress a text body worth compressing; pass anything else on."""
+        if isinstance(value, str) and len(value) >= MIN_COMPRESS_LENGTH:
+            return self.compress(value)
+        return value
+
+    def decompress(self, frame: bytes) -> str:
+        """Decompress a frame written by compress().
+
+        Args:
+            frame: zstd frame
+
+        Returns:
+            Body text
+        """
+        _require_zstandard()
+        dict_id = zstandard.get_frame_parameters(frame).dict_id
+        local = self._local
+        if getattr(local, "decompressors", None) is None:
+            local.decompressors = {}
+        decompressors = local.decompressors
+        if dict_id not in decompressors:
+            dict_data = self._dictionary(dict_id) if dict_id else None
+            decompressors[dict_id] = zstandard.ZstdDecompressor(
+                dict_data=dict_data
+            )
+        return decompressors[dict_id].decompress(frame).decode("utf-8")
+
+
+# Column types are only handed the dialect, which every engine has its own
+# instance of; each engine's codec is found through it
+_codecs: "weakref.WeakKeyDictionary[Dialect, BodyCodec]" = (
+    weakref.WeakKeyDictionary()
+)
+_codecs_lock = threading.Lock()
+
+# Reads through engines without a codec: frames without a dictionary only
+_fallback_codec = BodyCodec()
+
+
+def codec_for(engine: Engine) -> BodyCodec:
+    """Body codec of an engine, created on first use (compression off).
+
+    Args:
+        engine: Database engine
+
+    Returns:
+        The engine's codec
+    """
+    with _codecs_lock:
+        codec = _codecs.get(engine.dialect)
+        if codec is None:
+            codec = _codecs[engine.dialect] = BodyCodec(engine)
+        return codec
+
+
+class CompressedText(TypeDecorator):
+    """Text stored as a zstd frame when compression is enabled.
+
+    Reads accept both plain text and frames.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        codec = _codecs.get(dialect)
+        if codec is None or not codec.enabled:
+            return value
+        return codec.encode(value)
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, (bytes, memoryview)):
+            codec = _codecs.get(dialect, _fallback_codec)
+            return codec.decompress(bytes(value))
+        return value
+
+
+def train_dictionary(
+    samples: List[str], dict_size: int = DEFAULT_DICT_SIZE
+) -> "zstandard.ZstdCompressionDict":
+    """Train a zstd dictionary on sample bodies.
+
+    Args:
+        samples: Body texts
+        dict_size: Dictionary size in bytes
+
+    Returns:
+        Trained dictionary
+    """
+    _require_zstandard()
+    return zstandard.train_dictionary(
+        dict_size, [sample.encode("utf-8") for sample in samples]
+    )
+
+
+@dataclass
+class CompressionReport:
+    """Outcome of compress_posts()."""
+
+    posts: int
+    body_bytes_before: int
+    body_bytes_after: int
+    file_bytes_before: int
+    file_bytes_after: int
+    dict_id: Optional[int]
+
+    @property
+    def saved_bytes(self) -> int:
+        """Reduction of the database file size."""
+        return self.file_bytes_before - self.file_bytes_after
+
+
+def _body_bytes(conn) -> int:
+    return (
+        conn.execute(
+            text(
+                "SELECT sum(coalesce(length(CAST(cooked AS BLOB)), 0) "
+                "+ coalesce(length(CAST(raw AS BLOB)), 0)) FROM posts"
+            )
+        ).scalar()
+        or 0
+    )
+
+
+def _file_bytes(conn) -> int:
+    page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+    return page_size * conn.exec_driver_sql("PRAGMA page_count").scalar()
+
+
+def _store_dictionary(engine: Engine, samples: List[str], dict_size: int):
+    if len(samples) < 10:
+        logger.info("Too few posts to train a dictionary; compressing without")
+        return None
+    try:
+        dictionary = train_dictionary(samples, dict_size)
+    except zstandard.ZstdError as e:
+        logger.warning(
+            f"Dictionary training failed ({e}); compressing without"
+        )
+        return None
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT OR REPLACE INTO compression_dicts "
+                "(id, data, created_at) VALUES (:id, :data, :created_at)"
+            ),
+            {
+                "id": dictionary.dict_id(),
+                "data": dictionary.as_bytes(),
+                "created_at": datetime.utcnow(),
+            },
+        )
+    return dictionary.dict_id()
+
+
+def compress_posts(
+    engine: Engine,
+    level: int = DEFAULT_LEVEL,
+    batch_size: int = 1000,
+    dict_size: int = DEFAULT_DICT_SIZE,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    vacuum: bool = True,
+) -> CompressionReport:
+    """Compress the stored bodies of every post, a batch at a time.
+
+    A dictionary is trained on a sample of the uncompressed bodies and
+    stored; bodies still stored as text are then compressed with it, one
+    transaction per batch. Rerunning after an interruption continues with
+    the remaining text bodies.
+
+    Args:
+        engine: SQLite engine
+        level: zstd compression level
+        batch_size: Posts per transaction
+        dict_size: Dictionary size in bytes
+        sample_size: Bodies sampled to train the dictionary
+        vacuum: VACUUM afterwards so the file shrinks
+
+    Returns:
+        Sizes before and after
+
+    Raises:
+        ValueError: If the database is not SQLite
+    """
+    _require_zstandard()
+    if engine.dialect.name != "sqlite":
+        raise ValueError("Compressed post bodies are supported on SQLite only")
+
+    with engine.connect() as conn:
+        body_before = _body_bytes(conn)
+        file_before = _file_bytes(conn)
+        samples = [
+            value
+            for row in conn.execute(
+                text(
+                    "SELECT cooked, raw FROM posts "
+                    "WHERE typeof(cooked) = 'text' ORDER BY random() LIMIT :n"
+                ),
+                {"n": sample_size},
+            )
+            for value in row
+            if isinstance(value, str) and len(value) >= MIN_COMPRESS_LENGTH
+        ]
+
+    dict_id = _store_dictionary(engine, samples, dict_size)
+    codec = codec_for(engine)
+    previous = (codec.enabled, codec.level)
+    codec.configure(enabled=True, level=level)
+    codec.use_dictionary(dict_id)
+
+    posts = 0
+    last_id = -1
+    try:
+        while True:
+            with engine.begin() as conn:
+                rows = conn.execute(
+                    text(
+                        "SELECT id, cooked, raw FROM posts "
+                        "WHERE id > :last AND (typeof(cooked) = 'text' "
+                        "OR typeof(raw) = 'text') ORDER BY id LIMIT :n"
+                    ),
+                    {"last": last_id, "n": batch_size},
+                ).all()
+                if not rows:
+                    break
+                conn.execute(
+                    text(
+                        "UPDATE posts SET cooked = :cooked, raw = :raw "
+                        "WHERE id = :id"
+                    ),
+                    [
+                        {
+                            "id": post_id,
+                            "cooked": codec.encode(cooked),
+                            "raw": codec.encode(raw),
+                        }
+                        for post_id, cooked, raw in rows
+                    ],
+                )
+            posts += len(rows)
+            last_id = rows[-1][0]
+    finally:
+        codec.configure(enabled=previous[0], level=previous[1])
+
+    if vacuum:
+        with engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.exec_driver_sql("VACUUM")
+
+    with engine.connect() as conn:
+        return CompressionReport(
+            posts=posts,
+            body_bytes_before=body_before,
+            body_bytes_after=_body_bytes(conn),
+            file_bytes_before=file_before,
+            file_bytes_after=_file_bytes(conn),
+            dict_id=dict_id,
+        )
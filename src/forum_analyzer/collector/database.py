@@ -0,0 +1,115 @@
+"""Database engines with the configured SQLite performance profile.
+
+Every engine the project creates goes through create_db_engine(), which
+applies ``database`` settings to each new SQLite connection: WAL
+journaling (readers no longer block the collector's writes, nor it
+theirs), ``synchronous``, memory-mapped I/O, page cache size, temp
+storage and a busy timeout. It also sets up the engine's post body
+codec. Other databases are left to their server's configuration.
+"""
+
+import logging
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+
+from ..config.settings import DatabaseSettings
+from .compression import codec_for
+
+logger = logging.getLogger(__name__)
+
+
+def _is_file_database(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def _read_only_url(url: URL, immutable: bool) -> URL:
+    """Open a SQLite file through a ``mode=ro`` URI."""
+    database = url.database
+    if database.startswith("file:"):
+        database = database[len("file:") :]
+    query = {**url.query, "mode": "ro", "uri": "true"}
+    if immutable:
+        query["immutable"] = "1"
+    return url.set(database=f"file:{database}", query=query)
+
+
+def sqlite_pragmas(
+    settings: DatabaseSettings, read_only: bool = False
+) -> list:
+    """PRAGMA statements applied to each new SQLite connection.
+
+    Args:
+        settings: Database settings
+        read_only: Connection is read-only; the journal mode, which is
+            stored in the database file, is then left alone
+
+    Returns:
+        List of SQL statements
+    """
+    pragmas = [f"PRAGMA busy_timeout = {settings.busy_timeout_ms}"]
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    else:
+        pragmas.append(f"PRAGMA journal_mode = {settings.journal_mode}")
+    pragmas += [
+        f"PRAGMA synchronous = {settings.synchronous}",
+        f"PRAGMA mmap_size = {settings.mmap_size_mb * 1024 * 1024}",
+        f"PRAGMA temp_store = {settings.temp_store}",
+    ]
+    if settings.cache_size_mb:
+        # Negative sizes are in KiB rather than pages
+        pragmas.append(f"PRAGMA cache_size = -{settings.cache_size_mb * 1024}")
+    return pragmas
+
+
+def create_db_engine(
+    settings: Optional[DatabaseSettings] = None,
+    url: Optional[str] = None,
+    read_only: bool = False,
+) -> Engine:
+    """Create an engine with the SQLite performance profile applied.
+
+    Args:
+        settings: Database settings (default: DatabaseSettings())
+        url: Database URL (default: settings.url)
+        read_only: Open for reading only, e.g. for reporting commands;
+            with settings.immutable a SQLite file is also read without
+            locking
+
+    Returns:
+        SQLAlchemy engine
+    """
+    if settings is None:
+        settings = DatabaseSettings()
+    engine_url = make_url(url or settings.url)
+
+    if engine_url.get_backend_name() != "sqlite":
+        if settings.compress_bodies:
+            logger.warning("compress_bodies is supported on SQLite only")
+        return create_engine(engine_url, echo=settings.echo)
+
+    if read_only and _is_file_database(engine_url):
+        engine_url = _read_only_url(engine_url, settings.immutable)
+    engine = create_engine(engine_url, echo=settings.echo)
+    pragmas = sqlite_pragmas(settings, read_only)
+
+    @event.listens_for(engine, "connect")
+    def apply_profile(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    # Post bodies are read (and written) with this database's dictionaries
+    codec = codec_for(engine)
+    if not read_only:
+        codec.configure(settings.compress_bodies, settings.compression_level)
+    return engine
@@ -0,0 +1,123 @@
+"""Persistent validator cache for conditional HTTP requests."""
+
+import logging
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body with its validators."""
+
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that ask the server to answer 304 if unchanged."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ValidatorCache:
+    """ETag/Last-Modified cache keyed by full request URL.
+
+    Bodies are stored zlib-compressed in a standalone SQLite file so a 304
+    response can be answered locally without touching the forum database.
+    """
+
+    def __init__(self, path: Path):
+        """Open (or create) the cache.
+
+        Args:
+            path: SQLite file for the cache
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS validators (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                stored_at REAL NOT NULL
+            )
+            """)
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Look up the stored response for a URL.
+
+        Args:
+            url: Full request URL including query string
+
+        Returns:
+            Cached response or None
+        """
+        row = self._conn.execute(
+            "SELECT etag, last_modified, body FROM validators WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if not row:
+            return None
+
+        etag, last_modified, body = row
+        return CachedResponse(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            body=zlib.decompress(body),
+        )
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store a response body and its validators.
+
+        Responses without any validator are not worth keeping, since the
+        server has nothing to compare a conditional request against.
+
+        Args:
+            url: Full request URL including query string
+            body: Raw (decoded) response body
+            etag: ETag header value
+            last_modified: Last-Modified header value
+        """
+        if not etag and not last_modified:
+            return
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO validators "
+            "(url, etag, last_modified, body, stored_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (url, etag, last_modified, zlib.compress(body), time.time()),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the cache file."""
+        self._conn.close()
+        logger.debug(
+            f"Validator cache closed: {self.hits} hits, {self.misses} misses"
+        )
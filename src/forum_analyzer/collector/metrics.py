@@ -0,0 +1,217 @@
+"""Request-level metrics for the API client.
+
+Counters and latency histograms are kept per endpoint class (category
+pages, topics, posts, ...), so a slow run can be attributed to the forum
+(request latency, throttling), to our own rate limit (limiter wait) or to
+neither, which leaves the database.
+"""
+
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Histogram buckets grow by 5% from 1 ms, so percentiles are accurate to
+# within 5% while a bucket map stays small for any run length
+HISTOGRAM_MIN = 0.001
+HISTOGRAM_GROWTH = 1.05
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations in seconds."""
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one duration.
+
+        Args:
+            seconds: Duration in seconds
+        """
+        if seconds <= HISTOGRAM_MIN:
+            bucket = 0
+        else:
+            bucket = math.ceil(
+                math.log(seconds / HISTOGRAM_MIN, HISTOGRAM_GROWTH)
+            )
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Estimate a percentile.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Upper bound of the bucket holding the percentile, in seconds
+            (0.0 for an empty histogram)
+        """
+        if not self.count:
+            return 0.0
+
+        rank = math.ceil(self.count * q / 100) or 1
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                bound = HISTOGRAM_MIN * HISTOGRAM_GROWTH**bucket
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Percentiles, mean and max in milliseconds."""
+        summary = {
+            f"p{q}": round(self.percentile(q) * 1000, 1) for q in PERCENTILES
+        }
+        summary["mean"] = round(
+            self.total / self.count * 1000 if self.count else 0.0, 1
+        )
+        summary["max"] = round(self.max * 1000, 1)
+        return summary
+
+
+@dataclass
+class EndpointMetrics:
+    """Counters and histograms of one endpoint class."""
+
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    not_modified: int = 0
+    throttled: int = 0
+    bytes_received: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-serializable view of the metrics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "not_modified": self.not_modified,
+            "throttled": self.throttled,
+            "bytes_received": self.bytes_received,
+            "latency_ms": self.latency.summary(),
+            "wait_ms": self.wait.summary(),
+            "total_latency_s": round(self.latency.total, 3),
+            "total_wait_s": round(self.wait.total, 3),
+        }
+
+
+class RequestMetrics:
+    """Per-endpoint request metrics of an API client.
+
+    A child created for a client view reports into its own counters and
+    into its parent's, so per-category numbers add up to the client's.
+    """
+
+    def __init__(self, parent: Optional["RequestMetrics"] = None):
+        """Initialize empty metrics.
+
+        Args:
+            parent: Metrics that every recording is also applied to
+        """
+        self.parent = parent
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self.total = EndpointMetrics()
+
+    def _targets(self, endpoint: str):
+        metrics = self
+        while metrics is not None:
+            if endpoint not in metrics.endpoints:
+                metrics.endpoints[endpoint] = EndpointMetrics()
+            yield metrics.endpoints[endpoint]
+            yield metrics.total
+            metrics = metrics.parent
+
+    def record_response(
+        self,
+        endpoint: str,
+        status_code: int,
+        elapsed: float,
+        bytes_received: int,
+    ) -> None:
+        """Record a completed HTTP exchange.
+
+        Args:
+            endpoint: Endpoint class
+            status_code: Response status
+            elapsed: Seconds from sending the request to the response
+            bytes_received: Body bytes read off the wire
+        """
+        for target in self._targets(endpoint):
+            target.requests += 1
+            target.latency.record(elapsed)
+            target.bytes_received += bytes_received
+            if status_code == 304:
+                target.not_modified += 1
+            elif status_code == 429:
+                target.throttled += 1
+            elif status_code >= 400:
+                target.errors += 1
+
+    def record_error(self, endpoint: str, elapsed: float) -> None:
+        """Record a request that failed without a response.
+
+        Args:
+            endpoint: Endpoint class
+            elapsed: Seconds until the failure
+        """
+        for target in self._targets(endpoint):
+            target.requests += 1
+            target.errors += 1
+            target.latency.record(elapsed)
+
+    def record_retry(self, endpoint: str) -> None:
+        """Record that a request is being retried.
+
+        Args:
+            endpoint: Endpoint class
+        """
+        for target in self._targets(endpoint):
+            target.retries += 1
+
+    def record_wait(self, endpoint: str, seconds: float) -> None:
+        """Record time spent waiting for rate limiters before a request.
+
+        Args:
+            endpoint: Endpoint class
+            seconds: Seconds waited
+        """
+        for target in self._targets(endpoint):
+            target.wait.record(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable summary, overall and per endpoint."""
+        return {
+            "total": self.total.summary(),
+            "endpoints": {
+                endpoint: metrics.summary()
+                for endpoint, metrics in sorted(self.endpoints.items())
+            },
+        }
+
+
+def write_metrics(path: Path, snapshot: Dict[str, Any]) -> None:
+    """Write a metrics snapshot as JSON.
+
+    Args:
+        path: Output file
+        snapshot: Snapshot from RequestMetrics.snapshot(), or a mapping of
+            such snapshots
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(snapshot, f, indent=2)
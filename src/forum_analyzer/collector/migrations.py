@@ -0,0 +1,316 @@
+"""Versioned migrations for existing databases.
+
+migrate_schema() keeps the schema in step with the models on every
+open: it adds missing tables, nullable columns and indexes. Migrations
+here cover what it cannot, chiefly backfilling data, and run only on
+``forum-analyzer db migrate``.
+
+Each migration has a version, applied in ascending order and recorded in
+the ``schema_version`` table. Its optional backfill runs in batches, one
+transaction each, and stores the last key it processed with the batch.
+Write locks are therefore held for one batch at a time, so a collector
+can keep writing, and an interrupted migration resumes after its last
+committed batch.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import BigInteger, Table, delete, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import AddConstraint, CreateTable
+
+from .models import Base, Category, Post, SchemaVersion, User, migrate_schema
+from .storage import refresh_users
+
+logger = logging.getLogger(__name__)
+
+# Rows (or keys) handled per backfill transaction
+DEFAULT_BATCH_SIZE = 1000
+
+# A backfill batch: (session, last key done or None, batch size) ->
+# (last key of this batch or None when finished, rows handled)
+Backfill = Callable[[Session, Optional[str], int], Tuple[Optional[str], int]]
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One versioned migration step."""
+
+    version: int
+    name: str
+    description: str
+    schema: Optional[Callable[[Engine], None]] = None
+    backfill: Optional[Backfill] = None
+
+
+def _backfill_user_stats(
+    session: Session, after: Optional[str], batch_size: int
+) -> Tuple[Optional[str], int]:
+    """Recompute user statistics for the next batch of authors."""
+    stmt = select(Post.username).where(Post.username != "").distinct()
+    if after is not None:
+        stmt = stmt.where(Post.username > after)
+    names = list(
+        session.scalars(stmt.order_by(Post.username).limit(batch_size))
+    )
+
+    if not names:
+        # Users whose posts are all gone
+        session.execute(
+            delete(User).where(
+                User.username.not_in(select(Post.username).distinct())
+            )
+        )
+        return None, 0
+
+    refresh_users(session, names)
+    return names[-1], len(names)
+
+
+def _widen_id_columns(engine: Engine) -> None:
+    """Make forum ID columns BIGINT; SQLite integers are 64-bit already."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for column in table.columns:
+                if isinstance(column.type, BigInteger):
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {table.name} "
+                            f"ALTER COLUMN {column.name} TYPE BIGINT"
+                        )
+                    )
+
+
+def _rebuild_sqlite_table(conn: Connection, table: Table) -> None:
+    """Recreate a SQLite table from its model, keeping its rows.
+
+    SQLite cannot drop or change constraints in place: the table is
+    created under a new name, filled from the old one, which is then
+    dropped, and renamed. Indexes go with the old table; recreate them
+    afterwards.
+    """
+    if not conn.connection.driver_connection.in_transaction:
+        # Keep the rebuild in one transaction (pysqlite runs DDL outside)
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    rebuilt = f"{table.name}_rebuilt"
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect))
+    conn.exec_driver_sql(
+        ddl.replace(f"CREATE TABLE {table.name}", f"CREATE TABLE {rebuilt}", 1)
+    )
+    present = {
+        column["name"] for column in inspect(conn).get_columns(table.name)
+    }
+    columns = ", ".join(
+        column.name for column in table.columns if column.name in present
+    )
+    conn.exec_driver_sql(
+        f"INSERT INTO {rebuilt} ({columns}) "
+        f"SELECT {columns} FROM {table.name}"
+    )
+    conn.exec_driver_sql(f"DROP TABLE {table.name}")
+    conn.exec_driver_sql(f"ALTER TABLE {rebuilt} RENAME TO {table.name}")
+
+
+def _category_slug_per_forum(engine: Engine) -> None:
+    """Make category slugs unique per forum rather than overall.
+
+    Databases from before multi-forum support have UNIQUE(slug), which
+    rejects a second forum's ``help`` category, and migrate_schema()
+    only adds objects, so it cannot remove it.
+    """
+    table = Category.__table__
+    constraints = inspect(engine).get_unique_constraints(table.name)
+    slug_only = [
+        c["name"] for c in constraints if c["column_names"] == ["slug"]
+    ]
+    per_forum = any(
+        c["column_names"] == ["forum", "slug"] for c in constraints
+    )
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            if slug_only or not per_forum:
+                _rebuild_sqlite_table(conn, table)
+        else:
+            for name in slug_only:
+                conn.execute(
+                    text(f'ALTER TABLE {table.name} DROP CONSTRAINT "{name}"')
+                )
+            if not per_forum:
+                conn.execute(
+                    AddConstraint(
+                        next(
+                            constraint
+                            for constraint in table.constraints
+                            if constraint.name == "uix_forum_slug"
+                        )
+                    )
+                )
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        name="baseline",
+        description="Add tables, columns and indexes missing from the models",
+        schema=migrate_schema,
+    ),
+    Migration(
+        version=2,
+        name="user_stats_from_posts",
+        description=(
+            "Derive user statistics from stored posts, correcting counts "
+            "inflated by re-fetched posts"
+        ),
+        backfill=_backfill_user_stats,
+    ),
+    Migration(
+        version=3,
+        name="bigint_forum_ids",
+        description=(
+            "Widen category, topic and post ID columns to 64 bits for "
+            "namespaced forum IDs (PostgreSQL only)"
+        ),
+        schema=_widen_id_columns,
+    ),
+    Migration(
+        version=4,
+        name="category_slug_per_forum",
+        description=(
+            "Make category slugs unique per forum instead of across all "
+            "forums"
+        ),
+        schema=_category_slug_per_forum,
+    ),
+]
+
+
+def _versions(session: Session) -> dict:
+    return {row.version: row for row in session.scalars(select(SchemaVersion))}
+
+
+def pending_migrations(
+    engine: Engine, migrations: Sequence[Migration] = MIGRATIONS
+) -> List[Migration]:
+    """Migrations not yet completed on a database.
+
+    Args:
+        engine: Database engine (schema_version must exist)
+        migrations: Migrations to check, in version order
+
+    Returns:
+        Pending migrations, including partly applied ones
+    """
+    with Session(engine) as session:
+        versions = _versions(session)
+    return [
+        migration
+        for migration in migrations
+        if migration.version not in versions
+        or versions[migration.version].completed_at is None
+    ]
+
+
+def stamp(
+    engine: Engine, migrations: Sequence[Migration] = MIGRATIONS
+) -> None:
+    """Record migrations as applied without running them.
+
+    For databases created from the current models, which need none of
+    them.
+
+    Args:
+        engine: Database engine
+        migrations: Migrations to record
+    """
+    SchemaVersion.__table__.create(engine, checkfirst=True)
+    with Session(engine) as session:
+        versions = _versions(session)
+        now = datetime.utcnow()
+        for migration in migrations:
+            if migration.version not in versions:
+                session.add(
+                    SchemaVersion(
+                        version=migration.version,
+                        name=migration.name,
+                        started_at=now,
+                        completed_at=now,
+                    )
+                )
+        session.commit()
+
+
+def run_migrations(
+    engine: Engine,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    migrations: Sequence[Migration] = MIGRATIONS,
+    on_batch: Optional[Callable[[Migration, int], None]] = None,
+) -> List[Migration]:
+    """Apply pending migrations in version order.
+
+    A migration's schema step runs first, then its backfill batch by
+    batch; each batch commits together with its resume key. Rerunning
+    after an interruption continues with the next uncommitted batch.
+
+    Args:
+        engine: Database engine
+        batch_size: Rows (or keys) per backfill transaction
+        migrations: Migrations to apply, in version order
+        on_batch: Called with the migration and its rows done after each
+            committed batch
+
+    Returns:
+        Migrations completed by this call
+    """
+    SchemaVersion.__table__.create(engine, checkfirst=True)
+    completed = []
+
+    for migration in pending_migrations(engine, migrations):
+        with Session(engine) as session:
+            state = session.get(SchemaVersion, migration.version)
+            if state is None:
+                logger.info(
+                    f"Applying migration {migration.version}: {migration.name}"
+                )
+                state = SchemaVersion(
+                    version=migration.version, name=migration.name, rows_done=0
+                )
+                session.add(state)
+                session.commit()
+            else:
+                logger.info(
+                    f"Resuming migration {migration.version} after "
+                    f"{state.resume_key!r} ({state.rows_done} rows done)"
+                )
+
+            if migration.schema and state.resume_key is None:
+                migration.schema(engine)
+
+            if migration.backfill:
+                while True:
+                    last_key, rows = migration.backfill(
+                        session, state.resume_key, batch_size
+                    )
+                    if last_key is None:
+                        break
+                    state.resume_key = last_key
+                    state.rows_done += rows
+                    session.commit()
+                    if on_batch:
+                        on_batch(migration, state.rows_done)
+
+            state.completed_at = datetime.utcnow()
+            session.commit()
+
+        logger.info(f"Migration {migration.version} complete")
+        completed.append(migration)
+
+    return completed
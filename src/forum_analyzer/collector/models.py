@@ -4,20 +4,26 @@ import logging
 from datetime import datetime
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
-    create_engine,
     inspect,
+    text,
 )
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import DeclarativeBase, relationship, Session
 
+from .compression import CompressedText
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,20 +33,41 @@ class Base(DeclarativeBase):
     pass
 
 
+# Forum IDs (categories, topics, posts) exceed 32 bits once namespaced per
+# forum (api_client.ID_NAMESPACE_SIZE). SQLite integers are 64-bit anyway,
+# and INTEGER keeps its primary keys aliased to the rowid.
+ForumID = BigInteger().with_variant(Integer, "sqlite")
+
+
 class Category(Base):
     """Category model."""
 
     __tablename__ = "categories"
+    __table_args__ = (
+        UniqueConstraint("forum", "slug", name="uix_forum_slug"),
+        # The default forum's categories have no forum name, and NULLs never
+        # conflict in the constraint above
+        Index(
+            "uix_default_forum_slug",
+            "slug",
+            unique=True,
+            sqlite_where=text("forum IS NULL"),
+            postgresql_where=text("forum IS NULL"),
+        ),
+    )
 
-    id = Column(Integer, primary_key=True)
+    id = Column(ForumID, primary_key=True)
+    forum = Column(String)  # forum name in multi-forum setups
     name = Column(String, nullable=False)
-    slug = Column(String, nullable=False, unique=True)
+    slug = Column(String, nullable=False)
     description = Column(Text)
     topic_count = Column(Integer, default=0)
     post_count = Column(Integer, default=0)
     last_scraped_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
 
     # Relationships
     topics = relationship(
@@ -51,16 +78,36 @@ class Category(Base):
     )
 
     def __repr__(self) -> str:
-        return f"<Category(id={self.id}, name='{self.name}', " f"slug='{self.slug}')>"
+        return (
+            f"<Category(id={self.id}, name='{self.name}', "
+            f"slug='{self.slug}')>"
+        )
 
 
 class Topic(Base):
     """Topic model."""
 
     __tablename__ = "topics"
+    # Report queries: visible topics filtered and sorted by one metric each
+    __table_args__ = (
+        Index(
+            "ix_topics_visible_replies", "visible", "reply_count", "view_count"
+        ),
+        Index("ix_topics_visible_created", "visible", "created_at"),
+        Index("ix_topics_visible_last_posted", "visible", "last_posted_at"),
+        Index("ix_topics_visible_likes", "visible", "like_count"),
+        Index(
+            "ix_topics_unanswered",
+            "visible",
+            "accepted_answer",
+            "reply_count",
+            "view_count",
+        ),
+    )
 
-    id = Column(Integer, primary_key=True)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    id = Column(ForumID, primary_key=True)
+    forum = Column(String)  # forum name in multi-forum setups
+    category_id = Column(ForumID, ForeignKey("categories.id"), nullable=False)
     title = Column(String, nullable=False)
     slug = Column(String, nullable=False)
     created_at = Column(DateTime)
@@ -78,7 +125,9 @@ class Topic(Base):
 
     # Relationships
     category = relationship("Category", back_populates="topics")
-    posts = relationship("Post", back_populates="topic", cascade="all, delete-orphan")
+    posts = relationship(
+        "Post", back_populates="topic", cascade="all, delete-orphan"
+    )
 
     def __repr__(self) -> str:
         return (
@@ -92,13 +141,15 @@ class Post(Base):
 
     __tablename__ = "posts"
     __table_args__ = (
-        UniqueConstraint("topic_id", "post_number", name="uix_topic_post_number"),
+        UniqueConstraint(
+            "topic_id", "post_number", name="uix_topic_post_number"
+        ),
     )
 
-    id = Column(Integer, primary_key=True)
-    topic_id = Column(Integer, ForeignKey("topics.id"), nullable=False)
+    id = Column(ForumID, primary_key=True)
+    topic_id = Column(ForumID, ForeignKey("topics.id"), nullable=False)
     post_number = Column(Integer, nullable=False)
-    username = Column(String, nullable=False)
+    username = Column(String, nullable=False, index=True)  # user aggregation
     created_at = Column(DateTime)
     updated_at = Column(DateTime)
     reply_count = Column(Integer, default=0)
@@ -108,8 +159,8 @@ class Post(Base):
     readers_count = Column(Integer, default=0)
     score = Column(Float, default=0.0)
     like_count = Column(Integer, default=0)
-    cooked = Column(Text)  # HTML version
-    raw = Column(Text)  # Markdown version
+    cooked = Column(CompressedText)  # HTML version
+    raw = Column(CompressedText)  # Markdown version
     is_accepted_answer = Column(Boolean, default=False)
     scraped_at = Column(DateTime)
 
@@ -129,17 +180,19 @@ class Checkpoint(Base):
     __tablename__ = "checkpoints"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    category_id = Column(ForumID, ForeignKey("categories.id"), nullable=False)
     checkpoint_type = Column(String, nullable=False)
     last_page = Column(Integer)
-    last_topic_id = Column(Integer)
+    last_topic_id = Column(ForumID)
     total_processed = Column(Integer, default=0)
     status = Column(
         String, default="in_progress"
     )  # 'in_progress', 'completed', 'error'
     error_message = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
 
     # Relationships
     category = relationship("Category", back_populates="checkpoints")
@@ -151,6 +204,88 @@ class Checkpoint(Base):
         )
 
 
+class SyncState(Base):
+    """Persisted position of an incremental sync (watermark or cursor)."""
+
+    __tablename__ = "sync_state"
+
+    key = Column(String, primary_key=True)  # e.g. 'category:18'
+    watermark = Column(DateTime)  # newest activity already synced
+    cursor = Column(ForumID)  # opaque position for cursor-based feeds
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<SyncState(key='{self.key}', watermark={self.watermark}, "
+            f"cursor={self.cursor})>"
+        )
+
+
+class WorkJob(Base):
+    """Durable collection job, claimed by workers under a timed lease."""
+
+    __tablename__ = "work_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_key = Column(String, nullable=False, unique=True)  # e.g. 'page:18:3'
+    kind = Column(String, nullable=False)  # 'category_page' or 'topic'
+    forum = Column(String)  # forum name in multi-forum setups
+    category_id = Column(ForumID, nullable=False)
+    page = Column(Integer)
+    topic_id = Column(ForumID)
+    status = Column(
+        String, nullable=False, default="pending", index=True
+    )  # 'pending', 'leased', 'done', 'failed'
+    attempts = Column(Integer, nullable=False, default=0)
+    lease_owner = Column(String)
+    lease_expires_at = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<WorkJob(id={self.id}, key='{self.job_key}', "
+            f"status='{self.status}', owner='{self.lease_owner}')>"
+        )
+
+
+class SchemaVersion(Base):
+    """Versioned migration, applied or with a backfill in progress."""
+
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String, nullable=False)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime)  # NULL while a backfill is in progress
+    resume_key = Column(String)  # last key backfilled; resumes after it
+    rows_done = Column(Integer, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<SchemaVersion(version={self.version}, name='{self.name}', "
+            f"completed_at={self.completed_at})>"
+        )
+
+
+class CompressionDictionary(Base):
+    """zstd dictionary for compressed post bodies (see compression.py)."""
+
+    __tablename__ = "compression_dicts"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)  # zstd dict ID
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<CompressionDictionary(id={self.id}, size={len(self.data)})>"
+
+
 class User(Base):
     """User model (derived from posts)."""
 
@@ -164,7 +299,10 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     def __repr__(self) -> str:
-        return f"<User(username='{self.username}', " f"post_count={self.post_count})>"
+        return (
+            f"<User(username='{self.username}', "
+            f"post_count={self.post_count})>"
+        )
 
 
 class LLMAnalysis(Base):
@@ -173,14 +311,18 @@ class LLMAnalysis(Base):
     __tablename__ = "llm_analysis"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    topic_id = Column(Integer, ForeignKey("topics.id"), nullable=False, unique=True)
+    topic_id = Column(
+        ForumID, ForeignKey("topics.id"), nullable=False, unique=True
+    )
     core_problem = Column(Text)
     # NOTE: Stores CLASSIFICATION (problem type), not forum category
     category = Column(String(100))
     severity = Column(String(50))
     key_terms = Column(Text)  # JSON
     root_cause = Column(Text)
-    analyzed_at = Column(DateTime, default=datetime.utcnow)
+    analyzed_at = Column(
+        DateTime, default=datetime.utcnow, index=True
+    )  # ask context
     model_version = Column(String(50))
 
     # Relationship
@@ -214,37 +356,85 @@ class ProblemTheme(Base):
 
 
 def migrate_schema(engine):
-    """Ensure all tables exist, creating new ones if needed.
+    """Bring an existing database up to the current models.
 
-    This function performs automatic schema migration by checking which tables
-    exist and creating any missing ones. It's safe to call multiple times as
-    SQLAlchemy's create_all() is idempotent and only creates missing tables.
+    Missing tables are created, and nullable columns and indexes added to
+    a model after its table was created are added to the table. It's safe
+    to call multiple times; constraint changes on existing tables are not
+    applied. Data changes are versioned migrations (see migrations.py); a
+    new database is recorded as having them all.
 
     Args:
         engine: SQLAlchemy engine instance
     """
     inspector = inspect(engine)
-    existing_tables = inspector.get_table_names()
-
-    # Tables we expect to exist
-    expected_tables = {
-        "categories",
-        "topics",
-        "posts",
-        "users",
-        "checkpoints",
-        "llm_analysis",
-        "problem_themes",
-    }
+    existing_tables = set(inspector.get_table_names())
 
-    missing_tables = expected_tables - set(existing_tables)
+    missing_tables = set(Base.metadata.tables) - existing_tables
 
     if missing_tables:
         logger.info(f"Creating missing tables: {missing_tables}")
         Base.metadata.create_all(engine)
+
+    if missing_tables == set(Base.metadata.tables):
+        # A new database needs none of the versioned migrations
+        from .migrations import stamp
+
+        stamp(engine)
+
+    added = []
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {
+                col["name"] for col in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                if column.name in present:
+                    continue
+                if not column.nullable:
+                    logger.warning(
+                        "Cannot add NOT NULL column "
+                        f"{table.name}.{column.name}"
+                    )
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} "
+                        f"ADD COLUMN {column.name} {column_type}"
+                    )
+                )
+                added.append(f"{table.name}.{column.name}")
+
+    indexed = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {
+            index["name"] for index in inspector.get_indexes(table.name)
+        }
+        for index in table.indexes:
+            if index.name in present:
+                continue
+            try:
+                index.create(engine)
+            except SQLAlchemyError as e:
+                # A unique index over rows that already break it
+                logger.warning(f"Cannot create index {index.name}: {e}")
+                continue
+            indexed.append(index.name)
+
+    if added:
+        logger.info(f"Added columns: {', '.join(added)}")
+    if indexed:
+        logger.info(f"Created indexes: {', '.join(indexed)}")
+
+    if missing_tables or added or indexed:
         logger.info("Schema migration complete")
     else:
-        logger.debug("All tables exist, no migration needed")
+        logger.debug("Schema is up to date, no migration needed")
 
 
 def create_database(database_url: str) -> None:
@@ -253,7 +443,9 @@ def create_database(database_url: str) -> None:
     Args:
         database_url: SQLAlchemy database URL
     """
-    engine = create_engine(database_url)
+    from .database import create_db_engine
+
+    engine = create_db_engine(url=database_url)
     Base.metadata.create_all(engine)
 
 
@@ -266,5 +458,7 @@ def get_session(database_url: str) -> Session:
     Returns:
         SQLAlchemy Session instance
     """
-    engine = create_engine(database_url)
+    from .database import create_db_engine
+
+    engine = create_db_engine(url=database_url)
     return Session(engine)
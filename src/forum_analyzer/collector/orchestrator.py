@@ -7,11 +7,30 @@ proper error handling, progress reporting, and checkpoint support for
 resumable operations.
 """
 
+import asyncio
 import logging
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing, nullcontext
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List
+from functools import partial
+from typing import (
+    Optional,
+    Dict,
+    Any,
+    List,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Set,
+    Tuple,
+)
 from pathlib import Path
-from sqlalchemy import create_engine
+from urllib.parse import urlsplit
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from rich.console import Console
@@ -23,15 +42,75 @@ from rich.progress import (
     TaskProgressColumn,
     TimeRemainingColumn,
 )
-
-from .api_client import ForumAPIClient
-from .models import Base, Category, Topic, User, Post
+from rich.table import Table
+
+from .api_client import (
+    ArchiveReplayClient,
+    ID_NAMESPACE_SIZE,
+    FairShareLimiter,
+    ForumAPIClient,
+    category_metadata,
+)
+from .archive import ArchiveRecord, ResponseArchive, decode_records
+from .metrics import RequestMetrics, write_metrics
+from .models import Category, Topic, Post, migrate_schema
 from .checkpoint_manager import CheckpointManager
-from ..config.settings import Settings, get_settings
+from .database import create_db_engine
+from .storage import (
+    as_utc,
+    parse_timestamp,
+    refresh_users,
+    savepoint,
+    store_posts,
+)
+from .work_queue import JOB_TOPIC, ClaimedJob, WorkQueue
+from .writer import DatabaseWriter, TopicSink
+from ..config.settings import (
+    APISettings,
+    ForumConfig,
+    Settings,
+    get_settings,
+)
 
 logger = logging.getLogger(__name__)
 console = Console()
 
+# Post fields read by storage; batch-fetched posts are trimmed to these
+STORED_POST_FIELDS = (
+    "id",
+    "topic_id",
+    "post_number",
+    "username",
+    "created_at",
+    "updated_at",
+    "reply_count",
+    "quote_count",
+    "incoming_link_count",
+    "reads",
+    "readers_count",
+    "score",
+    "like_count",
+    "cooked",
+    "raw",
+    "accepted_answer",
+)
+
+# sync_state key of the forum-wide latest-posts cursor
+FIREHOSE_SYNC_KEY = "firehose:posts"
+
+# Archive records handed to a re-ingest worker at a time
+REINGEST_CHUNK_SIZE = 200
+
+
+def _topic_activity(topic_summary: Dict[str, Any]) -> Optional[datetime]:
+    """Latest activity of a listed topic (bump or last post)."""
+    timestamps = [
+        parse_timestamp(topic_summary.get(field))
+        for field in ("bumped_at", "last_posted_at")
+    ]
+    timestamps = [ts for ts in timestamps if ts]
+    return max(timestamps) if timestamps else None
+
 
 class CollectionOrchestrator:
     """Orchestrates the collection of forum data with checkpoint support."""
@@ -42,6 +121,8 @@ class CollectionOrchestrator:
         db_session: Session,
         checkpoint_mgr: CheckpointManager,
         settings: Settings,
+        progress: Optional[Progress] = None,
+        forum: Optional[str] = None,
     ):
         """
         Initialize the orchestrator.
@@ -51,18 +132,37 @@ class CollectionOrchestrator:
             db_session: SQLAlchemy database session
             checkpoint_mgr: CheckpointManager instance
             settings: Application settings
+            progress: Live progress display shared with other orchestrators;
+                each then reports on a single row of it (default: own
+                display)
+            forum: Forum name recorded on stored categories and topics in
+                a multi-forum configuration
         """
         self.api_client = api_client
         self.db_session = db_session
         self.checkpoint_mgr = checkpoint_mgr
         self.settings = settings
+        self.progress = progress
+        self.forum = forum
         self.stats = {
             "topics_processed": 0,
             "posts_collected": 0,
             "users_added": 0,
             "topics_updated": 0,
             "posts_added": 0,
+            "posts_updated": 0,
         }
+        # Group commit: writes waiting for the next commit, when the first
+        # of them was queued, the checkpoint to save with them and the
+        # authors whose statistics they change
+        self._pending: List[
+            Tuple[str, Callable[[], Awaitable[None]], Optional[Callable]]
+        ] = []
+        self._group_started: Optional[float] = None
+        self._group_checkpoint: Optional[Callable[[], None]] = None
+        self._group_authors: Set[str] = set()
+        # Queued writes that failed and were rolled back
+        self._failed_writes = 0
 
     async def collect_category(
         self,
@@ -109,6 +209,8 @@ class CollectionOrchestrator:
             )
 
             logger.info(f"Collection completed for category ID: {category_id}")
+            if self.request_metrics:
+                self.stats["requests"] = self.request_metrics.snapshot()
             self._log_statistics()
 
             return self.stats
@@ -124,6 +226,179 @@ class CollectionOrchestrator:
             )
             raise
 
+    @property
+    def request_metrics(self) -> Optional[RequestMetrics]:
+        """Request metrics of the API client, if it keeps any."""
+        return getattr(self.api_client, "metrics", None)
+
+    async def run_job(self, job: ClaimedJob, queue: WorkQueue) -> None:
+        """
+        Execute one job leased from the work queue.
+
+        A topic job fetches and stores the topic with all its posts. A
+        page job stores the category (on page 0), enqueues a topic job for
+        every topic on the page and a job for the next page. Both are
+        idempotent, so a job re-run after a lost lease does no harm.
+
+        Args:
+            job: Claimed job
+            queue: Queue to add follow-up jobs to
+        """
+        if job.kind == JOB_TOPIC:
+            saved: List[bool] = []
+            await self._collect_topic(
+                job.topic_id,
+                job.category_id,
+                on_saved=lambda: saved.append(True),
+            )
+            # Durable before the queue marks the job done
+            await self._commit_pending()
+            if not saved:
+                raise RuntimeError(f"Topic {job.topic_id} was not stored")
+            self.stats["topics_processed"] += 1
+            return
+
+        if job.page == 0:
+            await self._store_category(
+                await self.api_client.fetch_category_metadata(job.category_id)
+            )
+
+        category_data = await self.api_client.fetch_category_page(
+            job.category_id, page=job.page
+        )
+        topic_list = (category_data or {}).get("topic_list", {})
+        topics = topic_list.get("topics", [])
+
+        added = queue.enqueue_topics(
+            job.category_id,
+            [topic["id"] for topic in topics if topic.get("id")],
+        )
+        logger.debug(
+            f"Category {job.category_id} page {job.page}: "
+            f"{added} topic job(s) added"
+        )
+        if topics and topic_list.get("more_topics_url") is not None:
+            queue.enqueue_page(job.category_id, job.page + 1)
+
+    async def sync_latest_posts(self) -> Dict[str, int]:
+        """
+        Apply one pass of the forum-wide latest-posts feed.
+
+        ``/posts.json`` is walked backwards with its ``before`` cursor until
+        it reaches the highest post ID already synced. New posts are stored
+        directly and their topics' counters bumped, so a reply costs one
+        feed request instead of a full topic fetch. Topics we haven't seen
+        are fetched in full; posts from categories that were never
+        collected are ignored. The cursor is persisted after the pass.
+
+        On the first run only the newest page is applied, which sets the
+        cursor; backfill is what ``collect`` is for.
+
+        Returns:
+            Dictionary with collection statistics
+        """
+        sync_key = FIREHOSE_SYNC_KEY
+        if self.forum:
+            sync_key = f"{sync_key}:{self.forum}"
+        cursor_state = self.checkpoint_mgr.get_sync_state(sync_key)
+        cursor = cursor_state.cursor if cursor_state else None
+
+        new_posts: Dict[int, Dict[str, Any]] = {}
+        before = None
+        while True:
+            posts = await self.api_client.fetch_latest_posts(before=before)
+            ids = [post["id"] for post in posts if post.get("id")]
+            if not ids:
+                break
+
+            for post in posts:
+                if post.get("id") and (cursor is None or post["id"] > cursor):
+                    new_posts[post["id"]] = post
+
+            if cursor is None or min(ids) <= cursor + 1:
+                break
+            before = min(ids)
+
+        if not new_posts:
+            logger.debug("No new posts in the latest-posts feed")
+            return self.stats
+
+        tracked = set(self.db_session.scalars(select(Category.id)))
+        by_topic: Dict[int, List[Dict[str, Any]]] = {}
+        for post_id in sorted(new_posts):
+            post = new_posts[post_id]
+            if post.get("topic_id") and post.get("category_id") in tracked:
+                by_topic.setdefault(post["topic_id"], []).append(post)
+
+        failed = self._failed_writes
+        for topic_id, posts in by_topic.items():
+            if self.db_session.get(Topic, topic_id) is None:
+                await self._collect_topic(
+                    topic_id,
+                    posts[0]["category_id"],
+                    on_saved=partial(self._count, "topics_processed"),
+                )
+            else:
+                await self._apply_new_posts(topic_id, posts)
+                self.stats["topics_updated"] += 1
+
+        await self._commit_pending()
+        if self._failed_writes > failed:
+            raise RuntimeError(
+                f"{self._failed_writes - failed} topic(s) were not stored; "
+                "keeping the latest-posts cursor"
+            )
+        self.checkpoint_mgr.save_sync_state(sync_key, cursor=max(new_posts))
+        logger.info(
+            f"Synced {len(new_posts)} new post(s) across "
+            f"{len(by_topic)} tracked topic(s)"
+        )
+        return self.stats
+
+    async def _apply_new_posts(
+        self, topic_id: int, posts_data: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Store feed posts of a known topic and bump its counters, then commit.
+
+        Args:
+            topic_id: Topic ID
+            posts_data: New posts of the topic, oldest first
+        """
+        ids = [post["id"] for post in posts_data]
+        stored = set(
+            self.db_session.scalars(select(Post.id).where(Post.id.in_(ids)))
+        )
+        posts_data = [post for post in posts_data if post["id"] not in stored]
+        if not posts_data:
+            return
+
+        try:
+            await self._store_posts(posts_data, topic_id)
+            await self._store_users(posts_data)
+
+            topic = self.db_session.get(Topic, topic_id)
+            for post in posts_data:
+                created_at = parse_timestamp(post.get("created_at"))
+                if created_at and (
+                    not topic.last_posted_at
+                    or created_at > as_utc(topic.last_posted_at)
+                ):
+                    topic.last_posted_at = created_at
+                # Replies are every post after the opening one
+                topic.reply_count = max(
+                    topic.reply_count or 0, post.get("post_number", 1) - 1
+                )
+
+            self.db_session.commit()
+        except Exception as e:
+            logger.error(
+                f"Error applying new posts to topic {topic_id}: {e}",
+                exc_info=True,
+            )
+            self.db_session.rollback()
+            raise
+
     async def _full_collection(
         self, category_id: int, page_limit: Optional[int] = None
     ) -> None:
@@ -148,244 +423,763 @@ class CollectionOrchestrator:
             f"{processed_count} topics already processed"
         )
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            TimeRemainingColumn(),
-            console=console,
-        ) as progress:
-            # Create progress tasks
-            page_task = progress.add_task(
-                "[cyan]Fetching pages...", total=None
-            )
+        label = self._progress_label(category_id)
+
+        with self._progress_display(TimeRemainingColumn()) as progress:
+            # Create progress tasks; a shared display gets one row only
+            page_task = None
+            if self.progress is None:
+                page_task = progress.add_task(
+                    "[cyan]Fetching pages...", total=None
+                )
             topic_task = progress.add_task(
-                "[green]Processing topics...", total=processed_count
+                f"[green]{label}Processing topics...", total=processed_count
             )
+            topic_total = processed_count
 
             page = current_page
-            has_more = True
-            topics_since_checkpoint = 0
+            sink = TopicSink(
+                self,
+                category_id,
+                processed_count,
+                on_stored=lambda: progress.update(topic_task, advance=1),
+            )
+            writer = self._start_writer(sink)
+            store = writer.submit if writer else self._call_sink(sink)
+            cancelled = True
 
-            while has_more:
-                try:
-                    # Fetch category page
-                    progress.update(
-                        page_task, description=f"[cyan]Fetching page {page}..."
-                    )
+            try:
+                async with aclosing(
+                    self._category_pages(category_id, current_page, page_limit)
+                ) as pages:
+                    async for page, topics in pages:
+                        if page_task is not None:
+                            progress.update(
+                                page_task,
+                                description=(
+                                    f"[cyan]Processing page {page}..."
+                                ),
+                            )
+                        else:
+                            progress.update(
+                                topic_task,
+                                description=(
+                                    f"[green]{label}Processing page {page}..."
+                                ),
+                            )
 
-                    category_data = await self.api_client.fetch_category_page(
-                        category_id, page=page
-                    )
+                        # Update progress total
+                        topic_total += len(topics)
+                        progress.update(topic_task, total=topic_total)
+
+                        topic_ids = [
+                            topic_summary["id"]
+                            for topic_summary in topics
+                            if topic_summary.get("id")
+                        ]
+
+                        # Fetch topics concurrently, store them in page order
+                        async with aclosing(
+                            self._fetch_topics(topic_ids)
+                        ) as fetched:
+                            async for topic_id, topic_data, error in fetched:
+                                await store(
+                                    "store_topic",
+                                    topic_id,
+                                    topic_data,
+                                    error,
+                                    page,
+                                )
 
-                    if not category_data:
-                        logger.warning(f"No data returned for page {page}")
-                        break
+                        # Save checkpoint after each page
+                        await store("page_done", page)
+
+                        # A failure from here on belongs to the next page
+                        page += 1
+
+                await store("finish")
+                cancelled = False
+
+            except Exception as e:
+                logger.error(f"Error fetching page {page}: {e}", exc_info=True)
+                # Save checkpoint and stop; a failed writer cannot, and
+                # reports its error on close
+                if writer is None or writer.error is None:
+                    await store("page_failed", page, e)
+                cancelled = False
+
+            finally:
+                if writer:
+                    try:
+                        await writer.close(discard=cancelled)
+                    finally:
+                        for key, value in sink.orchestrator.stats.items():
+                            self.stats[key] += value
+                        # Rows the writer committed are newer than ours
+                        self.db_session.expire_all()
+
+    def _start_writer(self, sink: TopicSink) -> Optional[DatabaseWriter]:
+        """
+        Move a sink onto a writer thread, if configured and possible.
 
-                    topic_list = category_data.get("topic_list", {})
-                    topics = topic_list.get("topics", [])
+        The writer gets its own session and orchestrator; the sink's
+        progress callback is marshalled back to the event loop.
 
-                    if not topics:
-                        logger.info(f"No more topics found at page {page}")
-                        break
+        Args:
+            sink: Sink bound to this orchestrator
+
+        Returns:
+            Started writer, or None to store on the event loop
+        """
+        queue_size = self.settings.scraping.write_queue_size
+        if not queue_size:
+            return None
+
+        engine = self.db_session.get_bind()
+        if engine.dialect.name == "sqlite" and engine.url.database in (
+            None,
+            "",
+            ":memory:",
+        ):
+            logger.warning(
+                "In-memory SQLite is private to one connection; "
+                "storing on the event loop instead of a writer thread"
+            )
+            return None
+
+        writer_session = sessionmaker(bind=engine)()
+        sink.orchestrator = CollectionOrchestrator(
+            api_client=self.api_client,
+            db_session=writer_session,
+            checkpoint_mgr=CheckpointManager(
+                session=writer_session,
+                checkpoint_dir=self.checkpoint_mgr.checkpoint_dir,
+            ),
+            settings=self.settings,
+            forum=self.forum,
+        )
+        loop = asyncio.get_running_loop()
+        on_stored = sink.on_stored
+        sink.on_stored = lambda: loop.call_soon_threadsafe(on_stored)
+
+        writer = DatabaseWriter(sink, queue_size)
+        writer.start()
+        return writer
+
+    @staticmethod
+    def _call_sink(sink: TopicSink):
+        """Inline counterpart of DatabaseWriter.submit."""
+
+        async def call(method: str, *args: Any) -> None:
+            await getattr(sink, method)(*args)
+
+        return call
+
+    async def _category_pages(
+        self,
+        category_id: int,
+        start_page: int,
+        page_limit: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Yield category pages, optionally prefetching ahead of the consumer.
+
+        With ``scraping.prefetch_pages`` set, a background task walks the
+        listing into a queue of that size while the caller processes the
+        current page, so the listing request never blocks topic work.
+        Pages are still yielded strictly in order and a fetch error is
+        raised at the position where it occurred.
+
+        Args:
+            category_id: Category ID
+            start_page: First page to fetch
+            page_limit: Optional limit on number of pages to collect
+
+        Yields:
+            Tuples of (page number, topic summaries)
+        """
+        pages = self._walk_category_pages(category_id, start_page, page_limit)
+        depth = self.settings.scraping.prefetch_pages
+
+        if depth <= 0:
+            async with aclosing(pages):
+                async for item in pages:
+                    yield item
+            return
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=depth)
+
+        async def produce() -> None:
+            try:
+                async with aclosing(pages):
+                    async for item in pages:
+                        await queue.put(item)
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _walk_category_pages(
+        self,
+        category_id: int,
+        start_page: int,
+        page_limit: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Fetch category pages one after another until the listing ends.
+
+        Args:
+            category_id: Category ID
+            start_page: First page to fetch
+            page_limit: Optional limit on number of pages to collect
+
+        Yields:
+            Tuples of (page number, topic summaries)
+        """
+        page = start_page
+
+        while True:
+            category_data = await self.api_client.fetch_category_page(
+                category_id, page=page
+            )
+
+            if not category_data:
+                logger.warning(f"No data returned for page {page}")
+                return
 
-                    # Update progress total
+            topic_list = category_data.get("topic_list", {})
+            topics = topic_list.get("topics", [])
+
+            if not topics:
+                logger.info(f"No more topics found at page {page}")
+                return
+
+            yield page, topics
+
+            # Check if page limit reached
+            if page_limit and page + 1 >= page_limit:
+                logger.info(f"Page limit reached: {page + 1}/{page_limit}")
+                return
+
+            # Check if there are more pages
+            if topic_list.get("more_topics_url") is None:
+                return
+
+            page += 1
+
+    async def _incremental_update(self, category_id: int) -> None:
+        """
+        Update existing data with new posts/topics since last run.
+
+        The listing is sorted by most recent activity, so pages are walked
+        until a (non-pinned) topic older than the category's watermark
+        shows up; everything past that point is already stored. The
+        watermark starts at the newest stored post and is only advanced,
+        in one commit, once every changed topic was saved.
+
+        Args:
+            category_id: Category ID
+        """
+        logger.info(f"Starting incremental update for category {category_id}")
+
+        sync_key = f"category:{category_id}"
+        watermark = self._load_watermark(category_id)
+        newest_seen = watermark
+        failures = 0
+        failed_writes = self._failed_writes
+
+        if watermark is None:
+            logger.info("No watermark yet, checking the first page only")
+        else:
+            logger.info(f"Updating activity newer than {watermark}")
+
+        label = self._progress_label(category_id)
+
+        with self._progress_display() as progress:
+            task = progress.add_task(
+                f"[green]{label}Checking for updates...", total=0
+            )
+            task_total = 0
+
+            pages = self._category_pages(
+                category_id, 0, page_limit=None if watermark else 1
+            )
+            async with aclosing(pages) as pages:
+                async for page, topics in pages:
+                    task_total += len(topics)
                     progress.update(
-                        topic_task, total=progress.tasks[1].total + len(topics)
+                        task,
+                        description=f"[green]{label}Checking page {page}...",
+                        total=task_total,
                     )
 
-                    # Process each topic
+                    # Topic ID -> whether the topic was already stored
+                    stale_topics: Dict[int, bool] = {}
+                    reached_watermark = False
+
                     for topic_summary in topics:
                         topic_id = topic_summary.get("id")
                         if not topic_id:
                             continue
 
-                        try:
-                            await self._collect_topic(topic_id, category_id)
-                            processed_count += 1
-                            topics_since_checkpoint += 1
-                            self.stats["topics_processed"] += 1
-                            progress.update(topic_task, advance=1)
-
-                            # Save checkpoint every 10 topics
-                            if topics_since_checkpoint >= 10:
-                                self.checkpoint_mgr.save_checkpoint(
-                                    category_id=category_id,
-                                    checkpoint_type="category_page",
-                                    last_page=page,
-                                    total_processed=processed_count,
-                                    status="in_progress",
+                        activity = _topic_activity(topic_summary)
+                        if activity and (
+                            newest_seen is None or activity > newest_seen
+                        ):
+                            newest_seen = activity
+                        # Pinned topics stay on top whatever their age
+                        if (
+                            watermark
+                            and activity
+                            and activity < watermark
+                            and not topic_summary.get("pinned")
+                        ):
+                            reached_watermark = True
+
+                        if self._has_new_activity(topic_id, topic_summary):
+                            existing = self.db_session.get(Topic, topic_id)
+                            stale_topics[topic_id] = existing is not None
+                        else:
+                            progress.update(task, advance=1)
+
+                    # Fetch topics with new/updated posts concurrently
+                    async with aclosing(
+                        self._fetch_topics(list(stale_topics))
+                    ) as fetched:
+                        async for topic_id, topic_data, error in fetched:
+                            try:
+                                if error is not None:
+                                    raise error
+                                await self._save_topic(
+                                    topic_data,
+                                    category_id,
+                                    on_saved=partial(
+                                        self._count,
+                                        (
+                                            "topics_updated"
+                                            if stale_topics[topic_id]
+                                            else "topics_processed"
+                                        ),
+                                    ),
+                                )
+                            except Exception as e:
+                                failures += 1
+                                logger.error(
+                                    f"Error updating topic {topic_id}: {e}",
+                                    exc_info=True,
                                 )
-                                topics_since_checkpoint = 0
+                            progress.update(task, advance=1)
 
-                        except Exception as e:
-                            logger.error(
-                                f"Error processing topic {topic_id}: {e}",
-                                exc_info=True,
-                            )
-                            # Continue with next topic
-
-                    # Save checkpoint after each page
-                    self.checkpoint_mgr.save_checkpoint(
-                        category_id=category_id,
-                        checkpoint_type="category_page",
-                        last_page=page,
-                        total_processed=processed_count,
-                        status="in_progress",
-                    )
-                    topics_since_checkpoint = 0
-
-                    # Check if page limit reached
-                    if page_limit and page + 1 >= page_limit:
-                        logger.info(
-                            "page_limit_reached",
-                            page=page + 1,
-                            limit=page_limit,
-                        )
+                    if reached_watermark:
+                        logger.info(f"Reached watermark on page {page}")
                         break
 
-                    # Check if there are more pages
-                    has_more = topic_list.get("more_topics_url") is not None
-                    page += 1
+        await self._commit_pending()
+        failures += self._failed_writes - failed_writes
+        if failures:
+            logger.warning(
+                f"{failures} topic(s) failed; keeping watermark {watermark} "
+                f"so they are retried next run"
+            )
+        elif newest_seen and newest_seen != watermark:
+            self.checkpoint_mgr.save_sync_state(
+                sync_key, watermark=newest_seen.astimezone(timezone.utc)
+            )
 
-                except Exception as e:
-                    logger.error(
-                        f"Error fetching page {page}: {e}", exc_info=True
-                    )
-                    # Save checkpoint and stop
-                    self.checkpoint_mgr.save_checkpoint(
-                        category_id=category_id,
-                        checkpoint_type="category_page",
-                        last_page=page,
-                        total_processed=processed_count,
-                        status="error",
-                        error_message=str(e),
-                    )
-                    break
+    def _progress_display(self, *columns):
+        """Use the shared progress display, or open a private one."""
+        if self.progress is not None:
+            return nullcontext(self.progress)
+        return Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            *columns,
+            console=console,
+        )
 
-    async def _incremental_update(self, category_id: int) -> None:
+    def _progress_label(self, category_id: int) -> str:
+        """Row prefix telling categories apart on a shared display."""
+        if not self.progress:
+            return ""
+        if self.forum:
+            local_id = category_id % ID_NAMESPACE_SIZE
+            return f"{self.forum} category {local_id}: "
+        return f"Category {category_id}: "
+
+    def _load_watermark(self, category_id: int) -> Optional[datetime]:
         """
-        Update existing data with new posts/topics since last run.
+        Get the activity timestamp an incremental update can stop at.
+
+        Falls back to the newest stored post so databases collected before
+        watermarks existed don't re-walk the whole category.
 
         Args:
             category_id: Category ID
+
+        Returns:
+            Timezone-aware watermark, or None if nothing is stored yet
         """
-        logger.info(f"Starting incremental update for category {category_id}")
+        state = self.checkpoint_mgr.get_sync_state(f"category:{category_id}")
+        if state and state.watermark:
+            return as_utc(state.watermark)
 
-        # Fetch first page to get recent topics
-        category_data = await self.api_client.fetch_category_page(
-            category_id, page=0
+        newest = self.db_session.scalar(
+            select(func.max(Topic.last_posted_at)).where(
+                Topic.category_id == category_id
+            )
         )
+        return as_utc(newest) if newest else None
+
+    def _has_new_activity(
+        self, topic_id: int, topic_summary: Dict[str, Any]
+    ) -> bool:
+        """
+        Check whether a listed topic has posts we haven't stored.
 
-        if not category_data:
-            logger.warning("No data returned for incremental update")
+        Args:
+            topic_id: Topic ID
+            topic_summary: Topic entry from the category listing
+
+        Returns:
+            True if the topic is new or has newer posts than stored
+        """
+        existing_topic = self.db_session.get(Topic, topic_id)
+        api_last_posted = parse_timestamp(topic_summary.get("last_posted_at"))
+
+        if (
+            api_last_posted
+            and existing_topic
+            and existing_topic.last_posted_at
+        ):
+            # Only fetch if there's new activity
+            return api_last_posted > as_utc(existing_topic.last_posted_at)
+
+        return True
+
+    async def _fetch_topics(
+        self, topic_ids: List[int]
+    ) -> AsyncIterator[
+        Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]
+    ]:
+        """
+        Fetch topics concurrently, yielding results in the given order.
+
+        Up to ``scraping.max_concurrency`` requests are in flight at once,
+        all sharing the API client's rate limiter. Posts missing from a
+        topic's first chunk are fetched before the topic is yielded.
+        Results are yielded in input order so storage and checkpoints stay
+        deterministic while later topics are still being fetched.
+
+        Args:
+            topic_ids: Topic IDs to fetch
+
+        Yields:
+            Tuples of (topic_id, topic_data, error); exactly one of
+            topic_data and error is set
+        """
+        semaphore = asyncio.Semaphore(self.settings.scraping.max_concurrency)
+
+        async def fetch(topic_id: int) -> Dict[str, Any]:
+            async with semaphore:
+                topic_data = await self.api_client.fetch_topic(topic_id)
+            # Slot released first: batches take their own slots
+            await self._complete_posts(topic_data, semaphore)
+            return topic_data
+
+        tasks = [
+            asyncio.create_task(fetch(topic_id)) for topic_id in topic_ids
+        ]
+
+        try:
+            for topic_id, task in zip(topic_ids, tasks):
+                try:
+                    yield topic_id, await task, None
+                except Exception as e:
+                    yield topic_id, None, e
+        finally:
+            # Stop outstanding fetches if the consumer bailed out early
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _complete_posts(
+        self,
+        topic_data: Optional[Dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """
+        Add posts that the topic JSON only lists by ID.
+
+        ``post_stream.stream`` holds every post ID, but only the first chunk
+        is embedded. IDs that are neither embedded nor already stored are
+        fetched in batches, concurrently, and appended to
+        ``post_stream.posts``.
+
+        Fetched posts are cut down to STORED_POST_FIELDS as they are
+        decoded, but every post of the topic is kept until the topic is
+        stored, so memory still grows with the size of a megathread.
+
+        Args:
+            topic_data: Full topic data from API (modified in place)
+            semaphore: Concurrency limit shared with topic fetches
+        """
+        if not topic_data or not topic_data.get("id"):
             return
 
-        topics = category_data.get("topic_list", {}).get("topics", [])
+        post_stream = topic_data.setdefault("post_stream", {})
+        posts = post_stream.setdefault("posts", [])
+        stream = post_stream.get("stream") or []
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            console=console,
-        ) as progress:
-            task = progress.add_task(
-                "[green]Checking for updates...", total=len(topics)
+        known = {post.get("id") for post in posts}
+        if all(post_id in known for post_id in stream):
+            return
+
+        topic_id = topic_data["id"]
+        known.update(
+            self.db_session.scalars(
+                select(Post.id).where(Post.topic_id == topic_id)
             )
+        )
+        missing = [post_id for post_id in stream if post_id not in known]
+        if not missing:
+            return
 
-            for topic_summary in topics:
-                topic_id = topic_summary.get("id")
-                if not topic_id:
-                    continue
+        batch_size = self.settings.scraping.posts_batch_size
+        batches = [
+            missing[start : start + batch_size]
+            for start in range(0, len(missing), batch_size)
+        ]
+        logger.debug(
+            f"Topic {topic_id}: fetching {len(missing)} missing posts "
+            f"in {len(batches)} batch(es)"
+        )
+
+        async def fetch(post_ids: List[int]) -> List[Dict[str, Any]]:
+            # Posts may arrive one at a time; keep only what storage reads
+            fetched = []
+            async with semaphore:
+                stream = self.api_client.iter_posts(topic_id, post_ids)
+                async with aclosing(stream):
+                    async for post in stream:
+                        fetched.append(
+                            {
+                                field: post[field]
+                                for field in STORED_POST_FIELDS
+                                if field in post
+                            }
+                        )
+            return fetched
+
+        for batch_posts in await asyncio.gather(*map(fetch, batches)):
+            posts.extend(batch_posts)
+
+    async def _collect_topic(
+        self,
+        topic_id: int,
+        category_id: int,
+        on_saved: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Fetch a single topic with all posts and queue it for storage.
+
+        Args:
+            topic_id: Topic ID to fetch
+            category_id: Category ID this topic belongs to
+            on_saved: Called once the topic is written (see _save_topic)
+        """
+        logger.debug(f"Collecting topic {topic_id}")
+
+        # Fetch full topic details
+        topic_data = await self.api_client.fetch_topic(topic_id)
+        await self._complete_posts(
+            topic_data,
+            asyncio.Semaphore(self.settings.scraping.max_concurrency),
+        )
+
+        await self._save_topic(topic_data, category_id, on_saved=on_saved)
+
+    async def _save_topic(
+        self,
+        topic_data: Optional[Dict[str, Any]],
+        category_id: int,
+        on_saved: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Queue a fetched topic with its posts and users for the next commit.
+
+        The topic is written with its group (see _queue_write); a failing
+        topic is rolled back alone and logged, and on_saved is then not
+        called.
+
+        Args:
+            topic_data: Full topic data from API
+            category_id: Category ID this topic belongs to
+            on_saved: Called once the topic is written, before its group
+                commits
+        """
+        if not topic_data:
+            logger.warning("No data returned for topic")
+            return
+
+        await self._queue_write(
+            f"topic {topic_data.get('id')}",
+            partial(self._write_topic, topic_data, category_id),
+            on_saved,
+        )
+
+    async def _write_topic(
+        self, topic_data: Dict[str, Any], category_id: int
+    ) -> None:
+        """Store a topic, then its posts; their authors follow per group."""
+        topic_id = topic_data.get("id")
+        posts_data = topic_data.get("post_stream", {}).get("posts", [])
 
-                # Check if topic exists and has new activity
-                existing_topic = self.db_session.get(Topic, topic_id)
+        await self._store_topic(topic_data, category_id)
+        await self._store_posts(posts_data, topic_id)
+        self._authors_with_group(posts_data)
 
-                api_last_posted = topic_summary.get("last_posted_at")
-                if api_last_posted:
-                    api_last_posted_dt = datetime.fromisoformat(
-                        api_last_posted.replace("Z", "+00:00")
-                    )
+    async def _save_posts(
+        self, posts_data: List[Dict[str, Any]], topic_id: int
+    ) -> None:
+        """
+        Queue additional posts of an already stored topic.
 
-                    if existing_topic and existing_topic.last_posted_at:
-                        # Only fetch if there's new activity
-                        # Ensure timezone-aware comparison
-                        db_last_posted = existing_topic.last_posted_at
-                        if db_last_posted.tzinfo is None:
-                            db_last_posted = db_last_posted.replace(
-                                tzinfo=timezone.utc
-                            )
+        Like _save_topic, written and committed with the next group.
 
-                        if api_last_posted_dt <= db_last_posted:
-                            progress.update(task, advance=1)
-                            continue
+        Args:
+            posts_data: List of post data dictionaries
+            topic_id: Topic ID these posts belong to
+        """
 
-                try:
-                    # Fetch topic with new/updated posts
-                    await self._collect_topic(topic_id, category_id)
+        async def write() -> None:
+            await self._store_posts(posts_data, topic_id)
+            self._authors_with_group(posts_data)
 
-                    if existing_topic:
-                        self.stats["topics_updated"] += 1
-                    else:
-                        self.stats["topics_processed"] += 1
+        await self._queue_write(f"posts of topic {topic_id}", write)
 
-                    progress.update(task, advance=1)
+    async def _queue_write(
+        self,
+        description: str,
+        write: Callable[[], Awaitable[None]],
+        on_saved: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Add a write to the current group; commit once it is full or old.
 
-                except Exception as e:
-                    logger.error(
-                        f"Error updating topic {topic_id}: {e}", exc_info=True
-                    )
-                    progress.update(task, advance=1)
+        Up to ``scraping.commit_batch_size`` writes share a transaction,
+        and a group is committed once ``scraping.commit_interval_ms`` have
+        passed since its first write, checked as each write is added.
+        Writes wait in memory rather than in an open transaction, so no
+        write lock is held while topics are being fetched.
 
-    async def _collect_topic(self, topic_id: int, category_id: int) -> None:
+        Args:
+            description: What is written, for error messages
+            write: Coroutine function doing the write
+            on_saved: Called once the write succeeded
+        """
+        now = time.monotonic()
+        if self._group_started is None:
+            self._group_started = now
+        self._pending.append((description, write, on_saved))
+
+        scraping = self.settings.scraping
+        if (
+            len(self._pending) >= scraping.commit_batch_size
+            or (now - self._group_started) * 1000
+            >= scraping.commit_interval_ms
+        ):
+            await self._commit_pending()
+
+    def _checkpoint_with_group(self, save: Callable[[], None]) -> None:
         """
-        Fetch and store a single topic with all posts.
+        Save a checkpoint in the transaction of the next group commit.
+
+        Only the latest request is kept. It runs after the group's writes
+        and their on_saved callbacks, so counts it reads include them.
 
         Args:
-            topic_id: Topic ID to fetch
-            category_id: Category ID this topic belongs to
+            save: Saves the checkpoint without committing
         """
-        logger.debug(f"Collecting topic {topic_id}")
+        self._group_checkpoint = save
 
-        try:
-            # Fetch full topic details
-            topic_data = await self.api_client.fetch_topic(topic_id)
+    def _authors_with_group(self, posts_data: List[Dict[str, Any]]) -> None:
+        """
+        Refresh the statistics of these posts' authors with the next group.
 
-            if not topic_data:
-                logger.warning(f"No data returned for topic {topic_id}")
-                return
+        Statistics are aggregated over all of a user's posts, so an author
+        of many topics is refreshed once per group rather than per topic.
+
+        Args:
+            posts_data: List of post data dictionaries
+        """
+        self._group_authors.update(
+            post_data.get("username") for post_data in posts_data
+        )
 
-            # Extract posts and users
-            post_stream = topic_data.get("post_stream", {})
-            posts_data = post_stream.get("posts", [])
+    async def _commit_pending(self) -> None:
+        """
+        Write and commit the current group, even if it is not full.
 
-            # Store users from posts
-            await self._store_users(posts_data)
+        Each write runs under its own savepoint, so a failure rolls back
+        that write alone; it is logged and counted in _failed_writes. The
+        group's writes, the statistics of their authors, its checkpoint
+        and the commit run back to back, without waiting on the network in
+        between.
 
-            # Store or update topic
-            await self._store_topic(topic_data, category_id)
+        Raises:
+            SQLAlchemyError: If the commit fails; the group is rolled back
+        """
+        pending, self._pending = self._pending, []
+        checkpoint, self._group_checkpoint = self._group_checkpoint, None
+        self._group_started = None
+        if not pending and checkpoint is None:
+            return
 
-            # Store posts
-            await self._store_posts(posts_data, topic_id)
+        try:
+            for description, write, on_saved in pending:
+                try:
+                    with savepoint(self.db_session):
+                        await write()
+                except Exception as e:
+                    self._failed_writes += 1
+                    logger.error(
+                        f"Error storing {description}: {e}", exc_info=True
+                    )
+                    continue
+                if on_saved:
+                    on_saved()
 
-            # Commit transaction
+            authors, self._group_authors = self._group_authors, set()
+            if authors:
+                self.stats["users_added"] += refresh_users(
+                    self.db_session, authors
+                )
+            if checkpoint:
+                checkpoint()
             self.db_session.commit()
-
-        except SQLAlchemyError as e:
-            logger.error(
-                f"Database error for topic {topic_id}: {e}", exc_info=True
-            )
+        except SQLAlchemyError:
             self.db_session.rollback()
             raise
 
-        except Exception as e:
-            logger.error(
-                f"Error collecting topic {topic_id}: {e}", exc_info=True
-            )
-            self.db_session.rollback()
-            raise
+    def _count(self, stat: str) -> None:
+        """Count a stored item in the collection statistics."""
+        self.stats[stat] += 1
 
     async def _store_category(self, category_metadata: Dict[str, Any]) -> None:
         """
@@ -401,6 +1195,7 @@ class CollectionOrchestrator:
             if not category:
                 category = Category(
                     id=category_id,
+                    forum=self.forum,
                     name=category_metadata.get("name", ""),
                     slug=category_metadata.get("slug", ""),
                     description=category_metadata.get("description", ""),
@@ -430,63 +1225,16 @@ class CollectionOrchestrator:
 
     async def _store_users(self, posts_data: List[Dict[str, Any]]) -> None:
         """
-        Store or update users from posts.
+        Refresh the statistics of the authors of stored posts.
+
+        Call after the posts themselves are stored: statistics are
+        aggregated from the posts table.
 
         Args:
             posts_data: List of post data dictionaries
         """
-        for post_data in posts_data:
-            username = post_data.get("username")
-            if not username:
-                continue
-
-            try:
-                user = self.db_session.get(User, username)
-
-                post_created = post_data.get("created_at")
-                if post_created:
-                    post_created_dt = datetime.fromisoformat(
-                        post_created.replace("Z", "+00:00")
-                    )
-                else:
-                    post_created_dt = None
-
-                if not user:
-                    user = User(
-                        username=username,
-                        post_count=1,
-                        first_seen=post_created_dt,
-                        last_seen=post_created_dt,
-                    )
-                    self.db_session.add(user)
-                    self.stats["users_added"] += 1
-                    logger.debug(f"Added user: {username}")
-                else:
-                    # Update user stats
-                    user.post_count += 1
-                    if post_created_dt:
-                        # Ensure timezone-aware comparison
-                        first_seen = user.first_seen
-                        last_seen = user.last_seen
-
-                        # Make database datetime timezone-aware if needed
-                        if first_seen and first_seen.tzinfo is None:
-                            first_seen = first_seen.replace(
-                                tzinfo=timezone.utc
-                            )
-                        if last_seen and last_seen.tzinfo is None:
-                            last_seen = last_seen.replace(tzinfo=timezone.utc)
-
-                        if not first_seen or post_created_dt < first_seen:
-                            user.first_seen = post_created_dt
-                        if not last_seen or post_created_dt > last_seen:
-                            user.last_seen = post_created_dt
-
-            except SQLAlchemyError as e:
-                logger.error(
-                    f"Error storing user {username}: {e}", exc_info=True
-                )
-                # Continue with other users
+        usernames = {post_data.get("username") for post_data in posts_data}
+        self.stats["users_added"] += refresh_users(self.db_session, usernames)
 
     async def _store_topic(
         self, topic_data: Dict[str, Any], category_id: int
@@ -521,6 +1269,7 @@ class CollectionOrchestrator:
             if not topic:
                 topic = Topic(
                     id=topic_id,
+                    forum=self.forum,
                     category_id=category_id,
                     title=topic_data.get("title", ""),
                     slug=topic_data.get("slug", ""),
@@ -573,67 +1322,21 @@ class CollectionOrchestrator:
         self, posts_data: List[Dict[str, Any]], topic_id: int
     ) -> None:
         """
-        Store posts in database (skip duplicates).
+        Store posts in database, updating posts edited since stored.
 
         Args:
             posts_data: List of post data dictionaries
             topic_id: Topic ID these posts belong to
         """
-        for post_data in posts_data:
-            post_id = post_data.get("id")
-            if not post_id:
-                continue
-
-            # Check if post already exists
-            existing_post = self.db_session.get(Post, post_id)
-            if existing_post:
-                continue
-
-            try:
-                # Parse timestamps
-                created_at = post_data.get("created_at")
-                if created_at:
-                    created_at = datetime.fromisoformat(
-                        created_at.replace("Z", "+00:00")
-                    )
-
-                updated_at = post_data.get("updated_at")
-                if updated_at:
-                    updated_at = datetime.fromisoformat(
-                        updated_at.replace("Z", "+00:00")
-                    )
-
-                post = Post(
-                    id=post_id,
-                    topic_id=topic_id,
-                    post_number=post_data.get("post_number", 0),
-                    username=post_data.get("username", ""),
-                    created_at=created_at,
-                    updated_at=updated_at,
-                    reply_count=post_data.get("reply_count", 0),
-                    quote_count=post_data.get("quote_count", 0),
-                    incoming_link_count=post_data.get(
-                        "incoming_link_count", 0
-                    ),
-                    reads=post_data.get("reads", 0),
-                    readers_count=post_data.get("readers_count", 0),
-                    score=post_data.get("score", 0.0),
-                    like_count=post_data.get("like_count", 0),
-                    cooked=post_data.get("cooked", ""),
-                    raw=post_data.get("raw", ""),
-                    is_accepted_answer=post_data.get("accepted_answer", False),
-                    scraped_at=datetime.utcnow(),
-                )
-                self.db_session.add(post)
-                self.stats["posts_collected"] += 1
-                self.stats["posts_added"] += 1
-                logger.debug(f"Added post {post_id} to topic {topic_id}")
-
-            except SQLAlchemyError as e:
-                logger.error(
-                    f"Error storing post {post_id}: {e}", exc_info=True
-                )
-                # Continue with other posts
+        added, updated = store_posts(self.db_session, posts_data, topic_id)
+        self.stats["posts_collected"] += added
+        self.stats["posts_added"] += added
+        self.stats["posts_updated"] += updated
+        if added or updated:
+            logger.debug(
+                f"Topic {topic_id}: {added} post(s) added, "
+                f"{updated} updated"
+            )
 
     def _log_statistics(self) -> None:
         """Log collection statistics."""
@@ -642,7 +1345,45 @@ class CollectionOrchestrator:
         console.print(f"  Topics updated: {self.stats['topics_updated']}")
         console.print(f"  Posts collected: {self.stats['posts_collected']}")
         console.print(f"  Posts added: {self.stats['posts_added']}")
+        console.print(f"  Posts updated: {self.stats['posts_updated']}")
         console.print(f"  Users added: {self.stats['users_added']}")
+        if self.stats.get("requests"):
+            console.print(request_metrics_table(self.stats["requests"]))
+
+
+def request_metrics_table(snapshot: Dict[str, Any]) -> Table:
+    """
+    Render a request metrics snapshot as a table.
+
+    Args:
+        snapshot: Snapshot from RequestMetrics.snapshot()
+
+    Returns:
+        Rich table with one row per endpoint class and a total row
+    """
+    table = Table(title="API Requests")
+    table.add_column("Endpoint", style="cyan")
+    for column in ("Requests", "Retries", "304", "429", "MB"):
+        table.add_column(column, justify="right")
+    for column in ("p50 ms", "p95 ms", "p99 ms", "Limiter wait s"):
+        table.add_column(column, justify="right")
+
+    rows = list(snapshot["endpoints"].items()) + [("total", snapshot["total"])]
+    for endpoint, metrics in rows:
+        latency = metrics["latency_ms"]
+        table.add_row(
+            endpoint,
+            str(metrics["requests"]),
+            str(metrics["retries"]),
+            str(metrics["not_modified"]),
+            str(metrics["throttled"]),
+            f"{metrics['bytes_received'] / 2**20:.1f}",
+            f"{latency['p50']:g}",
+            f"{latency['p95']:g}",
+            f"{latency['p99']:g}",
+            f"{metrics['total_wait_s']:g}",
+        )
+    return table
 
 
 async def collect_category(
@@ -650,6 +1391,8 @@ async def collect_category(
     full_fetch: bool = True,
     settings: Optional[Settings] = None,
     page_limit: Optional[int] = None,
+    offline: bool = False,
+    metrics_file: Optional[Path] = None,
 ) -> Dict[str, int]:
     """
     Collect all topics and posts from a category.
@@ -663,16 +1406,25 @@ async def collect_category(
         settings: Optional Settings instance (will load from config if not
             provided)
         page_limit: Optional limit on number of pages to collect (for testing)
+        offline: Replay responses from api.archive_dir instead of the
+            network
+        metrics_file: Optional JSON file to write request metrics to
 
     Returns:
         Dictionary with collection statistics
+
+    Raises:
+        ValueError: If offline is set but no archive is configured
     """
     if settings is None:
         settings = get_settings()
 
+    if offline and not settings.api.archive_dir:
+        raise ValueError("Offline collection needs api.archive_dir set")
+
     # Create database engine and session
-    engine = create_engine(settings.database.url, echo=settings.database.echo)
-    Base.metadata.create_all(engine)
+    engine = create_db_engine(settings.database)
+    migrate_schema(engine)
     SessionLocal = sessionmaker(bind=engine)
     db_session = SessionLocal()
 
@@ -684,13 +1436,18 @@ async def collect_category(
     )
 
     # Initialize API client
-    async with ForumAPIClient(
-        base_url=settings.api.base_url,
-        category_path=settings.api.category_path,
-        rate_limit=settings.api.rate_limit,
-        timeout=settings.api.timeout,
-        max_retries=settings.api.max_retries,
-    ) as api_client:
+    if offline:
+        client = ArchiveReplayClient(
+            settings.api.base_url,
+            settings.api.category_path,
+            ResponseArchive(Path(settings.api.archive_dir)),
+        )
+    else:
+        client = ForumAPIClient.from_settings(
+            settings.api, state_dir=checkpoint_dir
+        )
+
+    async with client as api_client:
         # Create orchestrator
         orchestrator = CollectionOrchestrator(
             api_client=api_client,
@@ -708,11 +1465,234 @@ async def collect_category(
             return stats
         finally:
             db_session.close()
+            if metrics_file:
+                write_metrics(metrics_file, api_client.metrics.snapshot())
+
+
+async def collect_categories(
+    category_ids: List[int],
+    full_fetch: bool = True,
+    settings: Optional[Settings] = None,
+    page_limit: Optional[int] = None,
+    metrics_file: Optional[Path] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Collect several categories concurrently in one event loop.
+
+    The categories share one database engine and one API client. The
+    client's host-level rate budget is split fairly between them, so
+    together they never exceed ``api.rate_limit``. Each category keeps its
+    own session, checkpoint and row on a shared progress display, and a
+    failing category does not stop the others.
+
+    Args:
+        category_ids: Category IDs to collect
+        full_fetch: If True, fetch all pages; if False, incremental update
+        settings: Optional Settings instance (will load from config if not
+            provided)
+        page_limit: Optional limit on number of pages to collect (for testing)
+        metrics_file: Optional JSON file to write the client's request
+            metrics to
+
+    Returns:
+        Statistics per category ID; a failed category maps to
+        ``{"error": message}``
+    """
+    if settings is None:
+        settings = get_settings()
+
+    engine = create_db_engine(settings.database)
+    migrate_schema(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    checkpoint_dir = Path(settings.scraping.checkpoint_dir)
+
+    async with ForumAPIClient.from_settings(
+        settings.api, state_dir=checkpoint_dir
+    ) as api_client:
+        with _shared_progress() as progress:
+            results = await _collect_with_client(
+                api_client,
+                settings.api,
+                category_ids,
+                session_factory=SessionLocal,
+                settings=settings,
+                progress=progress,
+                full_fetch=full_fetch,
+                page_limit=page_limit,
+            )
+
+    if metrics_file:
+        write_metrics(metrics_file, api_client.metrics.snapshot())
+    return dict(zip(category_ids, results))
+
+
+async def collect_forums(
+    full_fetch: bool = True,
+    settings: Optional[Settings] = None,
+    page_limit: Optional[int] = None,
+    metrics_file: Optional[Path] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Collect every configured forum concurrently in one event loop.
+
+    Each forum gets its own API client, and with it its own connection
+    pool, rate limit and adaptive controller, so a slow or throttling
+    forum never holds back the others. Within a forum, the categories
+    share that forum's rate budget as in collect_categories(). Category
+    and topic IDs are stored in the forum's ID namespace.
+
+    Args:
+        full_fetch: If True, fetch all pages; if False, incremental update
+        settings: Optional Settings instance (will load from config if not
+            provided)
+        page_limit: Optional limit on number of pages to collect (for testing)
+        metrics_file: Optional JSON file to write request metrics to,
+            keyed by forum name
+
+    Returns:
+        Statistics keyed by ``"forum/category_id"``; a failed category
+        maps to ``{"error": message}``
+    """
+    if settings is None:
+        settings = get_settings()
+
+    engine = create_db_engine(settings.database)
+    migrate_schema(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    checkpoint_dir = Path(settings.scraping.checkpoint_dir)
+    forum_metrics: Dict[str, Any] = {}
+
+    async def run(forum: ForumConfig, progress: Progress) -> List[Any]:
+        offset = forum.id_namespace * ID_NAMESPACE_SIZE
+        async with ForumAPIClient.from_settings(
+            forum.api, state_dir=checkpoint_dir, forum=forum
+        ) as api_client:
+            forum_metrics[forum.name] = api_client.metrics
+            return await _collect_with_client(
+                api_client,
+                forum.api,
+                [offset + category.id for category in forum.categories],
+                session_factory=SessionLocal,
+                settings=settings,
+                progress=progress,
+                full_fetch=full_fetch,
+                page_limit=page_limit,
+                forum=forum.name,
+            )
+
+    with _shared_progress() as progress:
+        forum_results = await asyncio.gather(
+            *(run(forum, progress) for forum in settings.forums),
+            return_exceptions=True,
+        )
+
+    if metrics_file:
+        write_metrics(
+            metrics_file,
+            {name: m.snapshot() for name, m in forum_metrics.items()},
+        )
+
+    stats: Dict[str, Dict[str, Any]] = {}
+    for forum, results in zip(settings.forums, forum_results):
+        if isinstance(results, BaseException):
+            logger.error(f"Forum {forum.name} failed: {results}")
+            results = [{"error": str(results)}] * len(forum.categories)
+        for category, result in zip(forum.categories, results):
+            stats[f"{forum.name}/{category.id}"] = result
+    return stats
+
+
+def _shared_progress() -> Progress:
+    """Progress display shared by concurrently collected categories."""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        TimeRemainingColumn(),
+        console=console,
+    )
+
+
+async def _collect_with_client(
+    api_client: ForumAPIClient,
+    api: APISettings,
+    category_ids: List[int],
+    session_factory: sessionmaker,
+    settings: Settings,
+    progress: Progress,
+    full_fetch: bool,
+    page_limit: Optional[int],
+    forum: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Collect categories concurrently through one client's rate budget.
+
+    Args:
+        api_client: Open client whose host budget the categories share
+        api: API settings the client was built from
+        category_ids: Category IDs to collect (namespaced for a forum)
+        session_factory: Session factory bound to the shared engine
+        settings: Settings instance
+        progress: Shared progress display
+        full_fetch: If True, fetch all pages; if False, incremental update
+        page_limit: Optional limit on number of pages to collect
+        forum: Forum name in a multi-forum configuration
+
+    Returns:
+        Statistics per category, in order; a failed category is
+        ``{"error": message}``
+    """
+    fair_share = FairShareLimiter(
+        rate=api.max_rate if api.adaptive_rate else api.rate_limit,
+        burst=api.burst,
+    )
+    checkpoint_dir = Path(settings.scraping.checkpoint_dir)
+
+    async def run(category_id: int) -> Dict[str, int]:
+        db_session = session_factory()
+        orchestrator = CollectionOrchestrator(
+            api_client=api_client.with_rate_limiter(
+                fair_share.share(f"category:{category_id}")
+            ),
+            db_session=db_session,
+            checkpoint_mgr=CheckpointManager(
+                session=db_session, checkpoint_dir=checkpoint_dir
+            ),
+            settings=settings,
+            progress=progress,
+            forum=forum,
+        )
+        try:
+            return await orchestrator.collect_category(
+                category_id=category_id,
+                full_fetch=full_fetch,
+                page_limit=page_limit,
+            )
+        finally:
+            db_session.close()
+
+    results = await asyncio.gather(
+        *(run(category_id) for category_id in category_ids),
+        return_exceptions=True,
+    )
+
+    stats = []
+    for category_id, result in zip(category_ids, results):
+        if isinstance(result, BaseException):
+            name = f"{forum} category" if forum else "Category"
+            logger.error(
+                f"{name} {category_id % ID_NAMESPACE_SIZE} failed: {result}"
+            )
+            stats.append({"error": str(result)})
+        else:
+            stats.append(result)
+    return stats
 
 
 async def incremental_update(
     category_id: int,
     settings: Optional[Settings] = None,
+    metrics_file: Optional[Path] = None,
 ) -> Dict[str, int]:
     """
     Update existing data with new posts/topics since last run.
@@ -723,6 +1703,7 @@ async def incremental_update(
         category_id: Category ID (e.g., 18)
         settings: Optional Settings instance (will load from config if not
             provided)
+        metrics_file: Optional JSON file to write request metrics to
 
     Returns:
         Dictionary with collection statistics
@@ -731,4 +1712,209 @@ async def incremental_update(
         category_id=category_id,
         full_fetch=False,
         settings=settings,
+        metrics_file=metrics_file,
+    )
+
+
+async def sync_firehose(
+    settings: Optional[Settings] = None,
+    interval: float = 10.0,
+    once: bool = False,
+) -> Dict[str, int]:
+    """
+    Follow the latest-posts feed, applying new posts as they appear.
+
+    Polls share the client's rate limiting with every other request the
+    process makes.
+
+    Args:
+        settings: Optional Settings instance (will load from config if not
+            provided)
+        interval: Seconds to wait between polls
+        once: Apply a single pass and return
+
+    Returns:
+        Dictionary with collection statistics
+    """
+    if settings is None:
+        settings = get_settings()
+
+    engine = create_db_engine(settings.database)
+    migrate_schema(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db_session = SessionLocal()
+
+    checkpoint_dir = Path(settings.scraping.checkpoint_dir)
+    checkpoint_mgr = CheckpointManager(
+        session=db_session,
+        checkpoint_dir=checkpoint_dir,
+    )
+
+    async with ForumAPIClient.from_settings(
+        settings.api, state_dir=checkpoint_dir
+    ) as api_client:
+        orchestrator = CollectionOrchestrator(
+            api_client=api_client,
+            db_session=db_session,
+            checkpoint_mgr=checkpoint_mgr,
+            settings=settings,
+        )
+
+        try:
+            while True:
+                await orchestrator.sync_latest_posts()
+                if once:
+                    return orchestrator.stats
+                await asyncio.sleep(interval)
+        finally:
+            db_session.close()
+
+
+def _category_id_from_url(url: str) -> Optional[int]:
+    """Extract the category ID from an archived category page URL."""
+    match = re.search(r"/(\d+)\.json$", urlsplit(url).path)
+    return int(match.group(1)) if match else None
+
+
+async def _decode_archive(
+    pool: ProcessPoolExecutor,
+    archive_dir: Path,
+    records: List[ArchiveRecord],
+    workers: int,
+    chunk_size: int = REINGEST_CHUNK_SIZE,
+) -> AsyncIterator[Tuple[ArchiveRecord, Optional[Dict[str, Any]]]]:
+    """Decode archive records in worker processes, yielding in order.
+
+    At most two chunks per worker are in flight so decoded payloads never
+    pile up faster than the database can absorb them.
+    """
+    loop = asyncio.get_running_loop()
+    chunks = (
+        records[start : start + chunk_size]
+        for start in range(0, len(records), chunk_size)
+    )
+    pending: deque = deque()
+
+    for chunk in chunks:
+        pending.append(
+            loop.run_in_executor(pool, decode_records, str(archive_dir), chunk)
+        )
+        if len(pending) >= workers * 2:
+            for item in await pending.popleft():
+                yield item
+
+    while pending:
+        for item in await pending.popleft():
+            yield item
+
+
+async def reingest_archive(
+    settings: Optional[Settings] = None,
+    archive_dir: Optional[Path] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Rebuild the database from the raw response archive.
+
+    Records are decompressed and parsed in worker processes; the parsed
+    payloads are stored in archive order by the same code paths a live
+    collection uses, so mapping changes apply without re-scraping.
+
+    Args:
+        settings: Optional Settings instance (will load from config if not
+            provided)
+        archive_dir: Archive directory (defaults to api.archive_dir)
+        workers: Number of decoder processes (defaults to CPU count)
+
+    Returns:
+        Dictionary with re-ingest statistics
+
+    Raises:
+        ValueError: If no archive directory is configured
+    """
+    if settings is None:
+        settings = get_settings()
+
+    if archive_dir is None:
+        if not settings.api.archive_dir:
+            raise ValueError(
+                "No archive directory given and api.archive_dir is not set"
+            )
+        archive_dir = Path(settings.api.archive_dir)
+    workers = workers or os.cpu_count() or 1
+
+    archive = ResponseArchive(archive_dir)
+    # Categories first so topics find their category row, and topics
+    # before the post batches that complete them
+    records = [
+        record
+        for endpoint in ("category", "topic", "posts")
+        for record in archive.latest_records([endpoint])
+    ]
+
+    engine = create_db_engine(settings.database)
+    migrate_schema(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db_session = SessionLocal()
+
+    orchestrator = CollectionOrchestrator(
+        api_client=ArchiveReplayClient(
+            settings.api.base_url, settings.api.category_path, archive
+        ),
+        db_session=db_session,
+        checkpoint_mgr=CheckpointManager(
+            session=db_session,
+            checkpoint_dir=Path(settings.scraping.checkpoint_dir),
+        ),
+        settings=settings,
     )
+    stats = {"records": len(records), "categories": 0, "skipped": 0}
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            decoded = _decode_archive(pool, archive_dir, records, workers)
+            async with aclosing(decoded) as items:
+                async for record, payload in items:
+                    if payload is None:
+                        stats["skipped"] += 1
+                    elif record.endpoint == "category":
+                        category_id = _category_id_from_url(record.url)
+                        if category_id is None:
+                            stats["skipped"] += 1
+                            continue
+                        await orchestrator._store_category(
+                            category_metadata(category_id, payload)
+                        )
+                        stats["categories"] += 1
+                    elif record.endpoint == "posts":
+                        posts = payload.get("post_stream", {}).get("posts")
+                        if not posts:
+                            continue
+                        try:
+                            await orchestrator._save_posts(
+                                posts, posts[0].get("topic_id")
+                            )
+                        except Exception:
+                            stats["skipped"] += 1
+                    else:
+                        try:
+                            await orchestrator._save_topic(
+                                payload,
+                                payload.get("category_id"),
+                                on_saved=partial(
+                                    orchestrator._count, "topics_processed"
+                                ),
+                            )
+                        except Exception:
+                            # Already logged; keep going with the rest
+                            stats["skipped"] += 1
+        await orchestrator._commit_pending()
+        # Records whose rows failed to write; each was logged
+        stats["skipped"] += orchestrator._failed_writes
+    finally:
+        db_session.close()
+        archive.close()
+
+    stats.update(orchestrator.stats)
+    logger.info(f"Re-ingest complete: {stats}")
+    return stats
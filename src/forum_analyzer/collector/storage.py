@@ -0,0 +1,310 @@
+"""Set-based writes of collected rows.
+
+Posts are mapped to plain row dicts and written with multi-row
+``INSERT ... ON CONFLICT`` statements instead of one ORM object (and one
+primary-key lookup) per post; user statistics are aggregated from the
+stored posts and written the same way. The conflict clause is dialect
+specific; databases without one fall back to SQLAlchemy's ORM bulk
+insert and update, which still batch by statement.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, SessionTransaction
+
+from .models import Post, User
+
+# Bound parameters allowed in one statement. SQLite's limit is 32766 since
+# 3.32 but 999 before; stay under the older one.
+MAX_BIND_PARAMS = {"sqlite": 999, "postgresql": 32767}
+
+# Columns rewritten when a stored post was edited on the forum
+POST_UPDATE_COLUMNS = (
+    "username",
+    "updated_at",
+    "reply_count",
+    "quote_count",
+    "incoming_link_count",
+    "reads",
+    "readers_count",
+    "score",
+    "like_count",
+    "cooked",
+    "raw",
+    "is_accepted_answer",
+    "scraped_at",
+)
+
+# Columns of users derived from their posts
+USER_STAT_COLUMNS = ("post_count", "topic_count", "first_seen", "last_seen")
+
+# Usernames aggregated per query when refreshing users incrementally
+USER_REFRESH_CHUNK_SIZE = 500
+
+
+def savepoint(session: Session) -> SessionTransaction:
+    """Begin a savepoint inside the session's transaction.
+
+    pysqlite only opens a transaction ahead of INSERT/UPDATE/DELETE, and a
+    SAVEPOINT outside a transaction acts as BEGIN, so releasing it would
+    commit. On SQLite the transaction is therefore opened first, with
+    BEGIN IMMEDIATE so its write lock is never upgraded from a read lock.
+
+    Args:
+        session: Database session
+
+    Returns:
+        Nested transaction; use as a context manager
+    """
+    connection = session.connection()
+    if connection.dialect.name == "sqlite":
+        if not connection.connection.driver_connection.in_transaction:
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+    return session.begin_nested()
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 API timestamp into an aware datetime."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes read back from the database as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def post_row(
+    post_data: Dict[str, Any], topic_id: int, scraped_at: datetime
+) -> Dict[str, Any]:
+    """Map API post data to a posts table row.
+
+    Args:
+        post_data: Post data from the API
+        topic_id: Topic the post belongs to
+        scraped_at: Collection time to record
+
+    Returns:
+        Row dict keyed by column name
+    """
+    return {
+        "id": post_data["id"],
+        "topic_id": topic_id,
+        "post_number": post_data.get("post_number", 0),
+        "username": post_data.get("username", ""),
+        "created_at": parse_timestamp(post_data.get("created_at")),
+        "updated_at": parse_timestamp(post_data.get("updated_at")),
+        "reply_count": post_data.get("reply_count", 0),
+        "quote_count": post_data.get("quote_count", 0),
+        "incoming_link_count": post_data.get("incoming_link_count", 0),
+        "reads": post_data.get("reads", 0),
+        "readers_count": post_data.get("readers_count", 0),
+        "score": post_data.get("score", 0.0),
+        "like_count": post_data.get("like_count", 0),
+        "cooked": post_data.get("cooked", ""),
+        "raw": post_data.get("raw", ""),
+        "is_accepted_answer": post_data.get("accepted_answer", False),
+        "scraped_at": scraped_at,
+    }
+
+
+def _chunks(rows: List[Dict[str, Any]], dialect: str):
+    limit = MAX_BIND_PARAMS.get(dialect, MAX_BIND_PARAMS["sqlite"])
+    size = max(1, limit // len(rows[0]))
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _upsert(
+    session: Session,
+    model,
+    key: str,
+    rows: List[Dict[str, Any]],
+    update_columns: Tuple[str, ...],
+) -> None:
+    """Insert rows of a model, overwriting update_columns on key conflicts."""
+    if not rows:
+        return
+
+    session.flush()
+    dialect = session.get_bind().dialect.name
+    table = model.__table__
+
+    if dialect not in ("sqlite", "postgresql"):
+        # No portable ON CONFLICT: split by what is already stored
+        key_column = getattr(model, key)
+        stored = set(
+            session.scalars(
+                select(key_column).where(
+                    key_column.in_([row[key] for row in rows])
+                )
+            )
+        )
+        new = [row for row in rows if row[key] not in stored]
+        changed = [
+            {key: row[key], **{c: row[c] for c in update_columns}}
+            for row in rows
+            if row[key] in stored
+        ]
+        if new:
+            session.execute(insert(model), new)
+        if changed:
+            session.execute(update(model), changed)
+        return
+
+    dialect_insert = (
+        sqlite.insert if dialect == "sqlite" else postgresql.insert
+    )
+    for chunk in _chunks(rows, dialect):
+        stmt = dialect_insert(table).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[key]],
+            set_={column: stmt.excluded[column] for column in update_columns},
+        )
+        session.execute(stmt)
+
+
+def upsert_posts(session: Session, rows: List[Dict[str, Any]]) -> None:
+    """Insert posts, overwriting the edited columns of existing ones.
+
+    Args:
+        session: Database session; its pending changes are flushed first
+            so the posts' topic exists
+        rows: Rows from post_row(), at most one per post ID
+    """
+    _upsert(session, Post, "id", rows, POST_UPDATE_COLUMNS)
+
+
+def store_posts(
+    session: Session, posts_data: List[Dict[str, Any]], topic_id: int
+) -> Tuple[int, int]:
+    """Write a topic's posts: new ones are added, edited ones updated.
+
+    One query reads the edit times of the topic's stored posts; posts
+    that are new or were edited since are then upserted together.
+    Unchanged posts are not rewritten.
+
+    Args:
+        session: Database session (not committed)
+        posts_data: Post data from the API
+        topic_id: Topic the posts belong to
+
+    Returns:
+        Tuple of (posts added, posts updated)
+    """
+    # Last copy wins if the API repeats a post
+    incoming = {
+        post_data["id"]: post_data
+        for post_data in posts_data
+        if post_data.get("id")
+    }
+    if not incoming:
+        return 0, 0
+
+    stored = dict(
+        session.execute(
+            select(Post.id, Post.updated_at).where(Post.topic_id == topic_id)
+        ).all()
+    )
+
+    scraped_at = datetime.utcnow()
+    rows = []
+    updated = 0
+    for post_id, post_data in incoming.items():
+        row = post_row(post_data, topic_id, scraped_at)
+        if post_id in stored:
+            stored_at = stored[post_id]
+            edited_at = row["updated_at"]
+            if not edited_at or (stored_at and as_utc(stored_at) >= edited_at):
+                continue
+            updated += 1
+        rows.append(row)
+
+    upsert_posts(session, rows)
+    return len(rows) - updated, updated
+
+
+def _user_stats(session: Session, usernames: Optional[List[str]]):
+    """Aggregate user statistics over posts, for some or all users."""
+    stmt = (
+        select(
+            Post.username,
+            func.count(Post.id),
+            func.count(case((Post.post_number == 1, 1))),
+            func.min(Post.created_at),
+            func.max(Post.created_at),
+        )
+        .where(Post.username != "")
+        .group_by(Post.username)
+    )
+    if usernames is not None:
+        stmt = stmt.where(Post.username.in_(usernames))
+
+    return [
+        {
+            "username": username,
+            "post_count": post_count,
+            "topic_count": topic_count,
+            "first_seen": first_seen,
+            "last_seen": last_seen,
+        }
+        for username, post_count, topic_count, first_seen, last_seen in (
+            session.execute(stmt)
+        )
+    ]
+
+
+def refresh_users(
+    session: Session, usernames: Optional[Iterable[str]] = None
+) -> int:
+    """Derive user statistics from the stored posts.
+
+    post_count counts a user's posts, topic_count the topics they opened
+    (their post is number 1), and first_seen/last_seen span the posts'
+    creation times. Statistics are recomputed from ``posts``, so storing
+    the same post twice never counts it twice.
+
+    Args:
+        session: Database session (not committed); pending posts are
+            flushed first
+        usernames: Users to refresh, e.g. the authors of a just stored
+            batch (default: rebuild all users, dropping users without
+            posts)
+
+    Returns:
+        Number of users added
+    """
+    session.flush()
+
+    if usernames is None:
+        stats = _user_stats(session, None)
+        known = set(session.scalars(select(User.username)))
+        session.execute(
+            delete(User).where(
+                User.username.not_in(select(Post.username).distinct())
+            )
+        )
+    else:
+        names = sorted({name for name in usernames if name})
+        stats, known = [], set()
+        for start in range(0, len(names), USER_REFRESH_CHUNK_SIZE):
+            chunk = names[start : start + USER_REFRESH_CHUNK_SIZE]
+            stats.extend(_user_stats(session, chunk))
+            known.update(
+                session.scalars(
+                    select(User.username).where(User.username.in_(chunk))
+                )
+            )
+
+    now = datetime.utcnow()
+    for row in stats:
+        row["created_at"] = now
+    _upsert(session, User, "username", stats, USER_STAT_COLUMNS)
+
+    return sum(1 for row in stats if row["username"] not in known)
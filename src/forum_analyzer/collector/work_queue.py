@@ -0,0 +1,397 @@
+"""Lease-based work queue for distributed collection.
+
+Collection work is split into category-page jobs and topic jobs stored in
+the ``work_jobs`` table. Any number of worker processes, on one machine or
+several sharing a database, claim jobs with a conditional UPDATE, so a job
+is only ever leased to one worker at a time. A lease expires unless its
+worker renews it; jobs held by a crashed worker therefore become claimable
+again, and a job that keeps failing is parked as ``failed``.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, case, delete, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .models import WorkJob
+
+logger = logging.getLogger(__name__)
+
+JOB_PAGE = "category_page"
+JOB_TOPIC = "topic"
+
+# Claims lost to another worker are retried this many times before the
+# caller is told there is nothing to do
+CLAIM_RETRIES = 5
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    """A job leased to the calling worker."""
+
+    id: int
+    kind: str
+    category_id: int
+    page: Optional[int]
+    topic_id: Optional[int]
+    attempts: int
+
+
+def job_key(
+    kind: str,
+    category_id: int,
+    page: Optional[int] = None,
+    topic_id: Optional[int] = None,
+) -> str:
+    """Unique key of a job, used to make enqueueing idempotent."""
+    if kind == JOB_PAGE:
+        return f"page:{category_id}:{page}"
+    return f"topic:{topic_id}"
+
+
+class WorkQueue:
+    """Enqueue, claim and settle collection jobs."""
+
+    def __init__(
+        self,
+        session: Session,
+        lease_seconds: int = 300,
+        max_attempts: int = 5,
+        forum: Optional[str] = None,
+    ):
+        """Initialize the queue.
+
+        Args:
+            session: Database session
+            lease_seconds: How long a claim stays valid without renewal
+            max_attempts: Claims after which a failing job is parked
+            forum: Only enqueue and claim jobs of this forum
+        """
+        self.session = session
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.forum = forum
+
+    def _in_forum(self):
+        if self.forum is None:
+            return WorkJob.forum.is_(None)
+        return WorkJob.forum == self.forum
+
+    def _claimable(self, now: datetime):
+        return and_(
+            self._in_forum(),
+            WorkJob.attempts < self.max_attempts,
+            or_(
+                WorkJob.status == "pending",
+                and_(
+                    WorkJob.status == "leased",
+                    WorkJob.lease_expires_at < now,
+                ),
+            ),
+        )
+
+    def _enqueue(self, jobs: List[Dict]) -> int:
+        keys = [job["job_key"] for job in jobs]
+        existing = set(
+            self.session.scalars(
+                select(WorkJob.job_key).where(WorkJob.job_key.in_(keys))
+            )
+        )
+        new = [job for job in jobs if job["job_key"] not in existing]
+        if not new:
+            return 0
+
+        try:
+            self.session.add_all(
+                WorkJob(forum=self.forum, **job) for job in new
+            )
+            self.session.commit()
+            return len(new)
+        except IntegrityError:
+            # Another worker enqueued some of them first; add one by one
+            self.session.rollback()
+
+        added = 0
+        for job in new:
+            try:
+                self.session.add(WorkJob(forum=self.forum, **job))
+                self.session.commit()
+                added += 1
+            except IntegrityError:
+                self.session.rollback()
+        return added
+
+    def enqueue_page(self, category_id: int, page: int) -> bool:
+        """Add a category-page job unless it already exists.
+
+        Args:
+            category_id: Category ID
+            page: Page number
+
+        Returns:
+            True if the job was added
+        """
+        return bool(
+            self._enqueue(
+                [
+                    {
+                        "job_key": job_key(JOB_PAGE, category_id, page=page),
+                        "kind": JOB_PAGE,
+                        "category_id": category_id,
+                        "page": page,
+                    }
+                ]
+            )
+        )
+
+    def enqueue_topics(
+        self, category_id: int, topic_ids: Iterable[int]
+    ) -> int:
+        """Add topic jobs that don't exist yet.
+
+        Args:
+            category_id: Category ID the topics belong to
+            topic_ids: Topic IDs
+
+        Returns:
+            Number of jobs added
+        """
+        jobs = [
+            {
+                "job_key": job_key(JOB_TOPIC, category_id, topic_id=topic_id),
+                "kind": JOB_TOPIC,
+                "category_id": category_id,
+                "topic_id": topic_id,
+            }
+            for topic_id in dict.fromkeys(topic_ids)
+        ]
+        return self._enqueue(jobs) if jobs else 0
+
+    def claim(self, owner: str) -> Optional[ClaimedJob]:
+        """Lease the next available job to a worker.
+
+        Topic jobs come before page jobs so the queue drains instead of
+        the listing racing ahead. Jobs whose lease expired count as
+        available; the claim itself is a conditional UPDATE, so two
+        workers can never hold the same job.
+
+        Args:
+            owner: Worker identity recorded on the lease
+
+        Returns:
+            The claimed job, or None if nothing is available
+        """
+        now = datetime.utcnow()
+        self._park_abandoned(now)
+
+        for _ in range(CLAIM_RETRIES):
+            job_id = self.session.scalar(
+                select(WorkJob.id)
+                .where(self._claimable(now))
+                .order_by(
+                    case((WorkJob.kind == JOB_TOPIC, 0), else_=1), WorkJob.id
+                )
+                .limit(1)
+            )
+            if job_id is None:
+                return None
+
+            result = self.session.execute(
+                update(WorkJob)
+                .where(WorkJob.id == job_id, self._claimable(now))
+                .values(
+                    status="leased",
+                    lease_owner=owner,
+                    lease_expires_at=now + self.lease,
+                    attempts=WorkJob.attempts + 1,
+                    updated_at=now,
+                )
+            )
+            self.session.commit()
+            if result.rowcount == 1:
+                job = self.session.get(WorkJob, job_id)
+                return ClaimedJob(
+                    id=job.id,
+                    kind=job.kind,
+                    category_id=job.category_id,
+                    page=job.page,
+                    topic_id=job.topic_id,
+                    attempts=job.attempts,
+                )
+            logger.debug(f"Job {job_id} was claimed by another worker")
+
+        return None
+
+    def _park_abandoned(self, now: datetime) -> None:
+        """Fail expired leases that have no attempts left."""
+        result = self.session.execute(
+            update(WorkJob)
+            .where(
+                self._in_forum(),
+                WorkJob.status == "leased",
+                WorkJob.lease_expires_at < now,
+                WorkJob.attempts >= self.max_attempts,
+            )
+            .values(
+                status="failed",
+                last_error="Lease expired on final attempt",
+                updated_at=now,
+            )
+        )
+        self.session.commit()
+        if result.rowcount:
+            logger.warning(f"Parked {result.rowcount} abandoned job(s)")
+
+    def renew(self, job_ids: Iterable[int], owner: str) -> int:
+        """Extend the leases a worker still holds.
+
+        Args:
+            job_ids: IDs of the jobs being worked on
+            owner: Worker identity the leases were granted to
+
+        Returns:
+            Number of leases renewed; fewer than requested means a lease
+            had already expired and was taken over
+        """
+        job_ids = list(job_ids)
+        if not job_ids:
+            return 0
+
+        now = datetime.utcnow()
+        result = self.session.execute(
+            update(WorkJob)
+            .where(
+                WorkJob.id.in_(job_ids),
+                WorkJob.status == "leased",
+                WorkJob.lease_owner == owner,
+            )
+            .values(lease_expires_at=now + self.lease, updated_at=now)
+        )
+        self.session.commit()
+        return result.rowcount
+
+    def complete(self, job_id: int, owner: str) -> bool:
+        """Mark a leased job as done.
+
+        Args:
+            job_id: Job ID
+            owner: Worker identity the lease was granted to
+
+        Returns:
+            False if the lease had been lost to another worker
+        """
+        return self._settle(job_id, owner, status="done", last_error=None)
+
+    def fail(self, job_id: int, owner: str, error: str) -> bool:
+        """Release a leased job after an error.
+
+        The job becomes pending again, or failed once it has used up its
+        attempts.
+
+        Args:
+            job_id: Job ID
+            owner: Worker identity the lease was granted to
+            error: Error message to record
+
+        Returns:
+            False if the lease had been lost to another worker
+        """
+        status = case(
+            (WorkJob.attempts >= self.max_attempts, "failed"),
+            else_="pending",
+        )
+        return self._settle(job_id, owner, status=status, last_error=error)
+
+    def release(self, job_id: int, owner: str) -> bool:
+        """Hand a leased job back untouched, e.g. when a worker stops.
+
+        The attempt taken by the claim is returned as well.
+
+        Args:
+            job_id: Job ID
+            owner: Worker identity the lease was granted to
+
+        Returns:
+            False if the lease had been lost to another worker
+        """
+        return self._settle(
+            job_id,
+            owner,
+            status="pending",
+            attempts=WorkJob.attempts - 1,
+        )
+
+    def _settle(self, job_id: int, owner: str, **values) -> bool:
+        result = self.session.execute(
+            update(WorkJob)
+            .where(
+                WorkJob.id == job_id,
+                WorkJob.status == "leased",
+                WorkJob.lease_owner == owner,
+            )
+            .values(
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=datetime.utcnow(),
+                **values,
+            )
+        )
+        self.session.commit()
+        if result.rowcount != 1:
+            logger.warning(f"Lease on job {job_id} was lost before settling")
+            return False
+        return True
+
+    def outstanding(self) -> int:
+        """Number of jobs that are pending or leased."""
+        return self.session.scalar(
+            select(func.count(WorkJob.id)).where(
+                self._in_forum(), WorkJob.status.in_(("pending", "leased"))
+            )
+        )
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Job counts per kind and status.
+
+        Returns:
+            Mapping of kind to a mapping of status to count
+        """
+        rows = self.session.execute(
+            select(WorkJob.kind, WorkJob.status, func.count(WorkJob.id))
+            .where(self._in_forum())
+            .group_by(WorkJob.kind, WorkJob.status)
+        )
+        counts: Dict[str, Dict[str, int]] = {}
+        for kind, status, count in rows:
+            counts.setdefault(kind, {})[status] = count
+        return counts
+
+    def retry_failed(self) -> int:
+        """Make failed jobs pending again with fresh attempts.
+
+        Returns:
+            Number of jobs re-queued
+        """
+        result = self.session.execute(
+            update(WorkJob)
+            .where(self._in_forum(), WorkJob.status == "failed")
+            .values(status="pending", attempts=0, updated_at=datetime.utcnow())
+        )
+        self.session.commit()
+        return result.rowcount
+
+    def purge_done(self) -> int:
+        """Delete finished jobs so the same work can be seeded again.
+
+        Returns:
+            Number of jobs deleted
+        """
+        result = self.session.execute(
+            delete(WorkJob).where(self._in_forum(), WorkJob.status == "done")
+        )
+        self.session.commit()
+        return result.rowcount
@@ -0,0 +1,259 @@
+"""Work-queue worker and seeding helpers.
+
+A worker claims jobs from the shared ``work_jobs`` table, runs up to
+``concurrency`` of them at once through a CollectionOrchestrator and keeps
+their leases alive while they run. Start as many workers as the forum's
+rate limit allows, on one machine or on several pointing at the same
+database.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import sessionmaker
+
+from ..config.settings import ForumConfig, Settings, get_settings
+from .api_client import ID_NAMESPACE_SIZE, ForumAPIClient
+from .checkpoint_manager import CheckpointManager
+from .database import create_db_engine
+from .models import migrate_schema
+from .orchestrator import CollectionOrchestrator
+from .work_queue import WorkQueue
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+    """Worker identity recorded on leases: host name and process ID."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def find_forum(
+    settings: Settings, name: Optional[str]
+) -> Optional[ForumConfig]:
+    """Look up a configured forum by name.
+
+    Args:
+        settings: Settings instance
+        name: Forum name, or None for the top-level forum
+
+    Returns:
+        Forum configuration, or None for the top-level forum
+
+    Raises:
+        ValueError: If no forum has that name
+    """
+    if name is None:
+        return None
+    for forum in settings.forums:
+        if forum.name == name:
+            return forum
+    raise ValueError(f"No forum named '{name}' in config.yaml")
+
+
+def make_queue(
+    db_session, settings: Settings, forum: Optional[ForumConfig] = None
+) -> WorkQueue:
+    """Work queue configured from the scraping settings."""
+    return WorkQueue(
+        db_session,
+        lease_seconds=settings.scraping.lease_seconds,
+        max_attempts=settings.scraping.max_job_attempts,
+        forum=forum.name if forum else None,
+    )
+
+
+class QueueWorker:
+    """Claims and runs work-queue jobs until the queue is drained."""
+
+    def __init__(
+        self,
+        orchestrator: CollectionOrchestrator,
+        queue: WorkQueue,
+        owner: str,
+        concurrency: int = 1,
+        poll_interval: float = 5.0,
+    ):
+        """Initialize the worker.
+
+        Args:
+            orchestrator: Orchestrator that executes jobs
+            queue: Work queue to claim from
+            owner: Worker identity recorded on leases
+            concurrency: Jobs run at the same time
+            poll_interval: Seconds between checks while waiting for work
+        """
+        self.orchestrator = orchestrator
+        self.queue = queue
+        self.owner = owner
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.stats = {"jobs_done": 0, "jobs_failed": 0, "leases_lost": 0}
+
+    async def run(self, exit_when_idle: bool = True) -> Dict[str, int]:
+        """Process jobs until the queue is drained or the task is cancelled.
+
+        Args:
+            exit_when_idle: Return once no job is pending or leased by any
+                worker; otherwise keep polling for new work
+
+        Returns:
+            Dictionary with job statistics
+        """
+        running: Dict[asyncio.Task, int] = {}
+        heartbeat = asyncio.create_task(self._heartbeat(running))
+
+        try:
+            while True:
+                while len(running) < self.concurrency:
+                    job = self.queue.claim(self.owner)
+                    if job is None:
+                        break
+                    task = asyncio.create_task(
+                        self.orchestrator.run_job(job, self.queue)
+                    )
+                    running[task] = job.id
+
+                if not running:
+                    # Other workers' jobs may still add work or expire
+                    if exit_when_idle and not self.queue.outstanding():
+                        return self.stats
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=self.poll_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    self._settle(running.pop(task), task)
+        finally:
+            heartbeat.cancel()
+            for task in running:
+                task.cancel()
+            await asyncio.gather(heartbeat, *running, return_exceptions=True)
+            for job_id in running.values():
+                self.queue.release(job_id, self.owner)
+
+    def _settle(self, job_id: int, task: asyncio.Task) -> None:
+        error = task.exception()
+        if error is None:
+            settled = self.queue.complete(job_id, self.owner)
+            self.stats["jobs_done"] += 1
+        else:
+            logger.error(f"Job {job_id} failed: {error}")
+            settled = self.queue.fail(job_id, self.owner, str(error))
+            self.stats["jobs_failed"] += 1
+        if not settled:
+            self.stats["leases_lost"] += 1
+
+    async def _heartbeat(self, running: Dict[asyncio.Task, int]) -> None:
+        """Renew the leases of running jobs at a third of the lease."""
+        interval = self.queue.lease.total_seconds() / 3
+        while True:
+            await asyncio.sleep(interval)
+            job_ids = list(running.values())
+            renewed = self.queue.renew(job_ids, self.owner)
+            if renewed < len(job_ids):
+                logger.warning(
+                    f"{len(job_ids) - renewed} lease(s) expired before "
+                    "renewal; another worker may redo those jobs"
+                )
+
+
+def seed_queue(
+    category_ids: Optional[List[int]] = None,
+    settings: Optional[Settings] = None,
+    forum_name: Optional[str] = None,
+) -> int:
+    """Add a first-page job for each category.
+
+    Later pages and topics are enqueued by the workers as they go.
+
+    Args:
+        category_ids: Forum-local category IDs (default: all configured)
+        settings: Optional Settings instance (will load from config if not
+            provided)
+        forum_name: Seed a configured forum instead of the top-level one
+
+    Returns:
+        Number of jobs added
+    """
+    if settings is None:
+        settings = get_settings()
+    forum = find_forum(settings, forum_name)
+
+    if category_ids is None:
+        categories = forum.categories if forum else settings.categories
+        category_ids = [category.id for category in categories]
+    offset = forum.id_namespace * ID_NAMESPACE_SIZE if forum else 0
+
+    engine = create_db_engine(settings.database)
+    migrate_schema(engine)
+    with sessionmaker(bind=engine)() as db_session:
+        queue = make_queue(db_session, settings, forum)
+        return sum(
+            queue.enqueue_page(offset + category_id, 0)
+            for category_id in category_ids
+        )
+
+
+async def run_worker(
+    settings: Optional[Settings] = None,
+    forum_name: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    exit_when_idle: bool = True,
+    worker_id: Optional[str] = None,
+) -> Dict[str, int]:
+    """Run one work-queue worker.
+
+    Args:
+        settings: Optional Settings instance (will load from config if not
+            provided)
+        forum_name: Work on a configured forum instead of the top-level one
+        concurrency: Jobs run at once (default: scraping.max_concurrency)
+        exit_when_idle: Return once the queue is drained
+        worker_id: Identity recorded on leases (default: host:pid)
+
+    Returns:
+        Dictionary with job and collection statistics
+    """
+    if settings is None:
+        settings = get_settings()
+    forum = find_forum(settings, forum_name)
+
+    engine = create_db_engine(settings.database)
+    migrate_schema(engine)
+    db_session = sessionmaker(bind=engine)()
+    checkpoint_dir = Path(settings.scraping.checkpoint_dir)
+
+    try:
+        async with ForumAPIClient.from_settings(
+            forum.api if forum else settings.api,
+            state_dir=checkpoint_dir,
+            forum=forum,
+        ) as api_client:
+            orchestrator = CollectionOrchestrator(
+                api_client=api_client,
+                db_session=db_session,
+                checkpoint_mgr=CheckpointManager(
+                    session=db_session, checkpoint_dir=checkpoint_dir
+                ),
+                settings=settings,
+                forum=forum.name if forum else None,
+            )
+            worker = QueueWorker(
+                orchestrator,
+                make_queue(db_session, settings, forum),
+                owner=worker_id or default_worker_id(),
+                concurrency=concurrency or settings.scraping.max_concurrency,
+            )
+            stats = await worker.run(exit_when_idle=exit_when_idle)
+            return {**stats, **orchestrator.stats}
+    finally:
+        db_session.close()
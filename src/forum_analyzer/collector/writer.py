@@ -0,0 +1,220 @@
+"""Storage side of a full category collection.
+
+TopicSink stores fetched topics and keeps the category checkpoint in
+step with what it stored: a checkpoint is saved in the transaction of a
+group commit and counts only the topics written by then. The sink runs
+either inline on the event loop or, wrapped in a DatabaseWriter, on a
+dedicated thread fed through a bounded queue: fetch coroutines then only
+hand payloads over, and all SQLAlchemy work for the collection happens
+on that one thread, which keeps SQLite to a single writer while fetching
+carries on.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Topics stored between two "every N topics" checkpoints
+CHECKPOINT_EVERY = 10
+
+
+class TopicSink:
+    """Stores one category's topics in order and checkpoints progress."""
+
+    def __init__(
+        self,
+        orchestrator,
+        category_id: int,
+        processed_count: int = 0,
+        on_stored: Optional[Callable[[], None]] = None,
+    ):
+        """Initialize the sink.
+
+        Args:
+            orchestrator: CollectionOrchestrator whose session and
+                checkpoint manager the sink writes through
+            category_id: Category being collected
+            processed_count: Topics counted by the checkpoint resumed from
+            on_stored: Called after each stored topic
+        """
+        self.orchestrator = orchestrator
+        self.category_id = category_id
+        self.processed_count = processed_count
+        self.on_stored = on_stored
+        self._since_checkpoint = 0
+
+    def _checkpoint(self, page: int, **fields: Any) -> None:
+        """Save a checkpoint with the next group commit."""
+        orchestrator = self.orchestrator
+        orchestrator._checkpoint_with_group(
+            lambda: orchestrator.checkpoint_mgr.save_checkpoint(
+                category_id=self.category_id,
+                checkpoint_type="category_page",
+                last_page=page,
+                # Read at commit time, after the group's topics
+                total_processed=self.processed_count,
+                commit=False,
+                **fields,
+            )
+        )
+        self._since_checkpoint = 0
+
+    def _stored(self) -> None:
+        self.processed_count += 1
+        self.orchestrator.stats["topics_processed"] += 1
+        if self.on_stored:
+            self.on_stored()
+
+    async def store_topic(
+        self,
+        topic_id: int,
+        topic_data: Optional[Dict[str, Any]],
+        error: Optional[Exception],
+        page: int,
+    ) -> None:
+        """Queue a fetched topic for storage; a failed fetch is logged.
+
+        Args:
+            topic_id: Topic ID
+            topic_data: Fetched topic, or None if the fetch failed
+            error: Fetch error, if any
+            page: Listing page the topic is on
+        """
+        try:
+            if error is not None:
+                raise error
+            await self.orchestrator._save_topic(
+                topic_data, self.category_id, on_saved=self._stored
+            )
+        except Exception as e:
+            logger.error(
+                f"Error processing topic {topic_id}: {e}", exc_info=True
+            )
+            return
+
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= CHECKPOINT_EVERY:
+            self._checkpoint(page, status="in_progress")
+
+    async def page_done(self, page: int) -> None:
+        """Checkpoint the end of a listing page.
+
+        Args:
+            page: Page whose topics were all handed to the sink
+        """
+        self._checkpoint(page, status="in_progress")
+
+    async def finish(self) -> None:
+        """Commit whatever is still pending."""
+        await self.orchestrator._commit_pending()
+
+    async def page_failed(self, page: int, error: Exception) -> None:
+        """Save an error checkpoint, committing stored topics with it.
+
+        Args:
+            page: Page that could not be processed
+            error: What went wrong
+        """
+        self._checkpoint(page, status="error", error_message=str(error))
+        await self.orchestrator._commit_pending()
+
+
+class DatabaseWriter:
+    """Runs a sink's calls on a dedicated thread, in submission order.
+
+    At most ``queue_size`` calls wait at a time; submitting more waits
+    for the writer to catch up, which throttles fetching to the speed of
+    the database.
+    """
+
+    def __init__(self, sink: TopicSink, queue_size: int):
+        """Initialize the writer (not started).
+
+        Args:
+            sink: Sink bound to a session used by no other thread
+            queue_size: Calls that may wait for the writer
+        """
+        self.sink = sink
+        self.error: Optional[BaseException] = None
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._slots = asyncio.Semaphore(queue_size)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._discard = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="collection-writer", daemon=True
+        )
+
+    def start(self) -> None:
+        """Start the writer thread; call from the event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._thread.start()
+
+    async def submit(self, method: str, *args: Any) -> None:
+        """Queue a sink call, waiting while the queue is full.
+
+        Args:
+            method: TopicSink method name
+            *args: Its arguments
+
+        Raises:
+            RuntimeError: If the writer has stopped on an error
+        """
+        await self._slots.acquire()
+        if self.error is not None:
+            self._slots.release()
+            raise RuntimeError(f"Database writer failed: {self.error}")
+        self._queue.put((method, args))
+
+    async def close(self, discard: bool = False) -> None:
+        """Stop the writer once the queue is drained.
+
+        Args:
+            discard: Drop queued calls and roll back uncommitted work, as
+                a crash would (e.g. when the collection is cancelled)
+
+        Raises:
+            RuntimeError: If the writer stopped on an error
+        """
+        if discard:
+            self._discard.set()
+        self._queue.put(None)
+
+        if discard:
+            # Only the call in progress is left to wait for
+            self._thread.join()
+        else:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._thread.join
+            )
+
+        if self.error is not None and not discard:
+            raise RuntimeError(f"Database writer failed: {self.error}")
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        session = self.sink.orchestrator.db_session
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                method, args = item
+                try:
+                    if not self._discard.is_set() and self.error is None:
+                        loop.run_until_complete(
+                            getattr(self.sink, method)(*args)
+                        )
+                except Exception as e:
+                    logger.error(f"Database writer failed: {e}", exc_info=True)
+                    self.error = e
+                finally:
+                    self._loop.call_soon_threadsafe(self._slots.release)
+        finally:
+            if self._discard.is_set() or self.error is not None:
+                session.rollback()
+            session.close()
+            loop.close()
@@ -2,10 +2,10 @@
 
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 import yaml
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -13,10 +13,26 @@ class APISettings(BaseSettings):
     """API configuration."""
 
     base_url: str
-    rate_limit: float = 1.0
+    rate_limit: float = Field(default=1.0, gt=0)
+    burst: int = Field(default=1, ge=1)
     timeout: float = 30.0
-    max_retries: int = 3
+    max_retries: int = Field(default=3, ge=0)
     category_path: str
+    adaptive_rate: bool = False
+    min_rate: float = Field(default=0.2, gt=0)
+    max_rate: float = Field(default=4.0, gt=0)
+    rate_increase: float = Field(default=0.1, gt=0)
+    rate_decrease: float = Field(default=0.5, gt=0, lt=1)
+    rate_increase_after: int = Field(default=10, ge=1)
+    max_connections: int = Field(default=10, ge=1)
+    max_keepalive_connections: int = Field(default=10, ge=0)
+    keepalive_expiry: float = Field(default=30.0, ge=0)
+    http2: bool = False
+    accept_encoding: str = "gzip, deflate"
+    cache_path: Optional[str] = None
+    archive_dir: Optional[str] = None
+    archive_segment_mb: int = Field(default=256, ge=1)
+    streaming_decode: bool = False
 
 
 class DatabaseSettings(BaseSettings):
@@ -24,6 +40,21 @@ class DatabaseSettings(BaseSettings):
 
     url: str = "sqlite:///data/database/forum.db"
     echo: bool = False
+    # SQLite performance profile, applied to every connection
+    journal_mode: Literal[
+        "wal", "delete", "truncate", "persist", "memory", "off"
+    ] = "wal"
+    synchronous: Literal["off", "normal", "full", "extra"] = "normal"
+    mmap_size_mb: int = Field(default=256, ge=0)
+    cache_size_mb: int = Field(default=64, ge=0)
+    temp_store: Literal["default", "file", "memory"] = "memory"
+    busy_timeout_ms: int = Field(default=5000, ge=0)
+    # Reporting commands open SQLite read-only; immutable also skips
+    # locking, so only set it for a snapshot no process writes to
+    immutable: bool = False
+    # zstd-compress new post bodies (SQLite only; see `db compress`)
+    compress_bodies: bool = False
+    compression_level: int = Field(default=3, ge=1, le=22)
 
 
 class ScrapingSettings(BaseSettings):
@@ -32,6 +63,18 @@ class ScrapingSettings(BaseSettings):
     batch_size: int = 100
     checkpoint_interval: int = 10
     checkpoint_dir: str = "data/checkpoints"
+    max_concurrency: int = Field(default=1, ge=1)
+    prefetch_pages: int = Field(default=0, ge=0)
+    posts_batch_size: int = Field(default=20, ge=1)
+    lease_seconds: int = Field(default=300, ge=10)
+    max_job_attempts: int = Field(default=5, ge=1)
+    # Group commit: topics per transaction, and the longest a fetched
+    # topic may wait in memory for its commit while more topics arrive
+    commit_batch_size: int = Field(default=1, ge=1)
+    commit_interval_ms: float = Field(default=1000.0, ge=0)
+    # Topics buffered for a dedicated database writer thread during full
+    # collection; 0 stores on the event loop
+    write_queue_size: int = Field(default=0, ge=0)
 
 
 class CategoryConfig(BaseSettings):
@@ -42,6 +85,17 @@ class CategoryConfig(BaseSettings):
     slug: Optional[str] = None
 
 
+class ForumConfig(BaseSettings):
+    """One forum of a multi-forum configuration."""
+
+    name: str
+    # Stored IDs are offset by id_namespace * 10**12 so that topic, post and
+    # category IDs of different forums can share one database
+    id_namespace: int = Field(ge=0)
+    api: APISettings
+    categories: List[CategoryConfig] = Field(default_factory=list)
+
+
 class LoggingSettings(BaseSettings):
     """Logging configuration."""
 
@@ -77,11 +131,38 @@ class Settings(BaseSettings):
     database: DatabaseSettings = Field(default_factory=DatabaseSettings)
     scraping: ScrapingSettings = Field(default_factory=ScrapingSettings)
     categories: List[CategoryConfig] = Field(default_factory=list)
+    forums: List[ForumConfig] = Field(default_factory=list)
     logging: LoggingSettings = Field(default_factory=LoggingSettings)
     llm_analysis: LLMAnalysisSettings = Field(
         default_factory=LLMAnalysisSettings
     )
 
+    @model_validator(mode="after")
+    def check_forums_unique(self) -> "Settings":
+        """Forum names and ID namespaces must not be reused."""
+        names = [forum.name for forum in self.forums]
+        if len(set(names)) != len(names):
+            raise ValueError("forums: names must be unique")
+        namespaces = [forum.id_namespace for forum in self.forums]
+        if len(set(namespaces)) != len(namespaces):
+            raise ValueError("forums: id_namespace values must be unique")
+        return self
+
+    @staticmethod
+    def _forum_api(api_data: dict, forum: dict) -> APISettings:
+        """Build a forum's API settings on top of the top-level ones.
+
+        An inherited archive directory gets a per-forum subdirectory, since
+        two clients must never append to the same archive.
+        """
+        forum_api = forum.get("api", {})
+        merged = {**api_data, **forum_api}
+        if "archive_dir" not in forum_api and merged.get("archive_dir"):
+            merged["archive_dir"] = str(
+                Path(merged["archive_dir"]) / forum["name"]
+            )
+        return APISettings(**merged)
+
     @classmethod
     def from_yaml(cls, config_path: Path) -> "Settings":
         """Load settings from YAML file.
@@ -95,14 +176,28 @@ class Settings(BaseSettings):
         with open(config_path, "r") as f:
             config_data = yaml.safe_load(f)
 
+        api_data = config_data.get("api", {})
+
         return cls(
-            api=APISettings(**config_data.get("api", {})),
+            api=APISettings(**api_data),
             database=DatabaseSettings(**config_data.get("database", {})),
             scraping=ScrapingSettings(**config_data.get("scraping", {})),
             categories=[
                 CategoryConfig(**cat)
                 for cat in config_data.get("categories", [])
             ],
+            forums=[
+                ForumConfig(
+                    name=forum["name"],
+                    id_namespace=forum["id_namespace"],
+                    api=cls._forum_api(api_data, forum),
+                    categories=[
+                        CategoryConfig(**cat)
+                        for cat in forum.get("categories", [])
+                    ],
+                )
+                for forum in config_data.get("forums", [])
+            ],
             logging=LoggingSettings(**config_data.get("logging", {})),
             llm_analysis=LLMAnalysisSettings(
                 **config_data.get("llm_analysis", {})
@@ -196,6 +291,13 @@ def get_settings(project_dir: Optional[Path] = None) -> Settings:
                 project_dir / _settings.scraping.checkpoint_dir
             )
 
+        # HTTP validator cache and raw response archive
+        for api in [_settings.api] + [f.api for f in _settings.forums]:
+            if api.cache_path and not Path(api.cache_path).is_absolute():
+                api.cache_path = str(project_dir / api.cache_path)
+            if api.archive_dir and not Path(api.archive_dir).is_absolute():
+                api.archive_dir = str(project_dir / api.archive_dir)
+
         # Logging file
         if not Path(_settings.logging.file).is_absolute():
             _settings.logging.file = str(project_dir / _settings.logging.file)
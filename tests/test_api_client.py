@@ -1,22 +1,46 @@
 """Tests for API client."""
 
+import asyncio
+import json
+import time
+
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
+
+import httpx
 
+from forum_analyzer.collector.http_cache import ValidatorCache
+from forum_analyzer.config.settings import APISettings
 from forum_analyzer.collector.api_client import (
+    ID_NAMESPACE_SIZE,
+    MAX_RETRY_AFTER,
+    AdaptiveRateController,
+    FairShareLimiter,
     ForumAPIClient,
+    STATE_SUBDIR,
     RateLimiter,
+    decode_json,
+    parse_retry_after,
+    supported_encodings,
 )
 
 
+def make_response(status_code, data, headers=None):
+    """Build a real httpx response for a mocked request."""
+    return httpx.Response(
+        status_code,
+        json=data,
+        headers=headers,
+        request=httpx.Request("GET", "https://forum.test/"),
+    )
+
+
 class TestRateLimiter:
     """Test rate limiter."""
 
     @pytest.mark.asyncio
     async def test_rate_limiting(self):
         """Test that rate limiter delays requests."""
-        import time
-
         limiter = RateLimiter(rate=10.0)  # 10 requests per second
 
         start = time.time()
@@ -27,6 +51,38 @@ class TestRateLimiter:
         # Should take at least 0.2 seconds (2 intervals at 0.1s each)
         assert elapsed >= 0.2
 
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_rate(self):
+        """Test that concurrent callers cannot pass at once."""
+        limiter = RateLimiter(rate=20.0)
+
+        start = time.time()
+        await asyncio.gather(*(limiter.acquire() for _ in range(5)))
+        elapsed = time.time() - start
+
+        # 4 intervals at 0.05s each after the first token
+        assert elapsed >= 0.2
+
+    @pytest.mark.asyncio
+    async def test_burst_capacity(self):
+        """Test that a full bucket allows a burst without waiting."""
+        limiter = RateLimiter(rate=1.0, burst=3)
+
+        waits = [await limiter.acquire() for _ in range(3)]
+
+        assert max(waits) < 0.05
+
+    @pytest.mark.asyncio
+    async def test_reports_wait_time(self):
+        """Test that time spent waiting is returned and accumulated."""
+        limiter = RateLimiter(rate=10.0)
+
+        await limiter.acquire()
+        waited = await limiter.acquire()
+
+        assert waited >= 0.09
+        assert limiter.total_wait >= waited
+
 
 class TestForumAPIClient:
     """Test forum API client."""
@@ -34,22 +90,26 @@ class TestForumAPIClient:
     @pytest.mark.asyncio
     async def test_client_context_manager(self):
         """Test client context manager."""
-        async with ForumAPIClient() as client:
+        async with ForumAPIClient(
+            base_url="https://forum.test", category_path="c"
+        ) as client:
             assert client.client is not None
 
     @pytest.mark.asyncio
     async def test_fetch_category_page(self):
         """Test fetching category page."""
         with patch("httpx.AsyncClient.request") as mock_request:
-            mock_request.return_value = AsyncMock(
-                json=lambda: {
+            mock_request.return_value = make_response(
+                200,
+                {
                     "topic_list": {"topics": []},
                     "category": {"name": "Test"},
-                }
+                },
             )
-            mock_request.return_value.raise_for_status = AsyncMock()
 
-            async with ForumAPIClient() as client:
+            async with ForumAPIClient(
+                base_url="https://forum.test", category_path="c"
+            ) as client:
                 data = await client.fetch_category_page(18, page=0)
                 assert "topic_list" in data
                 assert "category" in data
@@ -58,15 +118,327 @@ class TestForumAPIClient:
     async def test_fetch_topic(self):
         """Test fetching topic."""
         with patch("httpx.AsyncClient.request") as mock_request:
-            mock_request.return_value = AsyncMock(
-                json=lambda: {
+            mock_request.return_value = make_response(
+                200,
+                {
                     "title": "Test Topic",
                     "post_stream": {"posts": []},
-                }
+                },
             )
-            mock_request.return_value.raise_for_status = AsyncMock()
 
-            async with ForumAPIClient() as client:
+            async with ForumAPIClient(
+                base_url="https://forum.test", category_path="c"
+            ) as client:
                 data = await client.fetch_topic(66)
                 assert "title" in data
                 assert "post_stream" in data
+
+    @pytest.mark.asyncio
+    async def test_retries_honour_max_retries(self):
+        """Test that throttled requests retry max_retries times."""
+        with patch("httpx.AsyncClient.request") as mock_request:
+            mock_request.return_value = make_response(
+                503, {}, headers={"Retry-After": "0"}
+            )
+
+            async with ForumAPIClient(
+                base_url="https://forum.test",
+                category_path="c",
+                rate_limit=100.0,
+                max_retries=2,
+            ) as client:
+                with pytest.raises(httpx.HTTPStatusError):
+                    await client.fetch_topic(66)
+
+            assert mock_request.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        """Test that a 404 fails immediately."""
+        with patch("httpx.AsyncClient.request") as mock_request:
+            mock_request.return_value = make_response(404, {})
+
+            async with ForumAPIClient(
+                base_url="https://forum.test", category_path="c"
+            ) as client:
+                with pytest.raises(httpx.HTTPStatusError):
+                    await client.fetch_topic(66)
+
+            assert mock_request.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_throttle_backs_off_adaptive_rate(self):
+        """Test that a 429 lowers the endpoint rate before retrying."""
+        controller = AdaptiveRateController(
+            initial_rate=50.0, min_rate=1.0, max_rate=100.0
+        )
+        with patch("httpx.AsyncClient.request") as mock_request:
+            mock_request.side_effect = [
+                make_response(429, {}, headers={"Retry-After": "0"}),
+                make_response(200, {"title": "Test Topic"}),
+            ]
+
+            async with ForumAPIClient(
+                base_url="https://forum.test",
+                category_path="c",
+                rate_limit=100.0,
+                rate_controller=controller,
+            ) as client:
+                data = await client.fetch_topic(66)
+
+        assert data["title"] == "Test Topic"
+        assert controller.limiter("topic").rate == 25.0
+        assert controller.limiter("category").rate == 50.0
+
+    @pytest.mark.asyncio
+    async def test_not_modified_served_from_cache(self, tmp_path):
+        """Test that a 304 is answered from the validator cache."""
+        cache = ValidatorCache(tmp_path / "http_cache.db")
+        with patch("httpx.AsyncClient.request") as mock_request:
+            mock_request.side_effect = [
+                make_response(
+                    200, {"title": "Cached"}, headers={"ETag": 'W/"abc"'}
+                ),
+                httpx.Response(
+                    304, request=httpx.Request("GET", "https://forum.test/")
+                ),
+            ]
+
+            async with ForumAPIClient(
+                base_url="https://forum.test",
+                category_path="c",
+                rate_limit=100.0,
+                cache=cache,
+            ) as client:
+                first = await client.fetch_topic(66)
+                second = await client.fetch_topic(66)
+
+            conditional = mock_request.call_args_list[1].kwargs["headers"]
+
+        assert first == second == {"title": "Cached"}
+        assert conditional["If-None-Match"] == 'W/"abc"'
+        assert cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_fetch_posts_requests_ids(self):
+        """Test that fetch_posts asks for exactly the given post IDs."""
+        with patch("httpx.AsyncClient.request") as mock_request:
+            mock_request.return_value = make_response(
+                200, {"post_stream": {"posts": [{"id": 7}, {"id": 9}]}}
+            )
+            async with ForumAPIClient(
+                base_url="https://forum.test", category_path="c"
+            ) as client:
+                posts = await client.fetch_posts(5, [7, 9])
+
+        assert posts == [{"id": 7}, {"id": 9}]
+        args, kwargs = mock_request.call_args
+        assert args[1] == "/t/5/posts.json"
+        assert kwargs["params"] == {"post_ids[]": [7, 9]}
+
+    @pytest.mark.asyncio
+    async def test_iter_posts_streams_items(self):
+        """Test that streamed post batches are decoded item by item."""
+        pytest.importorskip("ijson")
+        posts = [{"id": n, "cooked": "x" * 1000} for n in range(50)]
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) == 1:
+                return httpx.Response(503, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"post_stream": {"posts": posts}})
+
+        async with ForumAPIClient(
+            base_url="https://forum.test",
+            category_path="c",
+            rate_limit=100.0,
+            streaming_decode=True,
+        ) as client:
+            await client.client.aclose()
+            client.client = httpx.AsyncClient(
+                base_url="https://forum.test",
+                transport=httpx.MockTransport(handler),
+            )
+            streamed = [
+                post async for post in client.iter_posts(5, list(range(50)))
+            ]
+
+        assert streamed == posts
+        assert len(attempts) == 2
+        assert attempts[1].url.params.get_list("post_ids[]")[:2] == [
+            "0",
+            "1",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_forum_namespace(self):
+        """Test that a namespaced client maps IDs both ways."""
+        offset = 2 * ID_NAMESPACE_SIZE
+        with patch("httpx.AsyncClient.request") as mock_request:
+            mock_request.return_value = make_response(
+                200,
+                {
+                    "id": 66,
+                    "category_id": 18,
+                    "post_stream": {
+                        "posts": [{"id": 7, "topic_id": 66}],
+                        "stream": [7, 8],
+                    },
+                },
+            )
+
+            async with ForumAPIClient(
+                base_url="https://forum.test",
+                category_path="c",
+                forum="community",
+                id_namespace=2,
+            ) as client:
+                data = await client.fetch_topic(offset + 66)
+
+            assert mock_request.call_args.args[1].endswith("/t/66.json")
+            assert data["id"] == offset + 66
+            assert data["category_id"] == offset + 18
+            assert data["post_stream"]["posts"][0]["id"] == offset + 7
+            assert data["post_stream"]["stream"] == [offset + 7, offset + 8]
+
+
+class TestFairShareLimiter:
+    """Test the host-level rate budget shared between clients."""
+
+    @pytest.mark.asyncio
+    async def test_waiting_shares_alternate(self):
+        """Test that a busy share cannot starve a quieter one."""
+        limiter = FairShareLimiter(rate=200.0)
+        busy, quiet = limiter.share("busy"), limiter.share("quiet")
+        granted = []
+
+        async def request(share):
+            await share.acquire()
+            granted.append(share.name)
+
+        await asyncio.gather(
+            *(request(busy) for _ in range(6)),
+            *(request(quiet) for _ in range(2)),
+        )
+
+        assert granted[:4] == ["busy", "quiet", "busy", "quiet"]
+        assert granted[4:] == ["busy"] * 4
+
+    @pytest.mark.asyncio
+    async def test_shares_respect_host_rate(self):
+        """Test that all shares together stay within the host rate."""
+        limiter = FairShareLimiter(rate=20.0)
+        shares = [limiter.share(str(n)) for n in range(3)]
+
+        start = time.time()
+        await asyncio.gather(*(share.acquire() for share in shares * 2))
+        elapsed = time.time() - start
+
+        # 5 intervals at 0.05s each after the first token
+        assert elapsed >= 0.25
+
+    @pytest.mark.asyncio
+    async def test_client_view_uses_share(self):
+        """Test that a client view shares the connection pool."""
+        limiter = FairShareLimiter(rate=100.0)
+        async with ForumAPIClient(
+            base_url="https://forum.test", category_path="c"
+        ) as client:
+            view = client.with_rate_limiter(limiter.share("18"))
+
+            assert view.client is client.client
+            assert view.rate_limiter is not client.rate_limiter
+
+
+class TestAdaptiveRateController:
+    """Test AIMD rate control."""
+
+    def test_additive_increase_after_healthy_streak(self):
+        """Test that the rate climbs only after enough successes."""
+        controller = AdaptiveRateController(
+            initial_rate=1.0,
+            min_rate=0.5,
+            max_rate=1.15,
+            increase=0.1,
+            increase_after=3,
+        )
+
+        for _ in range(2):
+            controller.record_success("topic")
+        assert controller.limiter("topic").rate == 1.0
+
+        controller.record_success("topic")
+        assert controller.limiter("topic").rate == pytest.approx(1.1)
+
+        for _ in range(3):
+            controller.record_success("topic")
+        assert controller.limiter("topic").rate == 1.15
+
+    @pytest.mark.asyncio
+    async def test_settled_rate_persists(self, tmp_path):
+        """Test that the next run starts from the saved rate."""
+        state_path = tmp_path / "rate_state.json"
+        controller = AdaptiveRateController(
+            initial_rate=2.0,
+            min_rate=0.5,
+            max_rate=4.0,
+            state_path=state_path,
+        )
+        controller.record_throttle("category")
+        controller.save()
+
+        restored = AdaptiveRateController(
+            initial_rate=2.0,
+            min_rate=0.5,
+            max_rate=4.0,
+            state_path=state_path,
+        )
+        assert restored.limiter("category").rate == 1.0
+        assert restored.limiter("topic").rate == 2.0
+
+    def test_rate_state_kept_out_of_checkpoints(self, tmp_path):
+        """Test that settled rates are not saved as checkpoint files."""
+        api = APISettings(
+            base_url="https://forum.test",
+            category_path="c",
+            adaptive_rate=True,
+        )
+        # Saved directly in the checkpoint directory by older versions
+        (tmp_path / "rate_state.json").write_text(
+            json.dumps({"category": 1.0})
+        )
+
+        client = ForumAPIClient.from_settings(api, state_dir=tmp_path)
+        client.rate_controller.save()
+
+        assert list(tmp_path.glob("*.json")) == []
+        assert client.rate_controller.state_path == (
+            tmp_path / STATE_SUBDIR / "rate_state.json"
+        )
+        assert client.rate_controller.limiter("category").rate == 1.0
+
+
+def test_parse_retry_after():
+    """Test Retry-After parsing for seconds and dates."""
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("100000") == MAX_RETRY_AFTER
+
+
+def test_supported_encodings_drops_undecodable(monkeypatch):
+    """Test that encodings without a decoder are not advertised."""
+    monkeypatch.setattr(
+        "forum_analyzer.collector.api_client.find_spec", lambda name: None
+    )
+
+    assert supported_encodings("gzip, br, zstd") == "gzip"
+    assert supported_encodings("br") == "identity"
+
+
+def test_decode_json_matches_stdlib():
+    """Test that the optional fast decoder agrees with json.loads."""
+    body = b'{"a": [1, 2.5, "\\u00e9", null, true], "b": {"c": -3}}'
+    assert decode_json(body) == json.loads(body)
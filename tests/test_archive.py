@@ -0,0 +1,124 @@
+"""Tests for the raw response archive."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from forum_analyzer.collector.api_client import (
+    ArchiveMissError,
+    ArchiveReplayClient,
+    ForumAPIClient,
+)
+from forum_analyzer.collector.archive import ResponseArchive
+from forum_analyzer.collector.models import Category, Post, Topic
+from forum_analyzer.collector.orchestrator import reingest_archive
+from forum_analyzer.config.settings import (
+    APISettings,
+    DatabaseSettings,
+    ScrapingSettings,
+    Settings,
+)
+
+from .test_api_client import make_response
+from .test_orchestrator import make_topic
+
+pytest.importorskip("zstandard")
+
+
+class TestResponseArchive:
+    """Test archive storage."""
+
+    def test_round_trip_and_latest(self, tmp_path):
+        """Test that the newest body per URL wins."""
+        archive = ResponseArchive(tmp_path)
+        archive.append("https://f/t/1.json", "topic", b'{"v": 1}')
+        archive.append("https://f/t/2.json", "topic", b'{"v": 2}')
+        archive.append("https://f/t/1.json", "topic", b'{"v": 3}')
+
+        record = archive.lookup("https://f/t/1.json")
+        assert archive.read(record) == b'{"v": 3}'
+        assert [r.url for r in archive.latest_records(["topic"])] == [
+            "https://f/t/2.json",
+            "https://f/t/1.json",
+        ]
+        archive.close()
+
+    def test_segments_roll_over_and_reopen(self, tmp_path):
+        """Test that small segments roll and survive reopening."""
+        archive = ResponseArchive(tmp_path, segment_size=1)
+        for n in range(3):
+            archive.append(f"u{n}", "topic", json.dumps({"n": n}).encode())
+        archive.close()
+
+        assert len(list(tmp_path.glob("segment-*.zst"))) == 3
+
+        archive = ResponseArchive(tmp_path)
+        assert archive.read(archive.lookup("u1")) == b'{"n": 1}'
+        assert archive.lookup("missing") is None
+        archive.close()
+
+
+@pytest.mark.asyncio
+async def test_client_archives_and_replays(tmp_path):
+    """Test that archived responses replay without the network."""
+    with patch("httpx.AsyncClient.request") as mock_request:
+        mock_request.return_value = make_response(200, {"title": "Live"})
+        async with ForumAPIClient(
+            base_url="https://forum.test",
+            category_path="c",
+            rate_limit=100.0,
+            archive=ResponseArchive(tmp_path),
+        ) as client:
+            await client.fetch_category_page(18, page=2)
+
+    replay = ArchiveReplayClient(
+        "https://forum.test", "c", ResponseArchive(tmp_path)
+    )
+    async with replay:
+        assert await replay.fetch_category_page(18, page=2) == {
+            "title": "Live"
+        }
+        with pytest.raises(ArchiveMissError):
+            await replay.fetch_category_page(18, page=3)
+
+
+@pytest.mark.asyncio
+async def test_reingest_rebuilds_database(tmp_path):
+    """Test that re-ingest stores categories, topics and posts."""
+    archive = ResponseArchive(tmp_path / "archive")
+    archive.append(
+        "https://forum.test/c/18.json",
+        "category",
+        json.dumps({"category": {"name": "Help", "slug": "help"}}).encode(),
+    )
+    for topic_id in range(1, 6):
+        topic = {**make_topic(topic_id), "category_id": 18}
+        archive.append(
+            f"https://forum.test/t/{topic_id}.json",
+            "topic",
+            json.dumps(topic).encode(),
+        )
+    archive.append("https://forum.test/t/9.json", "topic", b"not json")
+    archive.close()
+
+    db_url = f"sqlite:///{tmp_path / 'forum.db'}"
+    settings = Settings(
+        api=APISettings(base_url="https://forum.test", category_path="c"),
+        database=DatabaseSettings(url=db_url),
+        scraping=ScrapingSettings(checkpoint_dir=str(tmp_path / "cp")),
+    )
+
+    stats = await reingest_archive(
+        settings=settings, archive_dir=tmp_path / "archive", workers=2
+    )
+
+    assert stats["categories"] == 1
+    assert stats["topics_processed"] == 5
+    assert stats["skipped"] == 1
+    with Session(create_engine(db_url)) as session:
+        assert session.get(Category, 18).slug == "help"
+        assert len(session.scalars(select(Topic)).all()) == 5
+        assert len(session.scalars(select(Post)).all()) == 10
@@ -0,0 +1,152 @@
+"""End-to-end tests against the fake Discourse server."""
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from forum_analyzer.bench import (
+    FakeDiscourseServer,
+    FaultProfile,
+    run_benchmark,
+    run_soak,
+)
+from forum_analyzer.bench.fake_server import TOPIC_ID_BASE
+from forum_analyzer.collector.models import Checkpoint, Post, Topic
+from forum_analyzer.collector.orchestrator import collect_categories
+from forum_analyzer.config.settings import (
+    APISettings,
+    DatabaseSettings,
+    ScrapingSettings,
+    Settings,
+)
+
+
+def test_fake_server_routes():
+    """Test listing paging, embedded chunks and post batches."""
+    server = FakeDiscourseServer(topics_per_category=35, posts_per_topic=25)
+
+    status, page = server.route("/c/1.json?page=1")
+    assert status == 200
+    assert len(page["topic_list"]["topics"]) == 5
+    assert page["topic_list"]["more_topics_url"] is None
+
+    topic_id = TOPIC_ID_BASE + 3
+    status, topic = server.route(f"/t/{topic_id}.json")
+    assert len(topic["post_stream"]["posts"]) == 20
+    assert len(topic["post_stream"]["stream"]) == 25
+
+    missing = topic["post_stream"]["stream"][20:]
+    query = "&".join(f"post_ids[]={post_id}" for post_id in missing)
+    status, posts = server.route(f"/t/{topic_id}/posts.json?{query}")
+    assert [p["id"] for p in posts["post_stream"]["posts"]] == missing
+
+    assert server.route("/t/999.json")[0] == 404
+
+
+@pytest.mark.asyncio
+async def test_benchmark_collects_everything(tmp_path):
+    """Test that the full collect path stores every synthetic post."""
+    result = await run_benchmark(
+        tmp_path,
+        topics=40,
+        posts_per_topic=25,
+        latency_ms=0,
+        concurrency=4,
+        posts_batch_size=3,
+    )
+
+    assert result.topics == 40
+    assert result.posts == 40 * 25
+    # 2 listing pages (+ metadata), 40 topics, 2 post batches per topic
+    assert result.requests == 3 + 40 + 40 * 2
+    assert result.connections <= 4
+    assert result.db_seconds > 0
+    assert result.network_seconds > 0
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'bench.db'}")
+    with Session(engine) as session:
+        assert session.scalar(select(func.count(Topic.id))) == 40
+        assert session.scalar(select(func.count(Post.id))) == 1000
+
+
+@pytest.mark.asyncio
+async def test_collect_categories_end_to_end(tmp_path):
+    """Test collecting several categories in one loop over HTTP."""
+    async with FakeDiscourseServer(
+        category_ids=(1, 2, 3), topics_per_category=35, posts_per_topic=25
+    ) as server:
+        settings = Settings(
+            api=APISettings(
+                base_url=server.base_url,
+                category_path="c",
+                rate_limit=1_000_000.0,
+                burst=4,
+                max_retries=0,
+            ),
+            database=DatabaseSettings(
+                url=f"sqlite:///{tmp_path / 'forum.db'}"
+            ),
+            scraping=ScrapingSettings(
+                checkpoint_dir=str(tmp_path / "checkpoints"),
+                max_concurrency=4,
+                commit_batch_size=5,
+            ),
+        )
+        results = await collect_categories([1, 2, 3], settings=settings)
+
+    assert [results[c]["topics_processed"] for c in (1, 2, 3)] == [35] * 3
+    engine = create_engine(f"sqlite:///{tmp_path / 'forum.db'}")
+    with Session(engine) as session:
+        assert session.scalar(select(func.count(Topic.id))) == 3 * 35
+        assert session.scalar(select(func.count(Post.id))) == 3 * 35 * 25
+        assert set(session.scalars(select(Checkpoint.status))) == {"completed"}
+
+
+def test_fault_profile_rejects_overfull_rates():
+    """Test that fault rates must fit into one draw."""
+    with pytest.raises(ValueError):
+        FaultProfile(rate_429=0.6, rate_5xx=0.6)
+
+
+@pytest.mark.asyncio
+async def test_soak_retries_throttling_without_losing_work(tmp_path):
+    """Test that retried 429s cost attempts but no topics or posts."""
+    report = await run_soak(
+        tmp_path,
+        duration=0,
+        profile=FaultProfile(rate_429=0.2, retry_after="0", seed=7),
+        topics=40,
+        posts_per_topic=25,
+        latency_ms=0,
+        concurrency=4,
+        max_retries=10,
+    )
+
+    assert report.cycles == 1
+    assert report.passes == 1
+    assert report.injected["throttled"] > 0
+    assert report.transport_attempts > report.logical_requests
+    assert report.retry_amplification > 1
+    assert report.topics_stored == 40
+    assert report.missing_topics == 0
+    assert report.missing_posts == 0
+    assert report.duplicate_topic_fetches == 0
+    assert report.user_post_count_drift == 0
+
+
+@pytest.mark.asyncio
+async def test_soak_reports_work_lost_to_truncated_responses(tmp_path):
+    """Test that truncated JSON, which is not retried, shows up as lost."""
+    report = await run_soak(
+        tmp_path,
+        duration=0,
+        profile=FaultProfile(rate_truncated=0.2, seed=7),
+        topics=40,
+        posts_per_topic=5,
+        latency_ms=0,
+        concurrency=4,
+    )
+
+    assert report.injected["truncated"] > 0
+    assert report.missing_topics > 0
+    assert report.topics_stored + report.missing_topics == 40
@@ -0,0 +1,122 @@
+"""Tests for transparent post body compression."""
+
+import random
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from forum_analyzer.analyzer.llm_analyzer import topic_posts_query
+from forum_analyzer.collector.compression import codec_for, compress_posts
+from forum_analyzer.collector.database import create_db_engine
+from forum_analyzer.collector.models import (
+    Category,
+    CompressionDictionary,
+    Post,
+    Topic,
+    migrate_schema,
+)
+from forum_analyzer.collector.storage import store_posts
+from forum_analyzer.config.settings import DatabaseSettings
+
+WORDS = "webhook payload retry signature header token event delivery".split()
+
+
+def body(n: int) -> str:
+    rng = random.Random(n)
+    words = " ".join(rng.choice(WORDS) for _ in range(40))
+    return (
+        f'<div class="cooked"><p>Post {n}: {words}</p>'
+        f'<pre><code class="lang-json">{{"id": {n}}}</code></pre></div>'
+    )
+
+
+def make_posts(count: int):
+    return [
+        {
+            "id": n,
+            "post_number": n,
+            "username": f"user{n % 5}",
+            "cooked": body(n),
+            "raw": body(n).replace("<p>", "").replace("</p>", ""),
+        }
+        for n in range(1, count + 1)
+    ]
+
+
+def open_db(tmp_path, name="forum.db", **settings):
+    engine = create_db_engine(
+        DatabaseSettings(url=f"sqlite:///{tmp_path / name}", **settings)
+    )
+    migrate_schema(engine)
+    with Session(engine) as session:
+        session.add(Category(id=1, name="Category", slug="category"))
+        session.add(Topic(id=10, category_id=1, title="Topic", slug="t"))
+        session.commit()
+    return engine
+
+
+def stored_types(engine):
+    with engine.connect() as conn:
+        return set(
+            conn.execute(text("SELECT DISTINCT typeof(cooked) FROM posts"))
+            .scalars()
+            .all()
+        )
+
+
+def test_compressed_writes_read_back_transparently(tmp_path):
+    """Test that new posts are stored as frames and read as text."""
+    engine = open_db(tmp_path, compress_bodies=True)
+    posts = make_posts(5)
+    with Session(engine) as session:
+        store_posts(session, posts, topic_id=10)
+        session.commit()
+
+    assert stored_types(engine) == {"blob"}
+    with Session(engine) as session:
+        stored = session.scalars(topic_posts_query(10)).all()
+        assert [post.cooked for post in stored] == [p["cooked"] for p in posts]
+        assert stored[0].raw == posts[0]["raw"]
+
+
+def test_compress_posts_converts_existing_database(tmp_path):
+    """Test that conversion shrinks bodies without changing them."""
+    engine = open_db(tmp_path)
+    posts = make_posts(300)
+    with Session(engine) as session:
+        store_posts(session, posts, topic_id=10)
+        session.commit()
+    assert stored_types(engine) == {"text"}
+
+    report = compress_posts(engine, batch_size=64)
+
+    assert report.posts == 300
+    assert report.body_bytes_after < report.body_bytes_before / 3
+    assert report.file_bytes_after < report.file_bytes_before
+    assert stored_types(engine) == {"blob"}
+    # Writes stay uncompressed unless compress_bodies is set
+    assert not codec_for(engine).enabled
+
+    with Session(engine) as session:
+        assert session.get(CompressionDictionary, report.dict_id)
+        cooked = dict(session.execute(select(Post.id, Post.cooked)).all())
+    assert cooked == {p["id"]: p["cooked"] for p in posts}
+
+    assert compress_posts(engine).posts == 0
+
+
+def test_databases_keep_their_own_codec(tmp_path):
+    """Test that one database's settings do not apply to another's."""
+    compressed = open_db(tmp_path, "compressed.db", compress_bodies=True)
+    plain = open_db(tmp_path, "plain.db")
+    posts = make_posts(5)
+
+    for engine in (compressed, plain):
+        with Session(engine) as session:
+            store_posts(session, posts, topic_id=10)
+            session.commit()
+
+    assert stored_types(compressed) == {"blob"}
+    assert stored_types(plain) == {"text"}
+    with Session(compressed) as session:
+        assert session.get(Post, 1).cooked == posts[0]["cooked"]
@@ -0,0 +1,60 @@
+"""Tests for engines with the SQLite performance profile."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from forum_analyzer.collector.database import create_db_engine
+from forum_analyzer.collector.models import Base
+from forum_analyzer.config.settings import DatabaseSettings
+
+
+def pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def count_categories(conn):
+    return conn.execute(text("SELECT count(*) FROM categories")).scalar()
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return DatabaseSettings(url=f"sqlite:///{tmp_path / 'forum.db'}")
+
+
+def test_profile_applied_to_every_connection(settings):
+    """Test that each new connection gets the configured pragmas."""
+    settings.cache_size_mb = 8
+    engine = create_db_engine(settings)
+
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == 1  # NORMAL
+    assert pragma(engine, "busy_timeout") == 5000
+    assert pragma(engine, "temp_store") == 2  # MEMORY
+    assert pragma(engine, "cache_size") == -8 * 1024
+
+    engine.dispose()
+    assert pragma(engine, "busy_timeout") == 5000
+
+
+def test_read_only_reads_while_a_writer_is_open(settings):
+    """Test that a reporting engine reads during an open write."""
+    writer = create_db_engine(settings)
+    Base.metadata.create_all(writer)
+    reader = create_db_engine(settings, read_only=True)
+
+    with writer.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO categories (id, name, slug) VALUES (1, 'a', 'a')"
+            )
+        )
+        # WAL: the uncommitted insert neither blocks nor shows
+        with reader.connect() as read:
+            assert count_categories(read) == 0
+
+    with reader.connect() as read:
+        assert count_categories(read) == 1
+        with pytest.raises(OperationalError):
+            read.execute(text("DELETE FROM categories"))
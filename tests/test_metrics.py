@@ -0,0 +1,90 @@
+"""Tests for request metrics."""
+
+import json
+
+import httpx
+import pytest
+
+from forum_analyzer.collector.api_client import ForumAPIClient, RateLimiter
+from forum_analyzer.collector.metrics import (
+    LatencyHistogram,
+    RequestMetrics,
+    write_metrics,
+)
+
+
+class TestLatencyHistogram:
+    """Test percentile estimates."""
+
+    def test_percentiles_within_bucket_error(self):
+        """Test that percentiles land within 5% of the exact value."""
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        assert histogram.percentile(50) == pytest.approx(0.5, rel=0.05)
+        assert histogram.percentile(99) == pytest.approx(0.99, rel=0.05)
+        assert histogram.percentile(100) == 1.0
+        assert histogram.summary()["mean"] == pytest.approx(500.5)
+
+    def test_empty_and_zero(self):
+        """Test that zero waits report zero."""
+        histogram = LatencyHistogram()
+        assert histogram.percentile(50) == 0.0
+
+        histogram.record(0.0)
+        assert histogram.summary()["p99"] == 0.0
+
+
+def test_child_metrics_count_towards_parent():
+    """Test that a view's recordings also land in the client's."""
+    parent = RequestMetrics()
+    child = RequestMetrics(parent=parent)
+
+    child.record_response("topic", 200, 0.1, 100)
+    child.record_response("topic", 429, 0.1, 0)
+    parent.record_response("category", 304, 0.1, 0)
+
+    assert child.snapshot()["total"]["requests"] == 2
+    snapshot = parent.snapshot()
+    assert snapshot["total"]["requests"] == 3
+    assert snapshot["endpoints"]["topic"]["throttled"] == 1
+    assert snapshot["endpoints"]["topic"]["bytes_received"] == 100
+    assert snapshot["endpoints"]["category"]["not_modified"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_records_requests(tmp_path):
+    """Test that the client counts retries, bytes, waits and latency."""
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"title": "x" * 500})
+
+    async with ForumAPIClient(
+        base_url="https://forum.test",
+        category_path="c",
+        rate_limit=100.0,
+    ) as client:
+        await client.client.aclose()
+        client.client = httpx.AsyncClient(
+            base_url="https://forum.test",
+            transport=httpx.MockTransport(handler),
+        )
+        view = client.with_rate_limiter(RateLimiter(rate=100.0))
+        await view.fetch_topic(66)
+
+    topic = client.metrics.snapshot()["endpoints"]["topic"]
+    assert topic["requests"] == 2
+    assert topic["retries"] == 1
+    assert topic["throttled"] == 1
+    assert topic["bytes_received"] > 500
+    assert topic["latency_ms"]["p50"] >= 0
+    assert view.metrics.snapshot()["total"]["requests"] == 2
+
+    path = tmp_path / "metrics.json"
+    write_metrics(path, client.metrics.snapshot())
+    assert json.loads(path.read_text())["total"]["retries"] == 1
@@ -0,0 +1,182 @@
+"""Tests for versioned, resumable migrations."""
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from forum_analyzer.collector.migrations import (
+    MIGRATIONS,
+    Migration,
+    pending_migrations,
+    run_migrations,
+)
+from forum_analyzer.collector.models import (
+    Base,
+    Category,
+    Post,
+    SchemaVersion,
+    Topic,
+    User,
+    migrate_schema,
+)
+
+# Core tables as created before multi-forum support and the report indexes
+BASELINE_SCHEMA = [
+    """CREATE TABLE categories (
+        id INTEGER NOT NULL, name VARCHAR NOT NULL, slug VARCHAR NOT NULL,
+        description TEXT, topic_count INTEGER, post_count INTEGER,
+        last_scraped_at DATETIME, created_at DATETIME, updated_at DATETIME,
+        PRIMARY KEY (id), UNIQUE (slug)
+    )""",
+    """CREATE TABLE users (
+        username VARCHAR NOT NULL, post_count INTEGER, topic_count INTEGER,
+        first_seen DATETIME, last_seen DATETIME, created_at DATETIME,
+        PRIMARY KEY (username)
+    )""",
+    """CREATE TABLE topics (
+        id INTEGER NOT NULL, category_id INTEGER NOT NULL,
+        title VARCHAR NOT NULL, slug VARCHAR NOT NULL, created_at DATETIME,
+        last_posted_at DATETIME, reply_count INTEGER, view_count INTEGER,
+        like_count INTEGER, word_count INTEGER, accepted_answer BOOLEAN,
+        closed BOOLEAN, archived BOOLEAN, pinned BOOLEAN, visible BOOLEAN,
+        scraped_at DATETIME, PRIMARY KEY (id),
+        FOREIGN KEY(category_id) REFERENCES categories (id)
+    )""",
+    """CREATE TABLE posts (
+        id INTEGER NOT NULL, topic_id INTEGER NOT NULL,
+        post_number INTEGER NOT NULL, username VARCHAR NOT NULL,
+        created_at DATETIME, updated_at DATETIME, reply_count INTEGER,
+        quote_count INTEGER, incoming_link_count INTEGER, reads INTEGER,
+        readers_count INTEGER, score FLOAT, like_count INTEGER, cooked TEXT,
+        raw TEXT, is_accepted_answer BOOLEAN, scraped_at DATETIME,
+        PRIMARY KEY (id),
+        CONSTRAINT uix_topic_post_number UNIQUE (topic_id, post_number),
+        FOREIGN KEY(topic_id) REFERENCES topics (id)
+    )""",
+    "INSERT INTO categories (id, name, slug) VALUES (1, 'Help', 'help')",
+    "INSERT INTO users (username, post_count) VALUES ('alice', 1)",
+    """INSERT INTO topics (id, category_id, title, slug, created_at,
+        reply_count, view_count, like_count, visible)
+        VALUES (10, 1, 'Build error', 'build-error', '2024-01-02 03:04:05',
+        0, 5, 0, 1)""",
+    """INSERT INTO posts (id, topic_id, post_number, username, cooked)
+        VALUES (100, 10, 1, 'alice', '<p>It fails</p>')""",
+]
+
+
+def baseline_database(path):
+    """A SQLite file created and filled by the baseline schema."""
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(text(statement))
+    engine.dispose()
+    return path
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """An existing database from before versioned migrations."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Category(id=1, name="Category", slug="category"))
+        session.add(Topic(id=10, category_id=1, title="Topic", slug="t"))
+        for n in range(1, 8):
+            session.add(
+                Post(
+                    id=n,
+                    topic_id=10,
+                    post_number=n,
+                    username=f"user{n}",
+                )
+            )
+        # Counts inflated by re-fetched posts, and a user without posts
+        session.add(User(username="user1", post_count=9))
+        session.add(User(username="ghost", post_count=2))
+        session.commit()
+    return engine
+
+
+def test_new_database_has_no_pending_migrations(tmp_path):
+    """Test that a database created by migrate_schema is stamped."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+    migrate_schema(engine)
+
+    assert pending_migrations(engine) == []
+
+
+def test_migrations_backfill_in_batches(engine):
+    """Test that pending migrations run in order, batch by batch."""
+    assert pending_migrations(engine) == MIGRATIONS
+    batches = []
+
+    completed = run_migrations(
+        engine,
+        batch_size=3,
+        on_batch=lambda migration, rows: batches.append(rows),
+    )
+
+    assert [m.version for m in completed] == [1, 2, 3, 4]
+    assert batches == [3, 6, 7]
+    assert pending_migrations(engine) == []
+    with Session(engine) as session:
+        counts = dict(
+            session.execute(select(User.username, User.post_count)).all()
+        )
+    assert counts == {f"user{n}": 1 for n in range(1, 8)}
+
+
+def test_interrupted_backfill_resumes_after_last_batch(engine):
+    """Test that a rerun continues after the last committed batch."""
+    seen, interrupted = [], []
+
+    def backfill(session, after, batch_size):
+        start = int(after or 0)
+        if start >= 10:
+            return None, 0
+        if start == 4 and not interrupted:
+            interrupted.append(start)
+            raise RuntimeError("interrupted")
+        seen.append(start)
+        return str(start + 2), 2
+
+    migration = Migration(3, "test", "Count to ten", backfill=backfill)
+
+    with pytest.raises(RuntimeError):
+        run_migrations(engine, migrations=[migration])
+    with Session(engine) as session:
+        state = session.get(SchemaVersion, 3)
+        assert (state.resume_key, state.completed_at) == ("4", None)
+
+    assert run_migrations(engine, migrations=[migration]) == [migration]
+    # Batches 0 and 2 were not redone
+    assert seen == [0, 2, 4, 6, 8]
+    with Session(engine) as session:
+        assert session.get(SchemaVersion, 3).rows_done == 10
+
+
+def test_category_slugs_become_unique_per_forum(tmp_path):
+    """Test that a baseline database accepts one slug in two forums."""
+    engine = create_engine(
+        f"sqlite:///{baseline_database(tmp_path / 'old.db')}"
+    )
+
+    run_migrations(engine)
+
+    with Session(engine) as session:
+        assert session.get(Category, 1).slug == "help"
+        assert session.get(Topic, 10).category_id == 1
+        session.add(Category(id=2, forum="x", name="Help", slug="help"))
+        session.add(Category(id=3, forum="y", name="Help", slug="help"))
+        session.commit()
+
+        session.add(Category(id=4, forum="x", name="Help", slug="help"))
+        with pytest.raises(IntegrityError):
+            session.commit()
+        session.rollback()
+
+        session.add(Category(id=5, name="Help", slug="help"))
+        with pytest.raises(IntegrityError):
+            session.commit()
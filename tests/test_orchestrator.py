@@ -0,0 +1,671 @@
+"""Tests for the collection orchestrator."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event, inspect, select, text
+from sqlalchemy.dialects.postgresql import dialect as pg_dialect
+from sqlalchemy.dialects.sqlite import dialect as sqlite_dialect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+
+from forum_analyzer.collector import orchestrator as orchestrator_module
+from forum_analyzer.collector.checkpoint_manager import CheckpointManager
+from forum_analyzer.collector.models import (
+    Base,
+    Category,
+    Checkpoint,
+    Post,
+    SyncState,
+    Topic,
+    User,
+    migrate_schema,
+)
+from forum_analyzer.collector.orchestrator import (
+    FIREHOSE_SYNC_KEY,
+    CollectionOrchestrator,
+)
+from forum_analyzer.collector.storage import refresh_users
+from forum_analyzer.collector.writer import DatabaseWriter
+from forum_analyzer.config.settings import (
+    APISettings,
+    ScrapingSettings,
+    Settings,
+)
+
+
+def make_post(topic_id: int, n: int) -> dict:
+    """Build a minimal Discourse post payload."""
+    return {
+        "id": topic_id * 100 + n,
+        "topic_id": topic_id,
+        "post_number": n,
+        "username": f"user{n}",
+        "created_at": "2024-01-01T00:00:00Z",
+        "cooked": "<p>hi</p>",
+    }
+
+
+def make_topic(topic_id: int, posts: int = 2, total: int = None) -> dict:
+    """Build a minimal Discourse topic payload.
+
+    Only the first ``posts`` posts are embedded; ``stream`` lists all
+    ``total`` post IDs like Discourse does for long topics.
+    """
+    return {
+        "id": topic_id,
+        "title": f"Topic {topic_id}",
+        "slug": f"topic-{topic_id}",
+        "created_at": "2024-01-01T00:00:00Z",
+        "last_posted_at": "2024-01-02T00:00:00Z",
+        "post_stream": {
+            "posts": [make_post(topic_id, n) for n in range(1, posts + 1)],
+            "stream": [
+                topic_id * 100 + n for n in range(1, (total or posts) + 1)
+            ],
+        },
+    }
+
+
+class FakeAPIClient:
+    """In-memory stand-in for ForumAPIClient."""
+
+    def __init__(
+        self,
+        pages,
+        delay: float = 0.01,
+        fail_page=None,
+        totals=None,
+        listing=None,
+        fail_topics=(),
+        feed=(),
+    ):
+        self.pages = pages
+        self.listing = listing or {}
+        self.fail_topics = set(fail_topics)
+        self.feed = sorted(feed, key=lambda post: -post["id"])
+        self.delay = delay
+        self.fail_page = fail_page
+        self.totals = totals or {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    async def fetch_category_metadata(self, category_id):
+        return {
+            "id": category_id,
+            "name": "Test",
+            "slug": f"test-{category_id}",
+        }
+
+    async def fetch_category_page(self, category_id, page=0):
+        self.calls.append(f"page:{page}")
+        if page == self.fail_page:
+            raise RuntimeError(f"page {page} failed")
+        topics = self.pages[page] if page < len(self.pages) else []
+        more = "/more" if page + 1 < len(self.pages) else None
+        return {
+            "topic_list": {
+                "topics": [
+                    {"id": topic_id, **self.listing.get(topic_id, {})}
+                    for topic_id in topics
+                ],
+                "more_topics_url": more,
+            }
+        }
+
+    async def fetch_topic(self, topic_id):
+        self.calls.append(f"topic:{topic_id}")
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Later topics finish first to prove results are reordered
+            await asyncio.sleep(self.delay / topic_id)
+            if topic_id in self.fail_topics:
+                raise RuntimeError(f"topic {topic_id} failed")
+            return make_topic(topic_id, total=self.totals.get(topic_id))
+        finally:
+            self.in_flight -= 1
+
+    async def fetch_latest_posts(self, before=None):
+        self.calls.append(f"latest:{before}")
+        posts = [p for p in self.feed if not before or p["id"] < before]
+        return posts[:2]
+
+    async def iter_posts(self, topic_id, post_ids):
+        self.calls.append(f"posts:{topic_id}:{len(post_ids)}")
+        for post_id in post_ids:
+            yield make_post(topic_id, post_id % 100)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def make_orchestrator(session, api_client, **scraping):
+    settings = Settings(
+        api=APISettings(base_url="http://forum.test", category_path="c"),
+        scraping=ScrapingSettings(**scraping),
+    )
+    return CollectionOrchestrator(
+        api_client=api_client,
+        db_session=session,
+        checkpoint_mgr=CheckpointManager(session=session),
+        settings=settings,
+    )
+
+
+class TestConcurrentCollection:
+    """Test bounded concurrent topic fetching."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, session):
+        """Test that no more than max_concurrency fetches overlap."""
+        api_client = FakeAPIClient([list(range(1, 11))])
+        orchestrator = make_orchestrator(
+            session, api_client, max_concurrency=3
+        )
+
+        stats = await orchestrator.collect_category(18, full_fetch=True)
+
+        assert stats["topics_processed"] == 10
+        assert api_client.max_in_flight == 3
+        assert session.scalar(select(Topic).where(Topic.id == 10))
+
+    @pytest.mark.asyncio
+    async def test_topics_stored_in_page_order(self, session, monkeypatch):
+        """Test that storage sees topics in listing order."""
+        api_client = FakeAPIClient([[1, 2, 3], [4, 5]])
+        orchestrator = make_orchestrator(
+            session, api_client, max_concurrency=5
+        )
+
+        stored = []
+        save_topic = orchestrator._save_topic
+
+        async def record(topic_data, category_id, **kwargs):
+            stored.append(topic_data["id"])
+            await save_topic(topic_data, category_id, **kwargs)
+
+        monkeypatch.setattr(orchestrator, "_save_topic", record)
+
+        await orchestrator.collect_category(18, full_fetch=True)
+
+        assert stored == [1, 2, 3, 4, 5]
+        assert len(session.scalars(select(Post)).all()) == 10
+
+
+class TestPagePrefetch:
+    """Test pipelined category page fetching."""
+
+    @pytest.mark.asyncio
+    async def test_next_page_fetched_before_topics(self, session):
+        """Test that the next listing is requested ahead of topic work."""
+        api_client = FakeAPIClient([[1, 2], [3, 4], [5]])
+        orchestrator = make_orchestrator(session, api_client, prefetch_pages=1)
+
+        stats = await orchestrator.collect_category(18, full_fetch=True)
+
+        assert stats["topics_processed"] == 5
+        assert api_client.calls.index("page:1") < api_client.calls.index(
+            "topic:2"
+        )
+        assert api_client.calls.count("page:2") == 1
+        assert "page:3" not in api_client.calls
+
+    @pytest.mark.asyncio
+    async def test_fetch_error_checkpoints_failing_page(self, session):
+        """Test that a prefetched page error is attributed correctly."""
+        api_client = FakeAPIClient([[1, 2], [3, 4], [5]], fail_page=2)
+        orchestrator = make_orchestrator(session, api_client, prefetch_pages=2)
+
+        await orchestrator.collect_category(18, full_fetch=True)
+
+        checkpoint = session.scalars(
+            select(Checkpoint).order_by(Checkpoint.id.desc())
+        ).first()
+        assert checkpoint.last_page == 2
+        assert checkpoint.total_processed == 4
+        assert checkpoint.status == "error"
+
+
+class TestMissingPosts:
+    """Test completing long topics from post_stream.stream."""
+
+    @pytest.mark.asyncio
+    async def test_missing_posts_fetched_in_batches(self, session):
+        """Test that posts beyond the first chunk are fetched in batches."""
+        api_client = FakeAPIClient([[1]], totals={1: 45})
+        orchestrator = make_orchestrator(
+            session, api_client, posts_batch_size=20
+        )
+
+        await orchestrator.collect_category(18, full_fetch=True)
+
+        assert [c for c in api_client.calls if c.startswith("posts")] == [
+            "posts:1:20",
+            "posts:1:20",
+            "posts:1:3",
+        ]
+        assert len(session.scalars(select(Post)).all()) == 45
+
+    @pytest.mark.asyncio
+    async def test_stored_posts_not_refetched(self, session):
+        """Test that posts already in the database are skipped."""
+        api_client = FakeAPIClient([[1]], totals={1: 30})
+        orchestrator = make_orchestrator(session, api_client)
+        await orchestrator.collect_category(18, full_fetch=True)
+
+        api_client.calls.clear()
+        api_client.totals[1] = 33
+        await orchestrator.collect_category(18, full_fetch=True)
+
+        assert [c for c in api_client.calls if c.startswith("posts")] == [
+            "posts:1:3"
+        ]
+        assert len(session.scalars(select(Post)).all()) == 33
+
+
+class TestWatermarkUpdate:
+    """Test watermark-driven incremental updates."""
+
+    OLD = {"bumped_at": "2024-01-01T00:00:00Z"}
+    NEW = {"bumped_at": "2024-02-01T00:00:00Z"}
+
+    async def collect_then_update(self, session, api_client):
+        """Store topics 1-3, then run an update over a longer listing."""
+        seed = FakeAPIClient([[3, 2], [1]])
+        await make_orchestrator(session, seed).collect_category(18)
+
+        orchestrator = make_orchestrator(session, api_client)
+        await orchestrator.collect_category(18, full_fetch=False)
+        return orchestrator
+
+    @pytest.mark.asyncio
+    async def test_pages_until_watermark(self, session):
+        """Test that paging stops at the first page reaching old topics."""
+        listing = {5: self.NEW, 4: self.NEW, 3: self.OLD, 2: self.OLD}
+        api_client = FakeAPIClient([[5, 4], [3, 2], [1]], listing=listing)
+
+        orchestrator = await self.collect_then_update(session, api_client)
+
+        assert "page:1" in api_client.calls
+        assert "page:2" not in api_client.calls
+        assert orchestrator.stats["topics_processed"] == 2
+        state = session.get(SyncState, "category:18")
+        assert state.watermark == datetime(2024, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_pinned_topic_does_not_stop_paging(self, session):
+        """Test that an old pinned topic on page 0 is not the watermark."""
+        listing = {
+            9: {**self.OLD, "pinned": True},
+            5: self.NEW,
+            4: self.NEW,
+            3: self.OLD,
+        }
+        api_client = FakeAPIClient([[9, 5], [4, 3], [1]], listing=listing)
+
+        await self.collect_then_update(session, api_client)
+
+        assert "page:1" in api_client.calls
+        assert "page:2" not in api_client.calls
+
+    @pytest.mark.asyncio
+    async def test_failure_keeps_watermark(self, session):
+        """Test that a failed topic leaves the watermark untouched."""
+        listing = {5: self.NEW, 3: self.OLD}
+        api_client = FakeAPIClient([[5, 3]], listing=listing, fail_topics=[5])
+
+        await self.collect_then_update(session, api_client)
+
+        assert session.get(SyncState, "category:18") is None
+
+
+class TestFirehoseSync:
+    """Test the latest-posts feed sync."""
+
+    @pytest.mark.asyncio
+    async def test_feed_applied_down_to_cursor(self, session):
+        """Test that only posts above the cursor are applied."""
+        seed = FakeAPIClient([[1]])
+        orchestrator = make_orchestrator(session, seed)
+        await orchestrator.collect_category(18)
+        orchestrator.checkpoint_mgr.save_sync_state(
+            FIREHOSE_SYNC_KEY, cursor=102
+        )
+
+        feed = [
+            {**make_post(topic_id, n), "category_id": category_id}
+            for topic_id, n, category_id in [
+                (1, 1, 18),
+                (1, 2, 18),
+                (1, 3, 18),
+                (1, 4, 18),
+                (2, 1, 18),
+                (7, 2, 99),
+            ]
+        ]
+        api_client = FakeAPIClient([], feed=feed)
+        orchestrator = make_orchestrator(session, api_client)
+
+        stats = await orchestrator.sync_latest_posts()
+
+        assert [c for c in api_client.calls if c.startswith("latest")] == [
+            "latest:None",
+            "latest:201",
+        ]
+        assert "topic:2" in api_client.calls
+        assert stats["topics_updated"] == 1
+        assert session.get(Topic, 1).reply_count == 3
+        assert session.get(Post, 702) is None
+        assert session.get(SyncState, FIREHOSE_SYNC_KEY).cursor == 702
+
+
+class TestMultiForum:
+    """Test storing several forums in one database."""
+
+    @pytest.mark.asyncio
+    async def test_rows_record_forum(self, session):
+        """Test that categories and topics are tagged with their forum."""
+        orchestrator = make_orchestrator(session, FakeAPIClient([[1]]))
+        orchestrator.forum = "community"
+
+        await orchestrator.collect_category(18, full_fetch=True)
+
+        assert session.get(Category, 18).forum == "community"
+        assert session.get(Topic, 1).forum == "community"
+
+    def test_migrate_schema_adds_forum_columns(self, tmp_path):
+        """Test that an old database gains the new nullable columns."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE categories (id INTEGER PRIMARY KEY, "
+                    "name VARCHAR NOT NULL, slug VARCHAR NOT NULL UNIQUE)"
+                )
+            )
+            conn.execute(text("INSERT INTO categories VALUES (1, 'A', 'a')"))
+
+        migrate_schema(engine)
+        migrate_schema(engine)
+
+        columns = {c["name"] for c in inspect(engine).get_columns("topics")}
+        assert "forum" in columns
+        with Session(engine) as session:
+            category = session.get(Category, 1)
+            assert category.slug == "a"
+            assert category.forum is None
+
+    def test_default_forum_slugs_stay_unique(self, session):
+        """Test that slugs without a forum name still conflict."""
+        session.add_all(
+            [
+                Category(id=1, name="A", slug="a"),
+                Category(id=2, name="A", slug="a", forum="community"),
+            ]
+        )
+        session.commit()
+
+        session.add(Category(id=3, name="A", slug="a"))
+        with pytest.raises(IntegrityError):
+            session.commit()
+
+    def test_namespaced_ids_are_64_bit(self):
+        """Test that ID columns are BIGINT outside SQLite."""
+        ddl = str(CreateTable(Post.__table__).compile(dialect=pg_dialect()))
+        assert "id BIGINT NOT NULL" in ddl
+        assert "topic_id BIGINT NOT NULL" in ddl
+        # SQLite keeps INTEGER PRIMARY KEY as the rowid alias
+        ddl = str(
+            CreateTable(Post.__table__).compile(dialect=sqlite_dialect())
+        )
+        assert "id INTEGER NOT NULL" in ddl
+
+
+class TestGroupCommit:
+    """Test batching several topics per transaction."""
+
+    @staticmethod
+    def count_commits(session):
+        # Engine-level, so released savepoints do not count
+        commits = []
+        event.listen(
+            session.get_bind(), "commit", lambda conn: commits.append(1)
+        )
+        return commits
+
+    @pytest.mark.asyncio
+    async def test_topics_share_transactions(self, session):
+        """Test that a group commits once for many topics."""
+        commits = self.count_commits(session)
+        api_client = FakeAPIClient([list(range(1, 11))], delay=0)
+        orchestrator = make_orchestrator(
+            session,
+            api_client,
+            commit_batch_size=4,
+            commit_interval_ms=60_000,
+        )
+
+        stats = await orchestrator.collect_category(18, full_fetch=True)
+
+        assert stats["topics_processed"] == 10
+        # Category, groups of 4 + 4 + 2, clearing the checkpoint
+        assert len(commits) == 5
+        assert len(session.scalars(select(Topic)).all()) == 10
+
+    @pytest.mark.asyncio
+    async def test_authors_refreshed_once_per_group(
+        self, session, monkeypatch
+    ):
+        """Test that user statistics are aggregated per group, not topic."""
+        refreshed = []
+
+        def counting_refresh(db_session, usernames):
+            refreshed.append(set(usernames))
+            return refresh_users(db_session, usernames)
+
+        monkeypatch.setattr(
+            orchestrator_module, "refresh_users", counting_refresh
+        )
+        orchestrator = make_orchestrator(
+            session,
+            FakeAPIClient([list(range(1, 11))], delay=0),
+            commit_batch_size=4,
+            commit_interval_ms=60_000,
+        )
+
+        await orchestrator.collect_category(18, full_fetch=True)
+
+        assert refreshed == [{"user1", "user2"}] * 3
+        counts = dict(
+            session.execute(select(User.username, User.post_count)).all()
+        )
+        assert counts == {"user1": 10, "user2": 10}
+
+    @pytest.mark.asyncio
+    async def test_failed_topic_rolls_back_alone(self, session, monkeypatch):
+        """Test that a savepoint confines a storage error to its topic."""
+        orchestrator = make_orchestrator(
+            session,
+            FakeAPIClient([[1, 2, 3, 4]], delay=0),
+            commit_batch_size=10,
+            commit_interval_ms=60_000,
+        )
+        store_posts = orchestrator._store_posts
+
+        async def fail_on_3(posts_data, topic_id):
+            await store_posts(posts_data, topic_id)
+            if topic_id == 3:
+                raise RuntimeError("bad topic")
+
+        monkeypatch.setattr(orchestrator, "_store_posts", fail_on_3)
+
+        await orchestrator.collect_category(18, full_fetch=True)
+
+        assert set(session.scalars(select(Topic.id))) == {1, 2, 4}
+        assert not session.scalars(
+            select(Post).where(Post.topic_id == 3)
+        ).all()
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_never_ahead_of_commits(
+        self, session, monkeypatch
+    ):
+        """Test that a crash loses a group and its checkpoint together."""
+        orchestrator = make_orchestrator(
+            session,
+            FakeAPIClient([list(range(1, 26))], delay=0),
+            commit_batch_size=7,
+            commit_interval_ms=60_000,
+        )
+        save_topic = orchestrator._save_topic
+        saved = []
+
+        async def crash_after_15(topic_data, category_id, **kwargs):
+            if len(saved) == 15:
+                raise asyncio.CancelledError
+            await save_topic(topic_data, category_id, **kwargs)
+            saved.append(topic_data["id"])
+
+        monkeypatch.setattr(orchestrator, "_save_topic", crash_after_15)
+
+        with pytest.raises(asyncio.CancelledError):
+            await orchestrator.collect_category(18, full_fetch=True)
+        session.rollback()
+
+        # Groups committed at topics 7 and 14; the checkpoint requested at
+        # topic 10 went out with the second group, counting its topics,
+        # and topic 15 was lost
+        checkpoint = orchestrator.checkpoint_mgr.get_checkpoint(
+            18, "category_page"
+        )
+        assert checkpoint.total_processed == 14
+        assert len(session.scalars(select(Topic)).all()) == 14
+
+    @pytest.mark.asyncio
+    async def test_concurrent_categories_share_the_database(self, tmp_path):
+        """Test that no transaction stays open while topics are fetched."""
+        # A short busy timeout turns a held write lock into a failure
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'group.db'}",
+            connect_args={"timeout": 0.5},
+        )
+        Base.metadata.create_all(engine)
+
+        async def collect(category_id, topic_ids):
+            with Session(engine) as session:
+                orchestrator = make_orchestrator(
+                    session,
+                    FakeAPIClient([topic_ids], delay=0.05),
+                    # One fetch at a time, so the categories interleave
+                    max_concurrency=1,
+                    commit_batch_size=3,
+                    commit_interval_ms=60_000,
+                )
+                return await orchestrator.collect_category(
+                    category_id, full_fetch=True
+                )
+
+        results = await asyncio.gather(
+            collect(18, list(range(1, 11))),
+            collect(19, list(range(11, 21))),
+        )
+
+        assert [stats["topics_processed"] for stats in results] == [10, 10]
+        with Session(engine) as session:
+            assert len(session.scalars(select(Topic)).all()) == 20
+            checkpoints = session.scalars(select(Checkpoint)).all()
+            assert {c.status for c in checkpoints} == {"completed"}
+
+
+class TestDatabaseWriter:
+    """Test storing a full collection on a writer thread."""
+
+    @pytest.fixture
+    def file_session(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'writer.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            yield session
+
+    @pytest.mark.asyncio
+    async def test_writer_thread_stores_everything(self, file_session):
+        """Test that all writes happen off the event loop thread."""
+        threads = set()
+        event.listen(
+            file_session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: threads.add(threading.get_ident()),
+        )
+        orchestrator = make_orchestrator(
+            file_session,
+            FakeAPIClient([list(range(1, 13)), list(range(13, 21))]),
+            max_concurrency=4,
+            write_queue_size=3,
+            commit_batch_size=5,
+        )
+
+        stats = await orchestrator.collect_category(18, full_fetch=True)
+
+        assert stats["topics_processed"] == 20
+        assert stats["posts_added"] == 40
+        assert len(file_session.scalars(select(Topic)).all()) == 20
+        assert len(file_session.scalars(select(Post)).all()) == 40
+        # Checkpoints were written by the writer, then cleared
+        checkpoint = file_session.scalars(select(Checkpoint)).one()
+        assert checkpoint.total_processed == 20
+        assert checkpoint.status == "completed"
+        assert len(threads - {threading.get_ident()}) == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_bounds_fetching(self, file_session, monkeypatch):
+        """Test that a slow writer holds fetching back."""
+        submitted, stored, backlog = [0], [0], []
+        save_topic = CollectionOrchestrator._save_topic
+        submit = DatabaseWriter.submit
+
+        async def slow_save(self, topic_data, category_id, **kwargs):
+            time.sleep(0.01)
+            await save_topic(self, topic_data, category_id, **kwargs)
+            stored[0] += 1
+
+        async def counting_submit(self, method, *args):
+            await submit(self, method, *args)
+            if method == "store_topic":
+                submitted[0] += 1
+                backlog.append(submitted[0] - stored[0])
+
+        monkeypatch.setattr(CollectionOrchestrator, "_save_topic", slow_save)
+        monkeypatch.setattr(DatabaseWriter, "submit", counting_submit)
+        orchestrator = make_orchestrator(
+            file_session,
+            FakeAPIClient([list(range(1, 31))], delay=0),
+            max_concurrency=8,
+            write_queue_size=2,
+        )
+
+        await orchestrator.collect_category(18, full_fetch=True)
+
+        assert stored[0] == 30
+        assert max(backlog) <= 2
+
+    @pytest.mark.asyncio
+    async def test_in_memory_database_stores_inline(self, session):
+        """Test that in-memory SQLite falls back to the event loop."""
+        orchestrator = make_orchestrator(
+            session, FakeAPIClient([[1, 2, 3]], delay=0), write_queue_size=4
+        )
+
+        assert orchestrator._start_writer(None) is None
+        stats = await orchestrator.collect_category(18, full_fetch=True)
+        assert stats["topics_processed"] == 3
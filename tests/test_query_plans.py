@@ -0,0 +1,44 @@
+"""Tests for the report and analysis index checks."""
+
+from sqlalchemy import create_engine, inspect, text
+
+from forum_analyzer.analyzer.query_plans import QueryPlan, check_query_plans
+from forum_analyzer.collector.models import Base
+
+
+def test_every_query_uses_its_index(tmp_path):
+    """Test that a fresh database serves each query from an index."""
+    plans = check_query_plans(str(tmp_path / "forum.db"))
+
+    assert {plan.name for plan in plans} >= {
+        "most_discussed",
+        "unanswered",
+        "topic_posts",
+        "recent_analyses",
+    }
+    assert [plan.name for plan in plans if not plan.ok] == []
+
+
+def test_scan_fails_the_check():
+    """Test that a plan not using the expected index is flagged."""
+    plan = QueryPlan(
+        name="high_engagement",
+        expected=("topics", ("visible", "like_count")),
+        plan=["SCAN topics", "USE TEMP B-TREE FOR ORDER BY"],
+    )
+    assert not plan.ok
+
+
+def test_dropped_index_is_recreated(tmp_path):
+    """Test that the check migrates a database missing an index."""
+    db_path = tmp_path / "forum.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_topics_visible_likes"))
+
+    plans = check_query_plans(str(db_path))
+
+    assert all(plan.ok for plan in plans)
+    indexes = {i["name"] for i in inspect(engine).get_indexes("topics")}
+    assert "ix_topics_visible_likes" in indexes
@@ -0,0 +1,51 @@
+"""Tests for reporting against existing databases."""
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from forum_analyzer.analyzer.reporter import ForumAnalyzer
+from forum_analyzer.cli import cli
+from forum_analyzer.config.settings import reset_settings
+
+from .test_migrations import baseline_database
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A project whose database was created by the baseline schema."""
+    db_path = baseline_database(tmp_path / "forum.db")
+    (tmp_path / "config.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "api": {
+                    "base_url": "https://forum.test",
+                    "category_path": "c",
+                },
+                "categories": [{"id": 1}],
+                "database": {"url": f"sqlite:///{db_path}"},
+            }
+        )
+    )
+    reset_settings()
+    yield tmp_path
+    reset_settings()
+
+
+def test_report_on_baseline_database(project):
+    """Test that a report adds the columns it reads before reading."""
+    analyzer = ForumAnalyzer(str(project / "forum.db"))
+
+    report = analyzer.generate_summary_report()
+
+    assert "Build error" in report
+    assert analyzer.get_database_stats()["topics"] == 1
+
+
+def test_status_on_baseline_database(project):
+    """Test that status reads a database created by the baseline schema."""
+    result = CliRunner().invoke(cli, ["--dir", str(project), "status"])
+
+    assert result.exit_code == 0, result.output
+    assert "Failed to query database" not in result.output
+    assert "Categories" in result.output
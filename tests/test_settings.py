@@ -0,0 +1,56 @@
+"""Tests for configuration loading."""
+
+import pydantic
+import pytest
+import yaml
+
+from forum_analyzer.config.settings import Settings
+
+BASE_CONFIG = {
+    "api": {
+        "base_url": "https://forum.test",
+        "category_path": "c",
+        "rate_limit": 1.0,
+        "archive_dir": "archive",
+    },
+    "categories": [{"id": 18}],
+}
+
+
+def write_config(tmp_path, forums):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({**BASE_CONFIG, "forums": forums}))
+    return path
+
+
+def test_forums_inherit_and_override_api(tmp_path):
+    """Test that forum api sections override the top-level settings."""
+    settings = Settings.from_yaml(
+        write_config(
+            tmp_path,
+            [
+                {
+                    "name": "community",
+                    "id_namespace": 1,
+                    "api": {"base_url": "https://community.test"},
+                    "categories": [{"id": 5}],
+                }
+            ],
+        )
+    )
+
+    forum = settings.forums[0]
+    assert forum.api.base_url == "https://community.test"
+    assert forum.api.rate_limit == 1.0
+    assert forum.api.archive_dir.endswith("community")
+    assert [category.id for category in forum.categories] == [5]
+
+
+def test_forums_need_unique_namespaces(tmp_path):
+    """Test that two forums cannot share an ID namespace."""
+    forums = [
+        {"name": "a", "id_namespace": 1, "categories": [{"id": 5}]},
+        {"name": "b", "id_namespace": 1, "categories": [{"id": 6}]},
+    ]
+    with pytest.raises(pydantic.ValidationError):
+        Settings.from_yaml(write_config(tmp_path, forums))
@@ -0,0 +1,135 @@
+"""Tests for set-based row writes."""
+
+import pytest
+from sqlalchemy import create_engine, event, func, inspect, select, text
+from sqlalchemy.orm import Session
+
+from forum_analyzer.collector.models import (
+    Base,
+    Category,
+    Post,
+    Topic,
+    User,
+    migrate_schema,
+)
+from forum_analyzer.collector.storage import refresh_users, store_posts
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'storage.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Category(id=1, name="Category", slug="category"))
+        session.add(Topic(id=10, category_id=1, title="Topic", slug="t"))
+        session.commit()
+        yield session
+
+
+def make_post(number, updated_at="2024-01-01T00:00:00.000Z", **fields):
+    return {
+        "id": 1000 + number,
+        "post_number": number,
+        "username": f"user{number % 3}",
+        "created_at": "2024-01-01T00:00:00.000Z",
+        "updated_at": updated_at,
+        "cooked": f"<p>post {number}</p>",
+        **fields,
+    }
+
+
+def test_store_posts_adds_in_few_statements(session):
+    """Test that a large topic is written without per-post queries."""
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    posts = [make_post(n) for n in range(1, 131)]
+    assert store_posts(session, posts + posts[:2], topic_id=10) == (130, 0)
+    # One lookup and 3 chunks of at most 58 rows (999 parameters)
+    assert len(statements) == 1 + 3
+    session.commit()
+
+    assert session.scalar(select(func.count(Post.id))) == 130
+
+
+def test_store_posts_updates_only_edited_posts(session):
+    """Test that re-stored posts are rewritten only after an edit."""
+    store_posts(session, [make_post(1), make_post(2)], topic_id=10)
+    session.commit()
+
+    assert store_posts(session, [make_post(1), make_post(2)], topic_id=10) == (
+        0,
+        0,
+    )
+
+    edited = make_post(
+        2,
+        updated_at="2024-02-01T00:00:00.000Z",
+        cooked="<p>edited</p>",
+        like_count=4,
+    )
+    assert store_posts(
+        session, [make_post(1), edited, make_post(3)], topic_id=10
+    ) == (1, 1)
+    session.commit()
+    session.expire_all()
+
+    post = session.get(Post, 1002)
+    assert post.cooked == "<p>edited</p>"
+    assert post.like_count == 4
+    assert post.post_number == 2
+    assert session.scalar(select(func.count(Post.id))) == 3
+
+
+def test_refresh_users_counts_each_post_once(session):
+    """Test that re-storing a topic does not inflate user statistics."""
+    posts = [make_post(n) for n in range(1, 7)]
+    for _ in range(2):
+        store_posts(session, posts, topic_id=10)
+        refresh_users(session, {post["username"] for post in posts})
+    session.commit()
+
+    users = {user.username: user for user in session.scalars(select(User))}
+    assert {name: user.post_count for name, user in users.items()} == {
+        "user0": 2,
+        "user1": 2,
+        "user2": 2,
+    }
+    # user1 wrote post 1, which opens the topic
+    assert users["user1"].topic_count == 1
+    assert users["user0"].topic_count == 0
+    assert users["user0"].first_seen is not None
+
+
+def test_refresh_users_rebuild_fixes_drift(session):
+    """Test that a full rebuild corrects counts and drops stale users."""
+    store_posts(session, [make_post(1), make_post(2)], topic_id=10)
+    session.add(User(username="user1", post_count=40))
+    session.add(User(username="ghost", post_count=3))
+    session.commit()
+
+    assert refresh_users(session) == 1
+    session.commit()
+
+    counts = dict(
+        session.execute(select(User.username, User.post_count)).all()
+    )
+    assert counts == {"user1": 1, "user2": 1}
+
+
+def test_migrate_schema_adds_username_index(tmp_path):
+    """Test that an existing posts table gains the aggregation index."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_posts_username"))
+
+    migrate_schema(engine)
+    migrate_schema(engine)
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("posts")}
+    assert "ix_posts_username" in indexes
@@ -0,0 +1,115 @@
+"""Tests for the lease-based work queue and its worker."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+
+from forum_analyzer.collector.models import Base, Post, Topic, WorkJob
+from forum_analyzer.collector.work_queue import JOB_PAGE, JOB_TOPIC, WorkQueue
+from forum_analyzer.collector.worker import QueueWorker
+
+from .test_orchestrator import FakeAPIClient, make_orchestrator
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def expire_leases(session):
+    session.execute(
+        update(WorkJob).values(
+            lease_expires_at=datetime.utcnow() - timedelta(seconds=1)
+        )
+    )
+    session.commit()
+
+
+class TestWorkQueue:
+    """Test claiming and settling jobs."""
+
+    def test_enqueue_is_idempotent(self, session):
+        """Test that a job key is only ever queued once."""
+        queue = WorkQueue(session)
+
+        assert queue.enqueue_page(18, 0)
+        assert not queue.enqueue_page(18, 0)
+        assert queue.enqueue_topics(18, [1, 2, 2]) == 2
+        assert queue.enqueue_topics(18, [2, 3]) == 1
+        assert queue.outstanding() == 4
+
+    def test_claims_are_exclusive_and_topics_first(self, session):
+        """Test that two workers never hold the same job."""
+        queue = WorkQueue(session)
+        queue.enqueue_page(18, 0)
+        queue.enqueue_topics(18, [1])
+
+        first = queue.claim("a")
+        second = queue.claim("b")
+
+        assert (first.kind, first.topic_id) == (JOB_TOPIC, 1)
+        assert (second.kind, second.page) == (JOB_PAGE, 0)
+        assert queue.claim("c") is None
+
+    def test_expired_lease_is_reclaimed(self, session):
+        """Test that a crashed worker's job moves to another worker."""
+        queue = WorkQueue(session)
+        queue.enqueue_topics(18, [1])
+        job = queue.claim("crashed")
+
+        expire_leases(session)
+        reclaimed = queue.claim("b")
+
+        assert reclaimed.id == job.id
+        assert reclaimed.attempts == 2
+        assert not queue.complete(job.id, "crashed")
+        assert queue.complete(job.id, "b")
+        assert queue.counts() == {JOB_TOPIC: {"done": 1}}
+
+    def test_failing_job_is_parked(self, session):
+        """Test that a job is failed after its last attempt."""
+        queue = WorkQueue(session, max_attempts=2)
+        queue.enqueue_topics(18, [1])
+
+        queue.fail(queue.claim("a").id, "a", "boom")
+        job = queue.claim("a")
+        queue.release(job.id, "a")
+        queue.fail(queue.claim("a").id, "a", "boom")
+
+        assert queue.claim("a") is None
+        assert queue.counts() == {JOB_TOPIC: {"failed": 1}}
+        assert queue.retry_failed() == 1
+        assert queue.claim("a") is not None
+
+
+@pytest.mark.asyncio
+async def test_worker_drains_backfill(session):
+    """Test that workers walk pages, fetch topics and finish the queue."""
+    api_client = FakeAPIClient([[1, 2], [3, 4], [5]], fail_topics=[4])
+    orchestrator = make_orchestrator(session, api_client)
+    queue = WorkQueue(session, max_attempts=2)
+    queue.enqueue_page(18, 0)
+
+    worker = QueueWorker(
+        orchestrator, queue, owner="w1", concurrency=3, poll_interval=0.01
+    )
+    stats = await worker.run()
+
+    assert stats["jobs_done"] == 3 + 4
+    assert stats["jobs_failed"] == 2
+    assert queue.counts() == {
+        JOB_PAGE: {"done": 3},
+        JOB_TOPIC: {"done": 4, "failed": 1},
+    }
+    assert session.scalars(select(Topic.id).order_by(Topic.id)).all() == [
+        1,
+        2,
+        3,
+        5,
+    ]
+    assert len(session.scalars(select(Post)).all()) == 8